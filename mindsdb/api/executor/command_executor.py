@@ -71,9 +71,11 @@ from mindsdb_sql.parser.dialects.mindsdb import (
 
 import mindsdb.utilities.profiler as profiler
 from mindsdb.api.executor import Column, SQLQuery, ResultSet
+from mindsdb.api.executor.sql_query.plan_cache import plan_cache
 from mindsdb.api.executor.data_types.answer import ExecuteAnswer
 from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import (
     CHARSET_NUMBERS,
+    ERR,
     SERVER_VARIABLES,
     TYPES,
 )
@@ -87,6 +89,7 @@ from .exceptions import (
 )
 from mindsdb.api.executor.utilities.functions import download_file
 from mindsdb.api.executor.utilities.sql import query_df
+from mindsdb.api.executor.utilities.statements import RefreshTables
 from mindsdb.integrations.libs.const import (
     HANDLER_CONNECTION_ARG_TYPE,
     PREDICTOR_STATUS,
@@ -94,6 +97,7 @@ from mindsdb.integrations.libs.const import (
 from mindsdb.integrations.libs.response import HandlerStatusResponse
 from mindsdb.interfaces.chatbot.chatbot_controller import ChatBotController
 from mindsdb.interfaces.database.projects import ProjectController
+from mindsdb.interfaces.database.metadata_catalog import metadata_catalog
 from mindsdb.interfaces.jobs.jobs_controller import JobsController
 from mindsdb.interfaces.model.functions import (
     get_model_record,
@@ -110,6 +114,28 @@ from mindsdb.utilities import log
 logger = log.getLogger(__name__)
 
 
+# statements which change databases, tables or models: cached query plans can become outdated
+SCHEMA_STATEMENTS = (
+    CreateDatabase,
+    DropDatabase,
+    DropDatasource,
+    CreateTable,
+    DropTables,
+    CreateView,
+    DropView,
+    CreatePredictor,
+    CreateAnomalyDetectionModel,
+    RetrainPredictor,
+    FinetunePredictor,
+    DropPredictor,
+    CreateKnowledgeBase,
+    DropKnowledgeBase,
+    CreateAgent,
+    UpdateAgent,
+    DropAgent,
+)
+
+
 def _get_show_where(
     statement: ASTNode,
     from_name: Optional[str] = None,
@@ -174,8 +200,32 @@ class ExecuteCommands:
         if database_name is None:
             database_name = self.session.database
 
+        if not (type(statement) is Show and statement.category.lower() == "warnings"):
+            self.session.warnings = []
+
+        # databases could be changed by previous query
+        self.session.datahub.clear_cache()
+
+        if type(statement) in SCHEMA_STATEMENTS:
+            # plans which are created during execution of the statement can be also outdated
+            plan_cache.invalidate()
+            try:
+                return self._execute_command(statement, database_name, sql, sql_lower)
+            finally:
+                plan_cache.invalidate()
+                self.session.datahub.clear_cache()
+        return self._execute_command(statement, database_name, sql, sql_lower)
+
+    def _execute_command(self, statement, database_name: str, sql: str, sql_lower: str) -> ExecuteAnswer:
         if type(statement) is CreateDatabase:
             return self.answer_create_database(statement)
+        elif type(statement) is RefreshTables:
+            # forget cached lists of tables and columns
+            if statement.database is not None:
+                metadata_catalog.refresh(statement.database.parts[-1])
+            else:
+                metadata_catalog.refresh()
+            return ExecuteAnswer()
         elif type(statement) is CreateMLEngine:
             name = statement.name.parts[-1]
 
@@ -598,7 +648,10 @@ class ExecuteCommands:
         elif type(statement) is Select:
             if statement.from_table is None:
                 return self.answer_single_row_select(statement, database_name)
-            query = SQLQuery(statement, session=self.session, database=database_name)
+            query = SQLQuery(
+                statement, session=self.session, database=database_name,
+                stream=self.context.get('stream', False)
+            )
             return self.answer_select(query)
         elif type(statement) is Union:
             query = SQLQuery(statement, session=self.session, database=database_name)
@@ -1997,7 +2050,8 @@ class ExecuteCommands:
             },
         ]
         columns = [Column(**d) for d in columns]
-        return ExecuteAnswer(data=ResultSet(columns=columns))
+        data = [["Warning", ERR.ER_UNKNOWN_ERROR, message] for message in self.session.warnings]
+        return ExecuteAnswer(data=ResultSet(columns=columns, values=data))
 
     def answer_connection_id(self, alias: str = None):
         columns = [
@@ -53,6 +53,8 @@ class SessionController:
         self.agents_controller = AgentsController(self.datahub)
 
         self.prepared_stmts = {}
+        # warnings of the last statement, they are returned by 'SHOW WARNINGS'
+        self.warnings = []
         self.packet_sequence_number = 0
         self.profiling = False
         self.predictor_cache = False if self.config.get('cache')['type'] == 'none' else True
@@ -68,7 +70,7 @@ class SessionController:
         if i == 100:
             raise Exception("Too many unclosed queries")
 
-        self.prepared_stmts[i] = dict(type=None, statement=statement, fetched=0)
+        self.prepared_stmts[i] = dict(type=None, statement=statement, fetched=0, cursor=None)
         return i
 
     def unregister_stmt(self, stmt_id):
@@ -49,7 +49,10 @@ class InformationSchemaDataNode(DataNode):
             'log': self.database_controller.logs_db_controller
         }
 
-        databases = self.database_controller.get_dict()
+        # databases are read once per query, see 'clear_cache'
+        self._databases = None
+
+        databases = self.get_databases()
         if "files" in databases:
             self.persis_datanodes["files"] = IntegrationDataNode(
                 "files",
@@ -62,6 +65,20 @@ class InformationSchemaDataNode(DataNode):
     def __getitem__(self, key):
         return self.get(key)
 
+    def get_databases(self) -> dict:
+        """Get databases by names, the dict is cached until 'clear_cache' call
+
+        Returns:
+            dict: {name: {'type', 'engine', 'id'}}
+        """
+        if self._databases is None:
+            self._databases = self.database_controller.get_dict()
+        return self._databases
+
+    def clear_cache(self) -> None:
+        """Forget list of databases, is called before execution of every query"""
+        self._databases = None
+
     def get(self, name):
         name_lower = name.lower()
 
@@ -74,9 +91,7 @@ class InformationSchemaDataNode(DataNode):
         if name_lower in self.persis_datanodes:
             return self.persis_datanodes[name_lower]
 
-        existing_databases_meta = (
-            self.database_controller.get_dict()
-        )  # filter_type='project'
+        existing_databases_meta = self.get_databases()
         database_name = None
         for key in existing_databases_meta:
             if key.lower() == name_lower:
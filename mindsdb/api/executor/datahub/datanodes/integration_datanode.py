@@ -1,4 +1,6 @@
+import re
 import time
+from typing import Iterator, List
 
 import numpy as np
 from numpy import dtype as np_dtype
@@ -15,8 +17,11 @@ from mindsdb.api.executor.data_types.response_type import RESPONSE_TYPE
 from mindsdb.api.executor.datahub.classes.tables_row import TablesRow
 from mindsdb.api.executor.sql_query.result_set import ResultSet
 from mindsdb.integrations.utilities.utils import get_class_name
+from mindsdb.interfaces.database.metadata_catalog import metadata_catalog
 from mindsdb.metrics import metrics
 from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context_executor import ContextThreadPoolExecutor
 from mindsdb.utilities.profiler import profiler
 
 logger = log.getLogger(__name__)
@@ -26,6 +31,101 @@ class DBHandlerException(Exception):
     pass
 
 
+def iter_batches(result_set: ResultSet, batch_size: int) -> Iterator[pd.DataFrame]:
+    """Yield content of result set by dataframes with at most batch_size rows.
+    Columns of dataframes are named by indexes. Streamed result set is consumed lazily
+    """
+    for df in result_set.iter_raw_dfs():
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start:start + batch_size]
+
+
+def batch_to_values(df: pd.DataFrame, col_types: dict) -> List[list]:
+    """Cast columns of the batch to types of the table and convert it to rows
+
+    Args:
+        df (pd.DataFrame): batch, columns are named by indexes
+        col_types (dict): {column index: type name}
+
+    Returns:
+        List[list]: rows of the batch
+    """
+    df = df.copy()
+    for col_idx, type_name in col_types.items():
+        try:
+            df[col_idx] = df[col_idx].astype(type_name)
+        except Exception:
+            pass
+    return df.to_dict('split')['data']
+
+
+def insert_error_message(message: str, inserted_rows: int) -> str:
+    """Error of insert by batches: with number of rows which are already inserted by previous batches"""
+    if inserted_rows == 0:
+        return message
+    return f'{message} (batches are committed separately, {inserted_rows} rows were inserted before the error)'
+
+
+# statements which change state of connection: session variables, transactions, temporary tables, locks
+SESSION_STATEMENT = re.compile(
+    r'^(set|begin|start\s+transaction|commit|rollback|end|savepoint|release|lock|unlock|use|'
+    r'create\s+(global\s+|local\s+)?(temp|temporary)\s+table)\b',
+    re.IGNORECASE
+)
+TRANSACTION_START = re.compile(r'^(begin|start\s+transaction)\b', re.IGNORECASE)
+TRANSACTION_END = re.compile(r'^(commit|rollback|end)\b', re.IGNORECASE)
+
+
+def check_native_query(native_query: str) -> None:
+    """Connections to integration are shared between clients: every query can be executed by another
+    connection of the pool. State of connection (session variables, transactions, temporary tables)
+    is available only to the statements of the same native query, so queries which only change the state,
+    or leave a transaction opened, are rejected
+
+    Args:
+        native_query (str): query to integration
+
+    Raises:
+        Exception: if query changes state of connection for the next queries
+    """
+    text = re.sub(r'/\*.*?\*/|--[^\n]*', ' ', native_query, flags=re.DOTALL)
+    statements = [x.strip() for x in text.split(';') if x.strip() != '']
+    if len(statements) == 0:
+        return
+    if all(SESSION_STATEMENT.match(x) for x in statements):
+        raise Exception(
+            f"Statement '{statements[0].split()[0].upper()}' changes state of connection and has no effect on the "
+            "next queries: connections to integration are shared between clients. "
+            "Send it in one native query together with the statements which use it"
+        )
+    in_transaction = False
+    for statement in statements:
+        if TRANSACTION_START.match(statement):
+            in_transaction = True
+        elif TRANSACTION_END.match(statement):
+            in_transaction = False
+    if in_transaction:
+        raise Exception(
+            "Transaction has to be committed or rolled back in the same native query: "
+            "connections to integration are shared between clients"
+        )
+
+
+def prefetch(iterator: Iterator) -> Iterator:
+    """Yield items of the iterator, the next item is produced in a background thread
+    while the current one is being processed
+    """
+    end = object()
+    with ContextThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, iterator, end)
+        while True:
+            item = future.result()
+            if item is end:
+                break
+            future = executor.submit(next, iterator, end)
+            yield item
+
+
 class IntegrationDataNode(DataNode):
     type = 'integration'
 
@@ -33,13 +133,26 @@ class IntegrationDataNode(DataNode):
         self.integration_name = integration_name
         self.ds_type = ds_type
         self.integration_controller = integration_controller
-        self.integration_handler = self.integration_controller.get_data_handler(self.integration_name)
+        # connected handlers are shared between threads: they are taken from the pool for the time of a call
+        self.handlers_pool = self.integration_controller.get_data_handler_pool(self.integration_name)
+
+    @property
+    def integration_handler(self):
+        """Handler which is owned by the current thread, for the calls outside of the data node"""
+        return self.integration_controller.get_data_handler(self.integration_name)
 
     def get_type(self):
         return self.type
 
     def get_tables(self):
-        response = self.integration_handler.get_tables()
+        if self.ds_type == 'file':
+            # list of files is changed by upload without the data node
+            return self._get_tables()
+        return metadata_catalog.get_tables(self.integration_name, self._get_tables)
+
+    def _get_tables(self):
+        with self.handlers_pool.lease() as handler:
+            response = handler.get_tables()
         if response.type == RESPONSE_TYPE.TABLE:
             result_dict = response.data_frame.to_dict(orient='records')
             result = []
@@ -61,6 +174,7 @@ class IntegrationDataNode(DataNode):
             if_exists=if_exists
         )
         result = self._query(drop_ast)
+        metadata_catalog.refresh(self.integration_name)
         if result.type == RESPONSE_TYPE.ERROR:
             raise Exception(result.error_message)
 
@@ -69,6 +183,8 @@ class IntegrationDataNode(DataNode):
         # is_create - create table
         # is_replace - drop table if exists
         # is_create==False and is_replace==False: just insert
+        # rows are inserted by batches, every batch is committed by handler separately:
+        #   if a batch fails, the previous batches stay in the table
 
         table_columns_meta = {}
 
@@ -110,6 +226,7 @@ class IntegrationDataNode(DataNode):
                 is_replace=is_replace
             )
             result = self._query(create_table_ast)
+            metadata_catalog.refresh(self.integration_name)
             if result.type == RESPONSE_TYPE.ERROR:
                 raise Exception(result.error_message)
 
@@ -117,18 +234,30 @@ class IntegrationDataNode(DataNode):
             # it is just a 'create table'
             return
 
-        # native insert
-        if hasattr(self.integration_handler, 'insert'):
-            df = result_set.to_df()
+        batch_size = (Config().get('executor') or {}).get('insert_batch_size', 10000)
+        batches = prefetch(iter_batches(result_set, batch_size))
 
-            result = self.integration_handler.insert(table_name.parts[-1], df)
-            if result.type == RESPONSE_TYPE.ERROR:
-                raise Exception(result.error_message)
+        inserted_rows = 0
+
+        # native insert
+        with self.handlers_pool.lease() as handler:
+            native_insert = hasattr(handler, 'insert')
+        if native_insert:
+            column_names = result_set.get_column_names()
+            for df in batches:
+                df = df.set_axis(column_names, axis=1, copy=False)
+                # handler is taken for one batch: it is not held while the next batch is fetched from the source
+                with self.handlers_pool.lease() as handler:
+                    result = handler.insert(table_name.parts[-1], df)
+                if result.type == RESPONSE_TYPE.ERROR:
+                    raise Exception(insert_error_message(result.error_message, inserted_rows))
+                inserted_rows += len(df)
             return
 
         insert_columns = [Identifier(parts=[x.alias]) for x in result_set.columns]
 
         # adapt table types
+        col_types = {}
         for col_idx, col in enumerate(result_set.columns):
             column_type = table_columns_meta[col.alias]
 
@@ -137,63 +266,63 @@ class IntegrationDataNode(DataNode):
                 type_name = 'int'
             elif column_type == Float:
                 type_name = 'float'
+            col_types[col_idx] = type_name
+
+        for df in batches:
+            values = batch_to_values(df, col_types)
+            if len(values) == 0:
+                continue
+
+            insert_ast = Insert(
+                table=table_name,
+                columns=insert_columns,
+                values=values,
+                is_plain=True
+            )
 
             try:
-                result_set.set_col_type(col_idx, type_name)
-            except Exception:
-                pass
-
-        values = result_set.to_lists()
-
-        if len(values) == 0:
-            # not need to insert
-            return
+                result = self._query(insert_ast)
+            except Exception as e:
+                msg = f'[{self.ds_type}/{self.integration_name}]: {str(e)}'
+                raise DBHandlerException(insert_error_message(msg, inserted_rows)) from e
 
-        insert_ast = Insert(
-            table=table_name,
-            columns=insert_columns,
-            values=values,
-            is_plain=True
-        )
-
-        try:
-            result = self._query(insert_ast)
-        except Exception as e:
-            msg = f'[{self.ds_type}/{self.integration_name}]: {str(e)}'
-            raise DBHandlerException(msg) from e
-
-        if result.type == RESPONSE_TYPE.ERROR:
-            raise Exception(result.error_message)
+            if result.type == RESPONSE_TYPE.ERROR:
+                raise Exception(insert_error_message(result.error_message, inserted_rows))
+            inserted_rows += len(values)
 
     def _query(self, query):
-        time_before_query = time.perf_counter()
-        result = self.integration_handler.query(query)
-        elapsed_seconds = time.perf_counter() - time_before_query
+        with self.handlers_pool.lease() as handler:
+            time_before_query = time.perf_counter()
+            result = handler.query(query)
+            elapsed_seconds = time.perf_counter() - time_before_query
         query_time_with_labels = metrics.INTEGRATION_HANDLER_QUERY_TIME.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         query_time_with_labels.observe(elapsed_seconds)
 
         num_rows = 0
         if result.data_frame is not None:
             num_rows = len(result.data_frame.index)
         response_size_with_labels = metrics.INTEGRATION_HANDLER_RESPONSE_SIZE.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         response_size_with_labels.observe(num_rows)
         return result
 
     def _native_query(self, native_query):
-        time_before_query = time.perf_counter()
-        result = self.integration_handler.native_query(native_query)
-        elapsed_seconds = time.perf_counter() - time_before_query
+        if isinstance(native_query, str):
+            check_native_query(native_query)
+        with self.handlers_pool.lease() as handler:
+            time_before_query = time.perf_counter()
+            result = handler.native_query(native_query)
+            elapsed_seconds = time.perf_counter() - time_before_query
         query_time_with_labels = metrics.INTEGRATION_HANDLER_QUERY_TIME.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         query_time_with_labels.observe(elapsed_seconds)
 
         num_rows = 0
         if result.data_frame is not None:
             num_rows = len(result.data_frame.index)
         response_size_with_labels = metrics.INTEGRATION_HANDLER_RESPONSE_SIZE.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         response_size_with_labels.observe(num_rows)
         return result
 
@@ -217,7 +346,47 @@ class IntegrationDataNode(DataNode):
         if result.type == RESPONSE_TYPE.OK:
             return pd.DataFrame(), []
 
-        df = result.data_frame
+        df = self._clear_df(result.data_frame)
+
+        columns_info = [
+            {
+                'name': k,
+                'type': v
+            }
+            for k, v in df.dtypes.items()
+        ]
+
+        return df, columns_info
+
+    def query_stream(self, query, fetch_size=1000):
+        """
+        Execute SELECT query and yield result by chunks of dataframes.
+        Memory usage is bounded by chunk size if the handler supports partial fetching.
+        """
+        # the handler is in use until all chunks are fetched
+        with self.handlers_pool.lease() as handler:
+            chunks = handler.query_stream(query, fetch_size=fetch_size)
+            try:
+                while True:
+                    try:
+                        df = next(chunks)
+                    except StopIteration:
+                        break
+                    except Exception as e:
+                        msg = str(e).strip()
+                        if msg == '':
+                            msg = e.__class__.__name__
+                        msg = f'[{self.ds_type}/{self.integration_name}]: {msg}'
+                        raise DBHandlerException(msg) from e
+
+                    yield self._clear_df(df)
+            finally:
+                # release the cursor before the handler is returned to the pool
+                if hasattr(chunks, 'close'):
+                    chunks.close()
+
+    @staticmethod
+    def _clear_df(df):
         # region clearing df from NaN values
         # recursion error appears in pandas 1.5.3 https://github.com/pandas-dev/pandas/pull/45749
         if isinstance(df, pd.Series):
@@ -233,13 +402,4 @@ class IntegrationDataNode(DataNode):
         except Exception as e:
             logger.error(f"Issue with clearing DF from NaN values: {e}")
         # endregion
-
-        columns_info = [
-            {
-                'name': k,
-                'type': v
-            }
-            for k, v in df.dtypes.items()
-        ]
-
-        return df, columns_info
+        return df
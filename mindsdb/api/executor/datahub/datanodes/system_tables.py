@@ -1,4 +1,8 @@
 
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
 import pandas as pd
 from mindsdb_sql.parser.ast import BinaryOperation, Constant, Identifier, Select
 from mindsdb_sql.parser.ast.base import ASTNode
@@ -7,10 +11,100 @@ from mindsdb.api.executor.datahub.classes.tables_row import (
     TABLES_ROW_TYPE,
     TablesRow,
 )
+from mindsdb.interfaces.storage import db
 from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
 
 logger = log.getLogger(__name__)
 
+# max number of integrations which are requested for metadata at the same time, by all queries of process
+METADATA_MAX_WORKERS = 16
+
+_metadata_executor = None
+# requests which are not finished yet: {(company_id, integration name): future}
+_metadata_requests = {}
+_metadata_lock = threading.Lock()
+
+
+def _fetch_tables(inf_schema, name: str):
+    try:
+        ds = inf_schema.get(name)
+        # not every integration is a data node (e.g. ml engines)
+        if ds is None:
+            return None
+        return ds.get_tables()
+    finally:
+        db.session.remove()
+
+
+def _request_tables(inf_schema, name: str) -> Future:
+    """Start request of tables of integration in the shared executor.
+    If the integration is already requested (also by another query), then the same request is returned
+    """
+    global _metadata_executor
+
+    key = (ctx.company_id, name.lower())
+    with _metadata_lock:
+        future = _metadata_requests.get(key)
+        if future is not None:
+            return future
+        if _metadata_executor is None:
+            _metadata_executor = ThreadPoolExecutor(max_workers=METADATA_MAX_WORKERS)
+        # request is executed with context (company, user) of the current query
+        future = _metadata_executor.submit(contextvars.copy_context().run, _fetch_tables, inf_schema, name)
+        _metadata_requests[key] = future
+
+    def forget(_future):
+        with _metadata_lock:
+            if _metadata_requests.get(key) is future:
+                del _metadata_requests[key]
+
+    future.add_done_callback(forget)
+    return future
+
+
+def get_integrations_tables(inf_schema, names: list) -> dict:
+    """Get lists of tables of integrations concurrently.
+    Integrations which fail or don't answer in time are skipped, for the latter a warning is added to the session
+
+    Args:
+        inf_schema (InformationSchemaDataNode)
+        names (list): names of integrations
+
+    Returns:
+        dict: {integration name: list of TablesRow}
+    """
+    if len(names) == 0:
+        return {}
+    timeout = (Config().get('metadata_cache') or {}).get('fetch_timeout', 10)
+
+    # list of databases is read once, before it is used by requests
+    inf_schema.get_databases()
+    futures = {_request_tables(inf_schema, name): name for name in names}
+    _done, not_done = wait(futures, timeout=timeout)
+
+    result = {}
+    for future, name in futures.items():
+        if future in not_done:
+            # requests which are not started yet are removed from the queue, hung ones keep their place
+            if future.cancel():
+                message = f"Tables of '{name}' are skipped: too many integrations are requested at the same time"
+            else:
+                message = f"Tables of '{name}' are skipped: no answer in {timeout} seconds"
+        elif future.cancelled():
+            message = f"Tables of '{name}' are skipped: too many integrations are requested at the same time"
+        elif future.exception() is not None:
+            logger.error(f"Can't get tables from '{name}': {future.exception()}")
+            continue
+        else:
+            if future.result() is not None:
+                result[name] = future.result()
+            continue
+        logger.warning(message)
+        inf_schema.session.warnings.append(message)
+    return result
+
 
 class Table:
 
@@ -125,17 +219,15 @@ class TablesTable(Table):
                 row.TABLE_SCHEMA = ds_name
                 data.append(row.to_list())
 
-        for ds_name in inf_schema.get_integrations_names():
-            if target_table is not None and target_table != ds_name:
-                continue
-            try:
-                ds = inf_schema.get(ds_name)
-                ds_tables = ds.get_tables()
-                for row in ds_tables:
-                    row.TABLE_SCHEMA = ds_name
-                    data.append(row.to_list())
-            except Exception:
-                logger.error(f"Can't get tables from '{ds_name}'")
+        integrations_names = [
+            ds_name for ds_name in inf_schema.get_integrations_names()
+            if target_table is None or target_table == ds_name
+        ]
+        integrations_tables = get_integrations_tables(inf_schema, integrations_names)
+        for ds_name in integrations_names:
+            for row in integrations_tables.get(ds_name, []):
+                row.TABLE_SCHEMA = ds_name
+                data.append(row.to_list())
 
         for project_name in inf_schema.get_projects_names():
             if target_table is not None and target_table != project_name:
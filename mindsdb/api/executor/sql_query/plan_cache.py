@@ -0,0 +1,129 @@
+"""
+In-process caches of parsed queries and query plans.
+
+Parsing and planning of the same query text are repeated many times by BI tools. Parsed ASTs are cached by
+query text, plans are cached by query text + default database + company + versions of used models. Cached plans
+are dropped before and after every statement which changes the schema (see ExecuteCommands.execute_command)
+and after ttl, because databases can be also changed by other processes.
+
+Cached objects are mutated during execution, so only copies of them are returned.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from mindsdb_sql import parse_sql
+
+from mindsdb.utilities.config import Config
+
+
+class QueryCache:
+    """Thread-safe LRU cache with ttl and version of content"""
+
+    def __init__(self, size_option: str, ttl_option: Optional[str] = None):
+        """
+        Args:
+            size_option (str): name of option in 'executor' section of config with max size of cache,
+                0 - cache is disabled
+            ttl_option (str): name of option with time to live of records in seconds, None - infinite
+        """
+        self.size_option = size_option
+        self.ttl_option = ttl_option
+
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        # is incremented on invalidation, records created with previous version are not stored
+        self.version = 0
+
+    def _get_settings(self) -> tuple:
+        executor_config = Config().get('executor') or {}
+        max_size = executor_config.get(self.size_option, 0)
+        ttl = None
+        if self.ttl_option is not None:
+            ttl = executor_config.get(self.ttl_option)
+        return max_size, ttl
+
+    def get(self, key: Hashable) -> Any:
+        """Get copy of the cached value
+
+        Args:
+            key (Hashable): key of record
+
+        Returns:
+            Any: copy of value or None if it is not in cache
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expired_at, value = item
+            if expired_at is not None and expired_at < time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any, version: int = None):
+        """Store copy of value
+
+        Args:
+            key (Hashable): key of record
+            value (Any): value to store
+            version (int): version of cache at the moment when value creation was started.
+                If cache was invalidated after that, value is not stored
+        """
+        max_size, ttl = self._get_settings()
+        if max_size <= 0:
+            return
+        expired_at = None if ttl is None else time.time() + ttl
+        value = copy.deepcopy(value)
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._items[key] = (expired_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._items.clear()
+
+
+parse_cache = QueryCache('parse_cache_size')
+plan_cache = QueryCache('plan_cache_size', ttl_option='plan_cache_ttl')
+
+
+def normalize_query_text(sql: str) -> str:
+    """Remove insignificant whitespaces from query text. Text with quotes is kept as is
+
+    Args:
+        sql (str): query text
+
+    Returns:
+        str
+    """
+    if '"' in sql or "'" in sql or '`' in sql:
+        return sql.strip()
+    return ' '.join(sql.split())
+
+
+def parse_sql_cached(sql: str, dialect: str = 'mindsdb'):
+    """The same as mindsdb_sql.parse_sql, but parsed queries are cached
+
+    Args:
+        sql (str): query text
+        dialect (str): dialect of query
+
+    Returns:
+        ASTNode
+    """
+    key = (normalize_query_text(sql), dialect)
+    query = parse_cache.get(key)
+    if query is None:
+        query = parse_sql(sql, dialect=dialect)
+        parse_cache.set(key, query)
+    return query
@@ -1,10 +1,21 @@
 from typing import List
 import copy
+
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 from mindsdb.api.executor.exceptions import WrongArgumentError
 
 
+def is_arrow_available() -> bool:
+    return pa is not None
+
+
 class Column:
     def __init__(self, name=None, alias=None,
                  table_name=None, table_alias=None,
@@ -46,6 +57,13 @@ class ResultSet:
             df = pd.DataFrame(values)
         self._df = df
 
+        # alternative storage: arrow table with columns renamed to indexes.
+        #   only one of _df and _table is filled at a time
+        self._table = None
+
+        # iterator with the rest of content: chunks of dataframes. Is used for streaming results
+        self._stream = None
+
         self.is_prediction = False
 
     def __repr__(self):
@@ -54,10 +72,21 @@ class ResultSet:
         return f'{self.__class__.__name__}({self.length()} rows, cols: {col_names})'
 
     def __len__(self) -> int:
+        self._drain_stream()
+        if self._table is not None:
+            return self._table.num_rows
         if self._df is None:
             return 0
         return len(self._df)
 
+    @property
+    def is_arrow(self) -> bool:
+        return self._table is not None
+
+    @property
+    def is_stream(self) -> bool:
+        return self._stream is not None
+
     # --- converters ---
 
     def from_df(self, df, database=None, table_name=None, table_alias=None):
@@ -73,8 +102,29 @@ class ResultSet:
                 type=columns_dtypes[i]
             ))
 
-        # rename columns to indexes
-        self._df = df.set_axis(range(len(df.columns)), axis=1)
+        # rename columns to indexes, data is not copied
+        self._df = df.set_axis(range(len(df.columns)), axis=1, copy=False)
+
+        return self
+
+    def from_arrow(self, table, database=None, table_name=None, table_alias=None):
+        """
+        Fill result set from arrow table. Data is kept in arrow format and is converted to pandas only on demand
+
+        :param table: pyarrow.Table
+        :return: self
+        """
+
+        for field in table.schema:
+            self._columns.append(Column(
+                name=field.name,
+                table_name=table_name,
+                table_alias=table_alias,
+                database=database,
+                type=_arrow_to_dtype(field.type)
+            ))
+
+        self._set_table(table)
 
         return self
 
@@ -97,13 +147,34 @@ class ResultSet:
                 column = Column(col)
             self._columns.append(column)
 
-        self._df = df.set_axis(range(len(df.columns)), axis=1)
+        self._df = df.set_axis(range(len(df.columns)), axis=1, copy=False)
+
+        return self
+
+    def from_arrow_cols(self, table, col_names, strict=True):
+        # the same as from_df_cols but for arrow table
+
+        alias_idx = {}
+        for col in col_names.values():
+            if col.alias is not None:
+                alias_idx[col.alias] = col
+
+        for col in table.column_names:
+            if col in col_names or strict:
+                column = col_names[col]
+            elif col in alias_idx:
+                column = alias_idx[col]
+            else:
+                column = Column(col)
+            self._columns.append(column)
+
+        self._set_table(table)
 
         return self
 
     def to_df(self):
         columns = self.get_column_names()
-        return self.get_raw_df().set_axis(columns, axis=1)
+        return self.get_raw_df().set_axis(columns, axis=1, copy=False)
 
     def to_df_cols(self, prefix=''):
         # returns dataframe and dict of columns
@@ -116,7 +187,41 @@ class ResultSet:
             columns.append(name)
             col_names[name] = col
 
-        return self.get_raw_df().set_axis(columns, axis=1), col_names
+        return self.get_raw_df().set_axis(columns, axis=1, copy=False), col_names
+
+    def to_arrow_cols(self, prefix=''):
+        # the same as to_df_cols but returns arrow table.
+        #   renaming of columns doesn't copy data if result set is stored in arrow
+
+        columns = []
+        col_names = {}
+        for col in self._columns:
+            name = col.get_hash_name(prefix)
+            columns.append(name)
+            col_names[name] = col
+
+        self._drain_stream()
+        if self._table is None:
+            table = pa.Table.from_pandas(self.get_raw_df(), preserve_index=False)
+        else:
+            table = self._table
+        return table.rename_columns(columns), col_names
+
+    def to_native_cols(self, prefix=''):
+        # returns content in current storage format (dataframe or arrow table): both are read by duckdb without copying
+        if self._table is None:
+            return self.to_df_cols(prefix=prefix)
+        return self.to_arrow_cols(prefix=prefix)
+
+    def to_arrow(self):
+        """
+        Get content as arrow table with column names
+        """
+        columns = self.get_column_names()
+        self._drain_stream()
+        if self._table is not None:
+            return self._table.rename_columns(columns)
+        return pa.Table.from_pandas(self.to_df(), preserve_index=False)
 
     # --- tables ---
 
@@ -153,6 +258,7 @@ class ResultSet:
         self._columns.append(col)
 
         col_idx = len(self._columns) - 1
+        self._unload_table()
         if self._df is not None:
             self._df[col_idx] = values
         return col_idx
@@ -161,8 +267,18 @@ class ResultSet:
         idx = self.get_col_index(col)
         self._columns.pop(idx)
 
+        if self._stream is not None:
+            # column is removed from chunks when they are fetched
+            self._stream = _del_chunks_column(self._stream, idx)
+
+        if self._table is not None:
+            self._set_table(self._table.remove_column(idx))
+            return
+        if self._df is None:
+            return
+
         self._df.drop(idx, axis=1, inplace=True)
-        self._df = self._df.set_axis(range(len(self._df.columns)), axis=1)
+        self._df = self._df.set_axis(range(len(self._df.columns)), axis=1, copy=False)
 
     @property
     def columns(self):
@@ -199,12 +315,55 @@ class ResultSet:
 
     def set_col_type(self, col_idx, type_name):
         self.columns[col_idx].type = type_name
+        self._unload_table()
         if self._df is not None:
             self._df[col_idx] = self._df[col_idx].astype(type_name)
 
     # --- records ---
 
+    def _set_table(self, table):
+        # store arrow table with columns renamed to indexes
+        self._table = table.rename_columns([str(i) for i in range(table.num_columns)])
+        self._df = None
+
+    def set_stream(self, chunks):
+        """
+        Attach the rest of content as iterator of dataframes.
+        It is fetched lazily by iter_raw_dfs or at once on any other access to the content
+        """
+        self._stream = chunks
+
+    def _drain_stream(self):
+        if self._stream is None:
+            return
+        chunks, self._stream = self._stream, None
+        for df in chunks:
+            self.add_raw_df(df)
+
+    def iter_raw_dfs(self):
+        """
+        Yield content by chunks of dataframes with columns renamed to indexes.
+        Stream is consumed: result set is empty after iteration
+        """
+        chunks, self._stream = self._stream, None
+        if self._df is not None or self._table is not None:
+            yield self.get_raw_df()
+        self._df = None
+        if chunks is not None:
+            for df in chunks:
+                yield df.set_axis(range(len(df.columns)), axis=1, copy=False)
+
+    def _unload_table(self):
+        # switch storage to pandas: it is required before any modification of the content
+        self._drain_stream()
+        if self._table is None:
+            return
+        df = self._table.to_pandas()
+        self._table = None
+        self._df = df.set_axis(range(len(df.columns)), axis=1, copy=False).replace({np.nan: None})
+
     def get_raw_df(self):
+        self._unload_table()
         if self._df is None:
             names = range(len(self._columns))
             return pd.DataFrame([], columns=names)
@@ -214,7 +373,9 @@ class ResultSet:
         if len(df.columns) != len(self._columns):
             raise WrongArgumentError(f'Record length mismatch columns length: {len(df.columns)} != {len(self.columns)}')
 
-        df = df.set_axis(range(len(df.columns)), axis=1)
+        df = df.set_axis(range(len(df.columns)), axis=1, copy=False)
+
+        self._unload_table()
 
         if self._df is None:
             self._df = df
@@ -244,10 +405,13 @@ class ResultSet:
             return df.to_records(index=False).tolist()
 
         # slower but keep timestamp type
-        return self._df.to_dict('split')['data']
+        return self.get_raw_df().to_dict('split')['data']
 
     def get_column_values(self, col_idx):
         # get by column index
+        self._drain_stream()
+        if self._table is not None:
+            return self._table.column(col_idx).to_pylist()
         df = self.get_raw_df()
         return list(df[col_idx])
 
@@ -259,6 +423,7 @@ class ResultSet:
         else:
             col_idx = self.get_col_index(cols[0])
 
+        self._unload_table()
         if self._df is not None:
             self._df[col_idx] = values
 
@@ -290,3 +455,16 @@ class ResultSet:
 
     def length(self):
         return len(self)
+
+
+def _del_chunks_column(chunks, idx):
+    for df in chunks:
+        yield df.iloc[:, [i for i in range(len(df.columns)) if i != idx]]
+
+
+def _arrow_to_dtype(arrow_type):
+    # the same type as column would have after conversion to pandas
+    try:
+        return np.dtype(arrow_type.to_pandas_dtype())
+    except (NotImplementedError, TypeError):
+        return np.dtype(object)
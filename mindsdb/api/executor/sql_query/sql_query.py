@@ -12,11 +12,14 @@ import re
 import inspect
 from textwrap import dedent
 
-from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.ast import Select, Union
 from mindsdb_sql.planner.steps import (
     ApplyTimeseriesPredictorStep,
     ApplyPredictorRowStep,
     ApplyPredictorStep,
+    FetchDataframeStep,
+    InsertToTable,
+    SaveToTable,
 )
 
 from mindsdb_sql.exceptions import PlanningException
@@ -31,11 +34,14 @@ from mindsdb.api.executor.exceptions import (
     LogicError,
 )
 import mindsdb.utilities.profiler as profiler
+from mindsdb.utilities.context import context as ctx
 from mindsdb.utilities.fs import create_process_mark, delete_process_mark
 
 from . import steps
 from .result_set import ResultSet, Column
 from . steps.base import BaseStepCall
+from . steps.join_step import get_semi_join_steps
+from .plan_cache import plan_cache, parse_sql_cached
 
 superset_subquery = re.compile(r'from[\s\n]*(\(.*\))[\s\n]*as[\s\n]*virtual_table', flags=re.IGNORECASE | re.MULTILINE | re.S)
 
@@ -44,9 +50,12 @@ class SQLQuery:
 
     step_handlers = {}
 
-    def __init__(self, sql, session, execute=True, database=None):
+    def __init__(self, sql, session, execute=True, database=None, stream=False):
         self.session = session
 
+        # allow to return result by chunks if query is just fetching from integration
+        self.stream = stream
+
         if database is not None:
             self.database = database
         else:
@@ -59,8 +68,17 @@ class SQLQuery:
 
         self.columns_list = None
         self.steps_data = []
+        # fetch steps which are executed by join steps
+        self.semi_join_steps = {}
 
         self.planner = None
+        # key of the query in plan cache and version of the cache before planning
+        self.plan_key = None
+        self.plan_version = None
+        # steps from plan cache
+        self.cached_steps = None
+        # records of models which are used in the query
+        self.model_records = None
         self.parameters = []
         self.fetched_data = None
 
@@ -75,7 +93,7 @@ class SQLQuery:
                     self.outer_query = sql.replace(subquery, 'dataframe')
                     sql = subquery.strip('()')
             # endregion
-            self.query = parse_sql(sql, dialect='mindsdb')
+            self.query = parse_sql_cached(sql, dialect='mindsdb')
             self.context['query_str'] = sql
         else:
             self.query = sql
@@ -85,7 +103,23 @@ class SQLQuery:
             except Exception:
                 self.context['query_str'] = str(self.query)
 
-        self.create_planner()
+        if execute and isinstance(self.query, (Select, Union)):
+            # only plans of selects are cached: other queries are not repeated or have big data inside.
+            #   plan depends on used versions of models: they can be changed by training in other process
+            models_versions = tuple(
+                (project_name, table_name, table_version, None if record is None else (record.id, record.status))
+                for project_name, table_name, table_version, record in self.get_model_records()
+            )
+            self.plan_key = (ctx.company_id, self.database, str(self.query), models_versions)
+            cached_plan = plan_cache.get(self.plan_key)
+        else:
+            cached_plan = None
+
+        if cached_plan is not None:
+            self.context['predictor_metadata'], self.cached_steps, self.query = cached_plan
+        else:
+            self.plan_version = plan_cache.version
+            self.create_planner()
 
         if execute:
             self.prepare_query(prepare=False)
@@ -101,24 +135,35 @@ class SQLQuery:
                     step_name = cl.bind.__name__
                     cls.step_handlers[step_name] = cl
 
+    def get_model_records(self) -> list:
+        """ Find models which are used in the query
+
+        Returns:
+            list: tuples (project_name, table_name, table_version, model_record), model_record is None if not found
+        """
+        if self.model_records is None:
+            self.model_records = []
+            for project_name, table_name, table_version in get_query_models(
+                self.query, default_database=self.database
+            ):
+                args = {
+                    'name': table_name,
+                    'project_name': project_name
+                }
+                if table_version is not None:
+                    args['active'] = None
+                    args['version'] = table_version
+
+                self.model_records.append((project_name, table_name, table_version, get_model_record(**args)))
+        return self.model_records
+
     @profiler.profile()
     def create_planner(self):
         databases = self.session.database_controller.get_list()
 
         predictor_metadata = []
 
-        query_tables = get_query_models(self.query, default_database=self.database)
-
-        for project_name, table_name, table_version in query_tables:
-            args = {
-                'name': table_name,
-                'project_name': project_name
-            }
-            if table_version is not None:
-                args['active'] = None
-                args['version'] = table_version
-
-            model_record = get_model_record(**args)
+        for project_name, table_name, table_version, model_record in self.get_model_records():
             if model_record is None:
                 # check if it is an agent
                 try:
@@ -181,6 +226,7 @@ class SQLQuery:
                 })
 
             predictor['model_types'] = model_record.data.get('dtypes', {})
+            predictor['mode'] = (model_record.learn_args.get('using') or {}).get('mode')
 
             predictor_metadata.append(predictor)
 
@@ -249,14 +295,39 @@ class SQLQuery:
 
         process_mark = None
         try:
-            steps = list(self.planner.execute_steps(params))
+            steps = self.get_execute_steps(params)
             steps_classes = (x.__class__ for x in steps)
             predict_steps = (ApplyPredictorRowStep, ApplyPredictorStep, ApplyTimeseriesPredictorStep)
             if any(s in predict_steps for s in steps_classes):
                 process_mark = create_process_mark('predict')
+            stream = (
+                self.stream
+                and self.outer_query is None
+                and len(steps) == 1
+                and isinstance(steps[0], FetchDataframeStep)
+            )
+            # source of INSERT ... SELECT is written to the table by batches while it is fetched.
+            #   if the table is in the same integration, the source is fetched at first: the stream and
+            #   the insert would need two connections to it at the same time
+            stream_source = (
+                len(steps) == 2
+                and isinstance(steps[0], FetchDataframeStep)
+                and isinstance(steps[1], (InsertToTable, SaveToTable))
+                and getattr(steps[1].dataframe, 'step_num', None) == steps[0].step_num
+                and self._get_target_integration(steps[1]) != str(steps[0].integration).lower()
+            )
+            if not stream:
+                self.semi_join_steps = get_semi_join_steps(steps)
             for step in steps:
+                if step.step_num in self.semi_join_steps:
+                    # result will be fetched by join step
+                    self.steps_data.append(None)
+                    continue
                 with profiler.Context(f'step: {step.__class__.__name__}'):
-                    data = self.execute_step(step)
+                    if stream or (stream_source and step is steps[0]):
+                        data = self.execute_step_stream(step)
+                    else:
+                        data = self.execute_step(step)
                 step.set_result(data)
                 self.steps_data.append(data)
         except PlanningException as e:
@@ -268,7 +339,8 @@ class SQLQuery:
                 delete_process_mark('predict', process_mark)
 
         # save updated query
-        self.query = self.planner.query
+        if self.planner is not None:
+            self.query = self.planner.query
 
         # there was no executing
         if len(self.steps_data) == 0:
@@ -310,6 +382,19 @@ class SQLQuery:
         except Exception as e:
             raise UnknownError("error in column list step") from e
 
+    def get_execute_steps(self, params=None) -> list:
+        if self.cached_steps is not None:
+            return self.cached_steps
+
+        steps = list(self.planner.execute_steps(params))
+        if self.plan_key is not None and params is None:
+            plan_cache.set(
+                self.plan_key,
+                (self.context['predictor_metadata'], steps, self.planner.query),
+                version=self.plan_version
+            )
+        return steps
+
     def execute_step(self, step):
         cls_name = step.__class__.__name__
         handler = self.step_handlers.get(cls_name)
@@ -318,5 +403,18 @@ class SQLQuery:
 
         return handler(self).call(step)
 
+    def _get_target_integration(self, step) -> str:
+        # name of integration which contains the table of InsertToTable/SaveToTable step
+        if len(step.table.parts) > 1:
+            return step.table.parts[0].lower()
+        return str(self.context['database']).lower()
+
+    def execute_step_stream(self, step):
+        # pass-through step: the result is fetched from integration by chunks
+        executor_config = self.session.config.get('executor') or {}
+        fetch_size = executor_config.get('stream_chunk_size', 10000)
+
+        return self.step_handlers['FetchDataframeStep'](self).call_stream(step, fetch_size=fetch_size)
+
 
 SQLQuery.register_steps()
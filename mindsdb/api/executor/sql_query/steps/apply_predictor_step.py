@@ -2,6 +2,7 @@ import datetime as dt
 import re
 
 import dateinfer
+import numpy as np
 import pandas as pd
 
 from mindsdb_sql.parser.ast import (
@@ -20,10 +21,15 @@ from mindsdb_sql.planner.steps import (
 )
 
 from mindsdb.api.executor.sql_query.result_set import ResultSet, Column
-from mindsdb.utilities.cache import get_cache, dataframe_checksum
+from mindsdb.utilities.cache import get_cache, dataframe_checksum, dataframe_row_hashes, json_checksum
 
 from .base import BaseStepCall
 
+# predictions of a model in the row-level cache are split by this number of records
+PREDICTION_CACHE_BUCKETS = 64
+# keys of models which don't return exactly one prediction per input row: they are not cached per row
+_unaligned_models = set()
+
 
 def get_preditor_alias(step, mindsdb_database):
     predictor_name = '.'.join(step.predictor.parts)
@@ -180,44 +186,60 @@ class ApplyPredictorStepCall(ApplyPredictorBaseCall):
             predictor_id = predictor_metadata['id']
             table_df = data.to_df()
 
-            if self.session.predictor_cache is not False:
-                key = f'{predictor_name}_{predictor_id}_{dataframe_checksum(table_df)}'
+            # handle columns mapping to model
+            if step.columns_map is not None:
+                # step.columns_map is {str: Identifier}
 
-                predictor_cache = get_cache('predict')
-                predictions = predictor_cache.get(key)
+                cols_to_rename = {}
+                for model_col, table_col in step.columns_map.items():
+                    if len(table_col.parts) != 2:
+                        continue
+                    tbl_name, col_name = table_col.parts
+                    data_cols = data.find_columns(col_name, table_alias=tbl_name)
+                    if len(data_cols) == 0:
+                        continue
+                    # add first found column to rename list
+                    cols_to_rename[data.get_col_index(data_cols[0])] = model_col
+                # update input data
+                if cols_to_rename:
+                    columns = list(table_df.columns)
+                    for col_idx, name in cols_to_rename.items():
+                        columns[col_idx] = name
+                    table_df = table_df.set_axis(columns, axis=1)
+
+            version = None
+            if len(step.predictor.parts) > 1 and step.predictor.parts[-1].isdigit():
+                version = int(step.predictor.parts[-1])
+
+            use_cache = self.session.predictor_cache is not False
+            # in conversational modes prediction of a row depends on the previous rows
+            mode = params.get('mode') or predictor_metadata.get('mode')
+            is_conversational = isinstance(mode, str) and mode.startswith('conversational')
+            if (
+                use_cache
+                and not is_timeseries
+                and not is_conversational
+                and self.session.agents_controller.get_agent(predictor_name, project_name) is None
+            ):
+                # every row is predicted independently, predictions can be cached per row
+                predictions = self.apply_predictor_cached(
+                    project_name, predictor_name, predictor_id, table_df, version, params
+                )
             else:
-                predictions = None
-
-            if predictions is None:
-                # handle columns mapping to model
-                if step.columns_map is not None:
-                    # step.columns_map is {str: Identifier}
-
-                    cols_to_rename = {}
-                    for model_col, table_col in step.columns_map.items():
-                        if len(table_col.parts) != 2:
-                            continue
-                        tbl_name, col_name = table_col.parts
-                        data_cols = data.find_columns(col_name, table_alias=tbl_name)
-                        if len(data_cols) == 0:
-                            continue
-                        # add first found column to rename list
-                        cols_to_rename[data.get_col_index(data_cols[0])] = model_col
-                    # update input data
-                    if cols_to_rename:
-                        columns = list(table_df.columns)
-                        for col_idx, name in cols_to_rename.items():
-                            columns[col_idx] = name
-                        table_df = table_df.set_axis(columns, axis=1)
-
-                version = None
-                if len(step.predictor.parts) > 1 and step.predictor.parts[-1].isdigit():
-                    version = int(step.predictor.parts[-1])
-                predictions = self.apply_predictor(project_name, predictor_name, table_df, version, params)
-
-                if self.session.predictor_cache is not False:
-                    if predictions is not None and isinstance(predictions, pd.DataFrame):
-                        predictor_cache.set(key, predictions)
+                if use_cache:
+                    key = f'{predictor_name}_{predictor_id}_{dataframe_checksum(table_df)}'
+
+                    predictor_cache = get_cache('predict')
+                    predictions = predictor_cache.get(key)
+                else:
+                    predictions = None
+
+                if predictions is None:
+                    predictions = self.apply_predictor(project_name, predictor_name, table_df, version, params)
+
+                    if use_cache:
+                        if predictions is not None and isinstance(predictions, pd.DataFrame):
+                            predictor_cache.set(key, predictions)
 
             # apply filter
             if is_timeseries:
@@ -235,6 +257,103 @@ class ApplyPredictorStepCall(ApplyPredictorBaseCall):
 
         return result
 
+    def apply_predictor_cached(self, project_name, predictor_name, predictor_id, df, version, params):
+        """Apply predictor using the row-level cache of predictions.
+
+        Predictions of the model are cached by hash of input row. They are split by buckets (by hash),
+        every bucket is a separate record of cache: a query reads and updates only buckets of its rows.
+        Only rows which are not in the cache are sent to the model, predictions for other rows are taken
+        from the cache.
+
+        Args:
+            project_name (str): name of the project
+            predictor_name (str): name of the model
+            predictor_id (int): id of the model record
+            df (pd.DataFrame): input data with __mindsdb_row_id column
+            version (int): version of the model
+            params (dict): USING parameters of the query
+
+        Returns:
+            pd.DataFrame: predictions in order of input rows
+        """
+        if '__mindsdb_row_id' not in df.columns:
+            return self.apply_predictor(project_name, predictor_name, df, version, params)
+
+        input_columns = [col for col in df.columns if col != '__mindsdb_row_id']
+        key = '_'.join([
+            predictor_name, str(predictor_id), str(version),
+            json_checksum([input_columns, params])
+        ])
+        if key in _unaligned_models:
+            # model doesn't return one prediction per input row
+            return self.apply_predictor(project_name, predictor_name, df, version, params)
+
+        row_hashes = dataframe_row_hashes(df[input_columns])
+        row_ids = df['__mindsdb_row_id'].to_numpy()
+        buckets = row_hashes % PREDICTION_CACHE_BUCKETS
+
+        cache_size = self.session.config['cache'].get('max_size', 50) * PREDICTION_CACHE_BUCKETS
+        predictor_cache = get_cache('predict_rows', max_size=cache_size)
+        cached = {}
+        hit_mask = np.zeros(len(df), dtype=bool)
+        for bucket in np.unique(buckets):
+            bucket_df = predictor_cache.get(f'{key}_{bucket}')
+            if isinstance(bucket_df, pd.DataFrame):
+                cached[bucket] = bucket_df
+                bucket_mask = buckets == bucket
+                hit_mask[bucket_mask] = np.isin(row_hashes[bucket_mask], bucket_df.index.to_numpy())
+
+        hits = None
+        if hit_mask.any():
+            hit_hashes = row_hashes[hit_mask]
+            hits = pd.concat(
+                [bucket_df[bucket_df.index.isin(hit_hashes)] for bucket_df in cached.values()]
+            ).loc[hit_hashes].reset_index(drop=True)
+            hits['__mindsdb_row_id'] = row_ids[hit_mask]
+            if hit_mask.all():
+                return hits
+
+        miss_df = df[~hit_mask].reset_index(drop=True)
+        new_predictions = self.apply_predictor(project_name, predictor_name, miss_df, version, params)
+
+        # predictions can be cached only if there is exactly one prediction for every input row
+        is_aligned = (
+            isinstance(new_predictions, pd.DataFrame)
+            and '__mindsdb_row_id' in new_predictions.columns
+            and np.array_equal(new_predictions['__mindsdb_row_id'].to_numpy(), row_ids[~hit_mask])
+        )
+        if not is_aligned:
+            _unaligned_models.add(key)
+            if hits is None:
+                return new_predictions
+            if isinstance(new_predictions, pd.DataFrame) and '__mindsdb_row_id' in new_predictions.columns:
+                # rows are predicted independently: predictions of misses are merged with cached ones by row id
+                predictions = pd.concat([hits, new_predictions], ignore_index=True)
+                positions = pd.Series(np.arange(len(df)), index=row_ids)
+                order = positions.reindex(predictions['__mindsdb_row_id'].to_numpy()).to_numpy()
+                return predictions.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+            return self.apply_predictor(project_name, predictor_name, df, version, params)
+
+        max_rows = (self.session.config.get('executor') or {}).get('prediction_cache_max_rows', 0)
+        if max_rows > 0:
+            max_bucket_rows = max(1, max_rows // PREDICTION_CACHE_BUCKETS)
+            miss_buckets = buckets[~hit_mask]
+            new_cached = new_predictions.set_axis(row_hashes[~hit_mask], axis=0)
+            for bucket in np.unique(miss_buckets):
+                bucket_df = new_cached[miss_buckets == bucket]
+                if bucket in cached:
+                    bucket_df = pd.concat([cached[bucket], bucket_df])
+                    bucket_df = bucket_df[~bucket_df.index.duplicated(keep='last')]
+                predictor_cache.set(f'{key}_{bucket}', bucket_df.iloc[-max_bucket_rows:])
+
+        if hits is None:
+            return new_predictions
+
+        predictions = pd.concat([hits, new_predictions], ignore_index=True)
+        # restore order of input rows
+        positions = np.concatenate([np.flatnonzero(hit_mask), np.flatnonzero(~hit_mask)])
+        return predictions.iloc[np.argsort(positions, kind='stable')].reset_index(drop=True)
+
     def apply_ts_filter(self, predictor_data, table_data, step, predictor_metadata):
 
         if step.output_time_filter is None:
@@ -1,3 +1,5 @@
+from mindsdb.api.executor.sql_query.result_set import is_arrow_available
+
 
 class BaseStepCall:
     bind = None
@@ -15,5 +17,12 @@ class BaseStepCall:
     def get_columns_list(self):
         return self.sql_query.columns_list
 
+    def use_arrow_storage(self) -> bool:
+        # steps results can be kept in arrow tables instead of dataframes
+        if not is_arrow_available():
+            return False
+        executor_config = self.session.config.get('executor') or {}
+        return executor_config.get('result_set_storage') == 'arrow'
+
     def call(self, step):
         raise NotImplementedError
@@ -1,3 +1,5 @@
+import pandas as pd
+
 from mindsdb_sql.parser.ast import (
     Identifier,
     Constant,
@@ -90,11 +92,7 @@ class FetchDataframeStepCall(BaseStepCall):
 
             # TODO for information_schema we have 'database' = 'mindsdb'
 
-            # fill params
-            fill_params = get_fill_param_fnc(self.steps_data)
-            query_traversal(query, fill_params)
-
-            query, context_callback = query_context_controller.handle_db_context_vars(query, dn, self.session)
+            query, context_callback = self._prepare_query(query, dn)
 
             df, columns_info = dn.query(
                 query=query,
@@ -114,3 +112,44 @@ class FetchDataframeStepCall(BaseStepCall):
         )
 
         return result
+
+    def call_stream(self, step, fetch_size):
+        """
+        The same as call, but returned result set contains only the first chunk of data.
+        The rest is attached to it as a stream and is fetched from the integration on demand
+        """
+
+        dn = self.session.datahub.get(step.integration)
+
+        if step.query is None or not hasattr(dn, 'query_stream'):
+            return self.call(step)
+
+        query, context_callback = self._prepare_query(step.query, dn)
+        if context_callback:
+            # context variables need the whole result
+            return self.call(step)
+
+        table_alias = get_table_alias(query.from_table, self.context.get('database'))
+
+        chunks = dn.query_stream(query, fetch_size=fetch_size)
+        df = next(chunks, None)
+        if df is None:
+            df = pd.DataFrame()
+
+        result = ResultSet()
+        result.from_df(
+            df,
+            table_name=table_alias[1],
+            table_alias=table_alias[2],
+            database=table_alias[0]
+        )
+        result.set_stream(chunks)
+
+        return result
+
+    def _prepare_query(self, query, dn):
+        # fill params
+        fill_params = get_fill_param_fnc(self.steps_data)
+        query_traversal(query, fill_params)
+
+        return query_context_controller.handle_db_context_vars(query, dn, self.session)
@@ -1,12 +1,24 @@
 import copy
+from typing import List, Optional
 
 import numpy as np
+import pandas as pd
 
 from mindsdb_sql.parser.ast import (
+    ASTNode,
+    BinaryOperation,
+    Constant,
     Identifier,
+    Parameter,
+    Select,
+    Star,
+    Tuple,
 )
+from mindsdb_sql.planner.step_result import Result
 from mindsdb_sql.planner.steps import (
+    FetchDataframeStep,
     JoinStep,
+    PlanStep,
 )
 from mindsdb_sql.planner.utils import query_traversal
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
@@ -14,8 +26,85 @@ from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 from mindsdb.api.executor.sql_query.result_set import ResultSet
 from mindsdb.api.executor.utilities.sql import query_df_with_type_infer_fallback
 from mindsdb.api.executor.exceptions import NotSupportedYet
+from mindsdb.utilities import log
 
 from .base import BaseStepCall
+from .fetch_dataframe import FetchDataframeStepCall, get_table_alias
+
+logger = log.getLogger(__name__)
+
+# join types for which rows of the right table without pair in the left table are not used
+SEMI_JOIN_TYPES = ('join', 'inner join', 'left join', 'left outer join')
+
+# types of values which can be passed to 'IN' filter
+SEMI_JOIN_VALUE_TYPES = (int, float, str, bool)
+
+
+def _get_referenced_steps(step: PlanStep) -> set:
+    # numbers of steps which results are used by the step
+    step_nums = set(x.step_num for x in step.references)
+
+    def find_params(node, **kwargs):
+        if isinstance(node, Parameter) and isinstance(node.value, Result):
+            step_nums.add(node.value.step_num)
+
+    for value in vars(step).values():
+        if isinstance(value, Result):
+            step_nums.add(value.step_num)
+        elif isinstance(value, ASTNode):
+            query_traversal(value, find_params)
+    return step_nums
+
+
+def get_semi_join_steps(steps: List[PlanStep]) -> dict:
+    """Find fetch steps which can be executed later by join step with filter by keys of the left table.
+    The step is suitable if it is a simple select from one table and its result is used only by the join
+
+    Args:
+        steps (List[PlanStep]): steps of the plan
+
+    Returns:
+        dict: {step_num: step}
+    """
+    if any(hasattr(step, 'steps') or hasattr(step, 'reduce') for step in steps):
+        # plan with nested steps
+        return {}
+
+    usages = {}
+    for step in steps:
+        for step_num in _get_referenced_steps(step):
+            usages.setdefault(step_num, []).append(step)
+
+    fetch_steps = {
+        step.step_num: step
+        for step in steps
+        if isinstance(step, FetchDataframeStep)
+    }
+
+    semi_join_steps = {}
+    for step in steps:
+        if not isinstance(step, JoinStep):
+            continue
+        right_step = fetch_steps.get(step.right.step_num)
+        if right_step is None or usages.get(right_step.step_num) != [step]:
+            continue
+
+        query = right_step.query
+        if (
+            not isinstance(query, Select)
+            or not isinstance(query.from_table, Identifier)
+            or query.limit is not None
+            or query.offset is not None
+            or query.group_by is not None
+            or query.having is not None
+            or query.distinct
+        ):
+            continue
+
+        if step.query.join_type.lower() not in SEMI_JOIN_TYPES:
+            continue
+        semi_join_steps[right_step.step_num] = right_step
+    return semi_join_steps
 
 
 class JoinStepCall(BaseStepCall):
@@ -25,8 +114,16 @@ class JoinStepCall(BaseStepCall):
     def call(self, step):
         left_data = self.steps_data[step.left.step_num]
         right_data = self.steps_data[step.right.step_num]
-        table_a, names_a = left_data.to_df_cols(prefix='A')
-        table_b, names_b = right_data.to_df_cols(prefix='B')
+        if right_data is None:
+            # fetching of the right table was postponed to filter it by keys of the left table
+            right_step = self.sql_query.semi_join_steps.pop(step.right.step_num)
+            right_data = self.fetch_semi_join(step, left_data, right_step)
+            right_step.set_result(right_data)
+            self.steps_data[step.right.step_num] = right_data
+
+        # arrow tables and dataframes are passed to duckdb by reference
+        table_a, names_a = left_data.to_native_cols(prefix='A')
+        table_b, names_b = right_data.to_native_cols(prefix='B')
 
         if right_data.is_prediction or left_data.is_prediction:
             # ignore join condition, use row_id
@@ -71,17 +168,126 @@ class JoinStepCall(BaseStepCall):
                        SELECT * FROM table_a {join_type} table_b
                        ON {join_condition}
                    """
+        use_arrow = self.use_arrow_storage()
         resp_df, _description = query_df_with_type_infer_fallback(query, {
             'table_a': table_a,
             'table_b': table_b
-        })
-
-        resp_df = resp_df.replace({np.nan: None})
+        }, arrow=use_arrow)
 
         names_a.update(names_b)
-        data = ResultSet().from_df_cols(resp_df, col_names=names_a)
+        if use_arrow:
+            data = ResultSet().from_arrow_cols(resp_df, col_names=names_a)
+        else:
+            resp_df = resp_df.replace({np.nan: None})
+            data = ResultSet().from_df_cols(resp_df, col_names=names_a)
 
         for col in data.find_columns('__mindsdb_row_id'):
             data.del_column(col)
 
         return data
+
+    def _get_semi_join_keys(self, step, left_data: ResultSet, right_step: FetchDataframeStep) -> Optional[tuple]:
+        """
+        Find pair of columns from equality in join condition: column of the left table and column of the right
+        table which can be used in filter of the right table's query
+        """
+        if left_data.is_prediction:
+            return None
+
+        _, _, right_alias = get_table_alias(right_step.query.from_table, self.context.get('database'))
+        right_alias = right_alias.lower()
+
+        # columns which are returned by right query without changes
+        right_columns = set()
+        for target in right_step.query.targets:
+            if isinstance(target, Star):
+                right_columns = None
+                break
+            if isinstance(target, Identifier) and (target.alias is None or target.alias.parts == target.parts[-1:]):
+                right_columns.add(target.parts[-1].lower())
+
+        conditions = [step.query.condition]
+        while len(conditions) > 0:
+            condition = conditions.pop(0)
+            if not isinstance(condition, BinaryOperation):
+                continue
+            if condition.op.lower() == 'and':
+                conditions.extend(condition.args)
+                continue
+            if condition.op != '=':
+                continue
+
+            for arg1, arg2 in (condition.args, condition.args[::-1]):
+                if not isinstance(arg1, Identifier) or not isinstance(arg2, Identifier):
+                    break
+                if len(arg1.parts) != 2 or len(arg2.parts) != 2:
+                    break
+
+                table_alias, alias = arg1.parts
+                cols = left_data.find_columns(alias, table_alias)
+                if len(cols) != 1:
+                    continue
+
+                table_alias, right_column = arg2.parts
+                if table_alias.lower() != right_alias:
+                    continue
+                if right_columns is not None and right_column.lower() not in right_columns:
+                    continue
+                return left_data.get_col_index(cols[0]), right_column
+        return None
+
+    def fetch_semi_join(self, step, left_data: ResultSet, right_step: FetchDataframeStep) -> ResultSet:
+        """
+        Fetch the right table of the join. If the left table is small, distinct values of its join key
+        are added as 'IN' filter to the query of the right table (in batches if there are many values),
+        so only rows which can be joined are fetched from the integration
+        """
+        fetch_call = FetchDataframeStepCall(self.sql_query)
+
+        executor_config = self.session.config.get('executor') or {}
+        max_keys = executor_config.get('semi_join_max_keys', 10000)
+        batch_size = executor_config.get('semi_join_batch_size', 1000)
+
+        keys = None
+        if max_keys > 0 and len(left_data) <= max_keys:
+            keys = self._get_semi_join_keys(step, left_data, right_step)
+        if keys is None:
+            return fetch_call.call(right_step)
+
+        left_col_idx, right_column = keys
+        values = pd.Series(left_data.get_column_values(left_col_idx), dtype=object).dropna().unique().tolist()
+        if not all(isinstance(value, SEMI_JOIN_VALUE_TYPES) for value in values):
+            return fetch_call.call(right_step)
+
+        logger.debug(f'Semi-join: filter right table by {len(values)} keys of {right_column}')
+
+        results = []
+        # with empty list of keys one query is executed, to get columns of the table
+        for start in range(0, max(len(values), 1), batch_size):
+            query = copy.deepcopy(right_step.query)
+            batch = values[start:start + batch_size]
+            if len(batch) > 0:
+                condition = BinaryOperation(op='in', args=[
+                    Identifier(parts=[right_column]),
+                    Tuple([Constant(value) for value in batch])
+                ])
+                if query.where is None:
+                    query.where = condition
+                else:
+                    query.where = BinaryOperation(op='and', args=[query.where, condition])
+            else:
+                query.limit = Constant(0)
+
+            batch_step = FetchDataframeStep(
+                integration=right_step.integration,
+                query=query,
+                step_num=right_step.step_num
+            )
+            results.append(fetch_call.call(batch_step))
+
+        if len(results) == 1:
+            return results[0]
+
+        result = results[0]
+        result.add_raw_df(pd.concat([rs.get_raw_df() for rs in results[1:]], ignore_index=True))
+        return result
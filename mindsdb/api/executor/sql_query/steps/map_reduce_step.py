@@ -1,4 +1,7 @@
 import copy
+from typing import List
+
+import pandas as pd
 
 from mindsdb_sql.parser.ast import (
     BinaryOperation,
@@ -13,6 +16,8 @@ from mindsdb_sql.planner.steps import (
 
 from mindsdb.api.executor.sql_query.result_set import ResultSet
 from mindsdb.api.executor.exceptions import LogicError
+from mindsdb.interfaces.storage import db
+from mindsdb.utilities.context_executor import ContextThreadPoolExecutor
 
 from .base import BaseStepCall
 from .fetch_dataframe import FetchDataframeStepCall
@@ -52,12 +57,33 @@ def replaceQueryVar(where, var_value, var_name):
             where.value = var_value
 
 
-def join_query_data(target, source):
-    if len(target.columns) == 0:
-        target = source
-    else:
-        target.add_from_result_set(source)
-    return target
+def union_results(results: List[ResultSet]) -> ResultSet:
+    """Union results with the same columns, content is concatenated once
+
+    Args:
+        results (List[ResultSet]): results to union, columns are matched by names
+
+    Returns:
+        ResultSet
+    """
+    results = [rs for rs in results if len(rs.columns) > 0]
+    if len(results) == 0:
+        return ResultSet()
+    if len(results) == 1:
+        return results[0]
+
+    data = results[0]
+    names = data.get_column_names()
+    dfs = [data.get_raw_df()]
+    for rs in results[1:]:
+        source_names = rs.get_column_names()
+        col_sequence = [source_names.index(name) for name in names]
+        df = rs.get_raw_df()[col_sequence]
+        dfs.append(df.set_axis(range(len(col_sequence)), axis=1, copy=False))
+
+    result = ResultSet(columns=data.columns)
+    result.add_raw_df(pd.concat(dfs, ignore_index=True))
+    return result
 
 
 class MapReduceStepCall(BaseStepCall):
@@ -92,18 +118,18 @@ class MapReduceStepCall(BaseStepCall):
                     data.add_column(column)
 
                 data.add_from_result_set(sub_data)
-
-            for var_group in vars:
+            else:
                 markQueryVar(query.where)
-                for name, value in var_group.items():
-                    replaceQueryVar(query.where, value, name)
-                sub_data = self._fetch_dataframe_step(substep)
-                if len(data.columns) == 0:
-                    data = sub_data
-                else:
-                    data.add_from_result_set(sub_data)
-
+                steps = []
+                for var_group in vars:
+                    substep2 = copy.copy(substep)
+                    substep2.query = copy.deepcopy(query)
+                    for name, value in var_group.items():
+                        replaceQueryVar(substep2.query.where, value, name)
+                    steps.append(substep2)
                 unmarkQueryVar(query.where)
+
+                data = union_results(self._map(self._fetch_dataframe_step, steps))
         elif type(substep) is MultipleSteps:
             data = self._multiple_steps_reduce(substep, vars)
         else:
@@ -114,8 +140,6 @@ class MapReduceStepCall(BaseStepCall):
         if step.reduce != 'union':
             raise LogicError(f'Unknown MultipleSteps type: {step.reduce}')
 
-        data = ResultSet()
-
         # mark vars
         steps = []
         for substep in step.steps:
@@ -125,22 +149,38 @@ class MapReduceStepCall(BaseStepCall):
             markQueryVar(substep.query.where)
             steps.append(substep)
 
+        steps_groups = []
         for var_group in vars:
             steps2 = copy.deepcopy(steps)
             for name, value in var_group.items():
                 for substep in steps2:
                     replaceQueryVar(substep.query.where, value, name)
-            sub_data = self._multiple_steps(steps2)
-            data = join_query_data(data, sub_data)
+            steps_groups.append(steps2)
 
-        return data
+        return union_results(self._map(self._multiple_steps, steps_groups))
 
     def _multiple_steps(self, steps):
-        data = ResultSet()
-        for substep in steps:
-            sub_data = self._fetch_dataframe_step(substep)
-            data = join_query_data(data, sub_data)
-        return data
+        return union_results([self._fetch_dataframe_step(substep) for substep in steps])
 
     def _fetch_dataframe_step(self, step):
         return FetchDataframeStepCall(self.sql_query).call(step)
+
+    def _map(self, fnc, items: list) -> list:
+        """
+        Apply function to every item. Items are processed in parallel in a bounded thread pool,
+        every thread uses its own connections to integrations (handlers are cached per thread)
+        """
+        executor_config = self.session.config.get('executor') or {}
+        max_workers = min(executor_config.get('map_reduce_max_workers', 8), len(items))
+        if max_workers <= 1:
+            return [fnc(item) for item in items]
+
+        def task(item):
+            try:
+                return fnc(item)
+            finally:
+                # db session of the worker thread
+                db.session.remove()
+
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(task, items))
@@ -25,7 +25,7 @@ class ProjectStepCall(BaseStepCall):
     def call(self, step):
         result_set = self.steps_data[step.dataframe.step_num]
 
-        df, col_names = result_set.to_df_cols()
+        df, col_names = result_set.to_native_cols()
         col_idx = {}
         tbl_idx = defaultdict(list)
         for name, col in col_names.items():
@@ -81,6 +81,10 @@ class ProjectStepCall(BaseStepCall):
                 targets.append(target)
         query.targets = targets
 
+        if result_set.is_arrow:
+            res = query_df(df, query, session=self.session, arrow=True)
+            return ResultSet().from_arrow_cols(res, col_names, strict=False)
+
         res = query_df(df, query, session=self.session)
 
         return ResultSet().from_df_cols(res, col_names, strict=False)
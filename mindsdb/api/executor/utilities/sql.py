@@ -1,9 +1,12 @@
 import copy
+import threading
+from pathlib import Path
+from contextlib import contextmanager
 from typing import List
 
 import duckdb
-from duckdb import InvalidInputException
 import numpy as np
+import pandas as pd
 
 from mindsdb_sql import parse_sql
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
@@ -52,53 +55,122 @@ def get_query_models(query: ASTNode, default_database: str = None) -> List[tuple
     return _get_query_tables(query, resolve_model_identifier, default_database)
 
 
-def query_df_with_type_infer_fallback(query_str: str, dataframes: dict, user_functions=None):
-    ''' Duckdb need to infer column types if column.dtype == object. By default it take 1000 rows,
-        but that may be not sufficient for some cases. This func try to run query multiple times
-        increasing butch size for type infer
+# pandas_analyze_sample limits for duckdb type inference of object columns
+MIN_ANALYZE_SAMPLE = 1000
+MAX_ANALYZE_SAMPLE = 1000000
+
+_duckdb_local = threading.local()
+
+
+@contextmanager
+def duckdb_connection():
+    """ In-memory duckdb connection of the current thread. Connection is created once and reused by
+        next queries of the thread. If connection is already in use (nested call), then temporary
+        connection is returned
+
+        Yields:
+            duckdb.DuckDBPyConnection
+    """
+    if getattr(_duckdb_local, 'in_use', False):
+        con = duckdb.connect(database=':memory:')
+        try:
+            yield con
+        finally:
+            con.close()
+        return
+
+    con = getattr(_duckdb_local, 'connection', None)
+    if con is None:
+        con = duckdb.connect(database=':memory:')
+        _duckdb_local.connection = con
+
+    _duckdb_local.in_use = True
+    try:
+        yield con
+    finally:
+        _duckdb_local.in_use = False
+
+
+def get_analyze_sample_size(dataframes: dict) -> int:
+    """ Duckdb infers types of object columns using first 'pandas_analyze_sample' rows. It is not
+        sufficient if type of values is changed after the sample, so the size of the sample is
+        chosen to cover whole dataframes with object columns
+
+        Args:
+            dataframes (dict): dataframes or arrow tables
+
+        Returns:
+            int: sample size
+    """
+    sample_size = MIN_ANALYZE_SAMPLE
+    for df in dataframes.values():
+        if isinstance(df, pd.DataFrame) and (df.dtypes == object).any():
+            sample_size = max(sample_size, len(df))
+    return min(sample_size, MAX_ANALYZE_SAMPLE)
+
+
+def query_df_with_type_infer_fallback(query_str: str, dataframes: dict, user_functions=None, arrow=False):
+    ''' Execute query on dataframes using duckdb connection of the current thread.
+        Size of sample for type inference of object columns is defined before the execution,
+        so query is executed once
 
         Args:
             query_str (str): query to execute
-            dataframes (dict): dataframes
+            dataframes (dict): dataframes, arrow tables or paths to parquet files
             user_functions: functions controller which register new functions in connection
+            arrow (bool): return result as arrow table
 
         Returns:
-            pandas.DataFrame
+            pandas.DataFrame | pyarrow.Table
             pandas.columns
     '''
 
-    for name, value in dataframes.items():
-        locals()[name] = value
-
-    con = duckdb.connect(database=':memory:')
-    if user_functions:
-        user_functions.register(con)
-
-    for sample_size in [1000, 10000, 1000000]:
+    with duckdb_connection() as con:
         try:
-            con.execute(f'set global pandas_analyze_sample={sample_size};')
-            result_df = con.execute(query_str).fetchdf()
-        except InvalidInputException:
-            pass
-        else:
-            break
-    else:
-        raise InvalidInputException
-    description = con.description
-    con.close()
+            for name, value in dataframes.items():
+                if isinstance(value, Path):
+                    # view over scan of parquet: projections and filters are pushed down to the scan
+                    path = str(value).replace("'", "''")
+                    con.execute(f"create or replace temp view {name} as select * from read_parquet('{path}')")
+                else:
+                    con.register(name, value)
+            if user_functions:
+                user_functions.register(con)
+
+            con.execute(f'set pandas_analyze_sample={get_analyze_sample_size(dataframes)};')
+            if arrow:
+                result_df = con.execute(query_str).arrow()
+            else:
+                result_df = con.execute(query_str).fetchdf()
+            description = con.description
+        finally:
+            # connection is reused: clean it up
+            for name, value in dataframes.items():
+                if isinstance(value, Path):
+                    con.execute(f'drop view if exists {name}')
+                else:
+                    con.unregister(name)
+            if user_functions:
+                for name in user_functions.functions.keys():
+                    try:
+                        con.remove_function(name)
+                    except duckdb.InvalidInputException:
+                        # function wasn't registered
+                        pass
 
     return result_df, description
 
 
-def query_df(df, query, session=None):
+def query_df(df, query, session=None, arrow=False):
     """ Perform simple query ('select' from one table, without subqueries and joins) on DataFrame.
 
         Args:
-            df (pandas.DataFrame): data
+            df (pandas.DataFrame | pyarrow.Table | pathlib.Path): data or path to parquet file with data
             query (mindsdb_sql.parser.ast.Select | str): select query
+            arrow (bool): return result as arrow table
 
         Returns:
-            pandas.DataFrame
+            pandas.DataFrame | pyarrow.Table
     """
 
     if isinstance(query, str):
@@ -150,6 +222,15 @@ def query_df(df, query, session=None):
 
     query_traversal(query_ast, adapt_query)
 
+    if isinstance(df, Path):
+        # parquet doesn't contain nested values: json columns are strings already
+        json_columns = set()
+    elif not isinstance(df, pd.DataFrame) and (
+        len(json_columns) > 0 or table_name.lower() in ('models', 'predictors', 'ml_engines')
+    ):
+        # these cases are handled on pandas side
+        df = df.to_pandas()
+
     # convert json columns
     encoder = CustomJSONEncoder()
 
@@ -173,7 +254,7 @@ def query_df(df, query, session=None):
         query_str = render.get_string(query_ast, with_failback=True)
 
     # workaround to prevent duckdb.TypeMismatchException
-    if len(df) > 0:
+    if not isinstance(df, Path) and len(df) > 0:
         if table_name.lower() in ('models', 'predictors'):
             if 'TRAINING_OPTIONS' in df.columns:
                 df = df.astype({'TRAINING_OPTIONS': 'string'})
@@ -181,11 +262,16 @@ def query_df(df, query, session=None):
             if 'CONNECTION_DATA' in df.columns:
                 df = df.astype({'CONNECTION_DATA': 'string'})
 
-    result_df, description = query_df_with_type_infer_fallback(query_str, {'df': df}, user_functions=user_functions)
+    result_df, description = query_df_with_type_infer_fallback(
+        query_str, {'df': df}, user_functions=user_functions, arrow=arrow
+    )
+    real_column_names = [x[0] for x in description]
+    if arrow:
+        return result_df.rename_columns(real_column_names)
+
     result_df = result_df.replace({np.nan: None})
 
     new_column_names = {}
-    real_column_names = [x[0] for x in description]
     for i, duck_column_name in enumerate(result_df.columns):
         new_column_names[duck_column_name] = real_column_names[i]
     result_df = result_df.rename(
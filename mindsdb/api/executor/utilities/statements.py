@@ -0,0 +1,47 @@
+"""
+Statements of mindsdb which are not in the syntax of mindsdb_sql.
+They are recognized before the query is parsed by mindsdb_sql
+"""
+import re
+from typing import Optional
+
+from mindsdb_sql.parser.ast import Identifier
+from mindsdb_sql.parser.ast.base import ASTNode
+
+REFRESH_TABLES_RE = re.compile(
+    r'^\s*refresh\s+tables(?:\s+(?:from|in)\s+(?:`([^`]+)`|(\w+)))?\s*;?\s*$',
+    re.IGNORECASE
+)
+
+
+class RefreshTables(ASTNode):
+    """REFRESH TABLES [FROM database]: forget cached lists of tables and columns of integrations"""
+
+    def __init__(self, database: Optional[Identifier] = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.database = database
+
+    def to_tree(self, *args, level=0, **kwargs):
+        ind = '\t' * level
+        return f'{ind}RefreshTables(database={self.database})'
+
+    def get_string(self, *args, **kwargs):
+        if self.database is None:
+            return 'REFRESH TABLES'
+        return f'REFRESH TABLES FROM {self.database.to_string()}'
+
+
+def parse_statement(sql: str) -> Optional[ASTNode]:
+    """Parse statement which is not in the syntax of mindsdb_sql
+
+    Args:
+        sql (str): query
+
+    Returns:
+        ASTNode: statement, None if query is not such statement
+    """
+    match = REFRESH_TABLES_RE.match(sql)
+    if match is not None:
+        name = match.group(1) or match.group(2)
+        return RefreshTables(database=Identifier(parts=[name]) if name is not None else None)
+    return None
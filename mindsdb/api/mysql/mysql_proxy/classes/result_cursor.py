@@ -0,0 +1,154 @@
+import time
+import weakref
+import threading
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from mindsdb.api.executor.sql_query.result_set import ResultSet
+from mindsdb.utilities.config import Config
+
+
+class ResultCursor:
+    """Server side cursor of the prepared statement.
+
+    Rows are pulled from the result set by batches on every fetch. If the result set is a stream,
+    then only the current chunk of it is kept in memory. The stream holds connection to the integration:
+    if client doesn't fetch rows for idle_timeout seconds, the rest of the stream is read to memory
+    and the connection is released.
+    """
+
+    def __init__(self, result_set: ResultSet, idle_timeout: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._stream = None
+        if result_set.is_stream:
+            self._chunks = result_set.iter_raw_dfs()
+            if idle_timeout is None:
+                idle_timeout = (Config().get('executor') or {}).get('stream_idle_timeout', 30)
+            if idle_timeout > 0:
+                self._stream = self._chunks
+                idle_cursors.add(self, idle_timeout)
+        else:
+            # result set stays untouched, so statement can be executed again
+            self._chunks = iter([result_set.get_raw_df()])
+        # not fetched rows of the current chunk
+        self._current = None
+        self.fetched = 0
+        self.used_at = time.time()
+
+    def _next_chunk(self) -> Optional[pd.DataFrame]:
+        self.used_at = time.time()
+        if self._current is not None and len(self._current) > 0:
+            return self._current
+        self._current = None
+        with self._lock:
+            for df in self._chunks:
+                if len(df) > 0:
+                    self._current = df
+                    break
+        return self._current
+
+    def release_stream(self) -> None:
+        """Read the rest of the stream to memory and close it"""
+        with self._lock:
+            if self._stream is None:
+                return
+            chunks = list(self._stream)
+            self._stream.close()
+            self._stream = None
+            self._chunks = iter(chunks)
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._stream is not None
+
+    @property
+    def is_exhausted(self) -> bool:
+        return self._next_chunk() is None
+
+    def fetch(self, limit: int) -> pd.DataFrame:
+        """Get next rows of the result
+
+        Args:
+            limit (int): max number of rows to return
+
+        Returns:
+            pd.DataFrame: rows, columns are named by indexes
+        """
+        parts = []
+        while limit > 0:
+            df = self._next_chunk()
+            if df is None:
+                break
+            part = df.iloc[:limit]
+            self._current = df.iloc[limit:]
+            parts.append(part)
+            limit -= len(part)
+
+        if len(parts) == 0:
+            return pd.DataFrame()
+        self.fetched += sum(len(part) for part in parts)
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True)
+
+    def iter_all(self) -> Iterator[pd.DataFrame]:
+        """Get all remaining rows by chunks"""
+        while True:
+            df = self._next_chunk()
+            if df is None:
+                break
+            self._current = None
+            self.fetched += len(df)
+            yield df
+
+    def close(self):
+        with self._lock:
+            if hasattr(self._chunks, 'close'):
+                self._chunks.close()
+            self._stream = None
+        self._current = None
+
+
+class IdleCursors:
+    """Cursors with opened streams, which are released if client doesn't read them
+    """
+
+    def __init__(self, check_interval: float = 1):
+        self.check_interval = check_interval
+        self._cursors = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, cursor: ResultCursor, idle_timeout: float) -> None:
+        with self._lock:
+            self._cursors[cursor] = idle_timeout
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._watch, daemon=True)
+                self._thread.start()
+
+    def release_idle(self) -> None:
+        """Release streams of cursors which were not used for their idle timeout"""
+        now = time.time()
+        with self._lock:
+            items = list(self._cursors.items())
+        for cursor, idle_timeout in items:
+            if not cursor.is_streaming:
+                with self._lock:
+                    self._cursors.pop(cursor, None)
+            elif now - cursor.used_at >= idle_timeout:
+                cursor.release_stream()
+                with self._lock:
+                    self._cursors.pop(cursor, None)
+
+    def _watch(self) -> None:
+        while True:
+            time.sleep(self.check_interval)
+            self.release_idle()
+            with self._lock:
+                if len(self._cursors) == 0:
+                    self._thread = None
+                    return
+
+
+idle_cursors = IdleCursors()
@@ -88,7 +88,8 @@ class BinaryResultsetRowPacket(Packet):
                     env_val = struct.pack(enc, val)
                 self.value.append(env_val)
 
-    def encode_date(self, val):
+    @staticmethod
+    def encode_date(val):
         # date_type = None
         # date_value = None
 
@@ -1,9 +1,12 @@
-from mindsdb_sql import parse_sql
+import copy
+
 from mindsdb_sql.planner import utils as planner_utils
 
 import mindsdb.utilities.profiler as profiler
 from mindsdb.api.executor import Column, SQLQuery
 from mindsdb.api.executor.command_executor import ExecuteCommands
+from mindsdb.api.executor.sql_query.plan_cache import parse_sql_cached
+from mindsdb.api.executor.utilities.statements import parse_statement
 from mindsdb.api.mysql.mysql_proxy.utilities import ErSqlSyntaxError
 from mindsdb.utilities import log
 
@@ -25,18 +28,25 @@ class Executor:
     Thus please make sure that IF you change the API,
     you must update the API of these two classes as well!"""
 
-    def __init__(self, session, sqlserver):
+    def __init__(self, session, sqlserver, stream=False):
         self.session = session
         self.sqlserver = sqlserver
 
         self.query = None
+        # prepared query with not filled parameters
+        self._prepared_query = None
 
         # returned values
         # all this attributes needs to be added in
         # self.json() method
         self.columns = []
         self.params = []
-        self.data = None
+        self._data = None
+        # result of the query. it can be a stream if stream=True
+        self.result_set = None
+        self.json_types = False
+        # the result is a stream from the integration
+        self._streamed = False
         self.state_track = None
         self.server_status = None
         self.is_executed = False
@@ -46,15 +56,25 @@ class Executor:
         self.sql = ""
         self.sql_lower = ""
 
-        context = {'connection_id': self.sqlserver.connection_id}
+        self.stream = stream
+
+        context = {'connection_id': self.sqlserver.connection_id, 'stream': stream}
         self.command_executor = ExecuteCommands(self.session, context)
 
+    @property
+    def data(self):
+        # rows of the result set, they are converted from the result set on first access
+        if self._data is None and self.result_set is not None:
+            self._data = self.result_set.to_lists(json_types=self.json_types)
+        return self._data
+
     def change_default_db(self, new_db):
         self.command_executor.change_default_db(new_db)
 
     def stmt_prepare(self, sql):
 
         self.parse(sql)
+        self._prepared_query = self.query
 
         # if not params
         params = planner_utils.get_query_params(self.query)
@@ -86,10 +106,18 @@ class Executor:
 
     def stmt_execute(self, param_values):
         if self.is_executed:
-            return
-
-        # fill params
-        self.query = planner_utils.fill_query_params(self.query, param_values)
+            # query is executed again if it has parameters (values can be different)
+            # or if its streamed result is already consumed: streamed result can be read only once
+            stream_consumed = self._streamed and not self.result_set.is_stream
+            if len(self.params) == 0 and not stream_consumed:
+                return
+            self.is_executed = False
+            self.result_set = None
+            self._data = None
+            self._streamed = False
+
+        # fill params, prepared query is kept unfilled for the next executions
+        self.query = planner_utils.fill_query_params(copy.deepcopy(self._prepared_query), param_values)
 
         # execute query
         self.do_execute()
@@ -108,11 +136,16 @@ class Executor:
         sql_lower = sql.lower()
         self.sql_lower = sql_lower.replace("`", "")
 
+        # statements of mindsdb which are not in the syntax of mindsdb_sql
+        self.query = parse_statement(sql)
+        if self.query is not None:
+            return
+
         try:
-            self.query = parse_sql(sql, dialect="mindsdb")
+            self.query = parse_sql_cached(sql, dialect="mindsdb")
         except Exception as mdb_error:
             try:
-                self.query = parse_sql(sql, dialect="mysql")
+                self.query = parse_sql_cached(sql, dialect="mysql")
             except Exception:
                 # not all statements are parsed by parse_sql
                 logger.warning(f"SQL statement is not parsed by mindsdb_sql: {sql}")
@@ -138,11 +171,13 @@ class Executor:
         self.is_executed = True
 
         if self.sqlserver.session.api_type == 'http':
-            json_types = True
+            self.json_types = True
         else:
-            json_types = False
+            self.json_types = False
         if ret.data is not None:
-            self.data = ret.data.to_lists(json_types=json_types)
+            self.result_set = ret.data
+            self._data = None
+            self._streamed = ret.data.is_stream
             self.columns = ret.data.columns
 
         self.state_track = ret.state_track
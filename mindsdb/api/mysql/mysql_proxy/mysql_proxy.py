@@ -29,6 +29,7 @@ from pandas.api import types as pd_types
 import mindsdb.utilities.hooks as hooks
 import mindsdb.utilities.profiler as profiler
 from mindsdb.api.mysql.mysql_proxy.classes.client_capabilities import ClentCapabilities
+from mindsdb.api.mysql.mysql_proxy.classes.result_cursor import ResultCursor
 from mindsdb.api.mysql.mysql_proxy.classes.server_capabilities import (
     server_capabilities,
 )
@@ -38,7 +39,6 @@ from mindsdb.api.mysql.mysql_proxy.classes.sql_statement_parser import (
 from mindsdb.api.executor.controllers import SessionController
 from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packet import Packet
 from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packets import (
-    BinaryResultsetRowPacket,
     ColumnCountPacket,
     ColumnDefenitionPacket,
     CommandPacket,
@@ -69,6 +69,8 @@ from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import (
     getConstName,
 )
 from mindsdb.api.executor.data_types.response_type import RESPONSE_TYPE
+from mindsdb.api.executor.sql_query.result_set import ResultSet
+from mindsdb.api.mysql.mysql_proxy.utilities import dump
 from mindsdb.api.mysql.mysql_proxy.utilities import (
     ErWrongCharset,
     SqlApiException,
@@ -129,10 +131,13 @@ class SQLAnswer:
         state_track: List[List] = None,
         error_code: int = None,
         error_message: str = None,
+        result_set: ResultSet = None,
     ):
         self.resp_type = resp_type
         self.columns = columns
         self.data = data
+        # alternative to data: rows are encoded directly from the result set (it also can be a stream)
+        self.result_set = result_set
         self.status = status
         self.state_track = state_track
         self.error_code = error_code
@@ -341,17 +346,31 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
         self.socket.sendall(string)
 
     def answer_stmt_close(self, stmt_id):
+        cursor = self.session.prepared_stmts[stmt_id].get("cursor")
+        if cursor is not None:
+            cursor.close()
         self.session.unregister_stmt(stmt_id)
 
     def send_query_answer(self, answer: SQLAnswer):
-        if answer.type == RESPONSE_TYPE.TABLE:
-            packages = []
-            packages += self.get_tabel_packets(columns=answer.columns, data=answer.data)
+        if answer.type == RESPONSE_TYPE.TABLE and answer.result_set is not None and answer.result_set.is_stream:
+            self.send_query_answer_stream(answer)
+        elif answer.type == RESPONSE_TYPE.TABLE:
+            if answer.result_set is not None:
+                encoded, max_lengths = dump.encode_text_df(answer.result_set.get_raw_df())
+            else:
+                encoded, max_lengths = dump.encode_text_rows(answer.data, len(answer.columns))
+
+            buffer = bytearray()
+            for packet in self.get_table_header_packets(answer.columns, max_lengths=max_lengths):
+                buffer += packet.accum()
+            self.session.packet_sequence_number = dump.write_text_rows(
+                buffer, encoded, self.session.packet_sequence_number
+            )
             if answer.status is not None:
-                packages.append(self.last_packet(status=answer.status))
+                buffer += self.last_packet(status=answer.status).accum()
             else:
-                packages.append(self.last_packet())
-            self.send_package_group(packages)
+                buffer += self.last_packet().accum()
+            self.socket.sendall(buffer)
         elif answer.type == RESPONSE_TYPE.OK:
             self.packet(OkPacket, state_track=answer.state_track).send()
         elif answer.type == RESPONSE_TYPE.ERROR:
@@ -359,7 +378,32 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 ErrPacket, err_code=answer.error_code, msg=answer.error_message
             ).send()
 
-    def _get_column_defenition_packets(self, columns, data=None):
+    def send_query_answer_stream(self, answer: SQLAnswer):
+        # header is sent before data is fetched, so max length of columns is unknown
+        self.send_package_group(self.get_table_header_packets(answer.columns))
+
+        try:
+            for df in answer.result_set.iter_raw_dfs():
+                encoded, _ = dump.encode_text_df(df)
+                buffer = bytearray()
+                self.session.packet_sequence_number = dump.write_text_rows(
+                    buffer, encoded, self.session.packet_sequence_number
+                )
+                self.socket.sendall(buffer)
+        except Exception as e:
+            # the result is already partially sent: finish it with error
+            logger.error(f"Error while streaming query result: {e}")
+            self.packet(
+                ErrPacket, err_code=ERR.ER_UNKNOWN_ERROR, msg=str(e)
+            ).send()
+            return
+
+        if answer.status is not None:
+            self.send_package_group([self.last_packet(status=answer.status)])
+        else:
+            self.send_package_group([self.last_packet()])
+
+    def _get_column_defenition_packets(self, columns, data=None, max_lengths=None):
         if data is None:
             data = []
         packets = []
@@ -374,7 +418,9 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             column_name = column.get("name", "column_name")
             column_alias = column.get("alias", column_name)
             flags = column.get("flags", 0)
-            if len(data) == 0:
+            if max_lengths is not None:
+                length = max_lengths[i]
+            elif len(data) == 0:
                 length = 0xFFFF
             else:
                 length = 1
@@ -400,14 +446,17 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             )
         return packets
 
-    def get_tabel_packets(self, columns, data, status=0):
-        # TODO remove columns order
+    def get_table_header_packets(self, columns, data=None, max_lengths=None, status=0):
         packets = [self.packet(ColumnCountPacket, count=len(columns))]
-        packets.extend(self._get_column_defenition_packets(columns, data))
+        packets.extend(self._get_column_defenition_packets(columns, data, max_lengths))
 
         if self.client_capabilities.DEPRECATE_EOF is False:
             packets.append(self.packet(EofPacket, status=status))
+        return packets
 
+    def get_tabel_packets(self, columns, data, status=0):
+        # TODO remove columns order
+        packets = self.get_table_header_packets(columns, data, status=status)
         packets += [self.packet(ResultsetRowPacket, data=x) for x in data]
         return packets
 
@@ -522,11 +571,12 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
 
     @profiler.profile()
     def process_query(self, sql):
-        executor = Executor(session=self.session, sqlserver=self)
+        stream = self.session.config["api"]["mysql"].get("stream_results", False)
+        executor = Executor(session=self.session, sqlserver=self, stream=stream)
 
         executor.query_execute(sql)
 
-        if executor.data is None:
+        if executor.result_set is None:
             resp = SQLAnswer(
                 resp_type=RESPONSE_TYPE.OK,
                 state_track=executor.state_track,
@@ -536,13 +586,15 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 resp_type=RESPONSE_TYPE.TABLE,
                 state_track=executor.state_track,
                 columns=self.to_mysql_columns(executor.columns),
-                data=executor.data,
+                result_set=executor.result_set,
                 status=executor.server_status,
             )
         return resp
 
     def answer_stmt_prepare(self, sql):
-        executor = Executor(session=self.session, sqlserver=self)
+        # result of prepared statement is read by cursor, so it can be streamed from the integration
+        stream = self.session.config["api"]["mysql"].get("stream_results", False)
+        executor = Executor(session=self.session, sqlserver=self, stream=stream)
         stmt_id = self.session.register_stmt(executor)
 
         executor.stmt_prepare(sql)
@@ -579,12 +631,19 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
 
         executor.stmt_execute(parameters)
 
-        if executor.data is None:
+        if prepared_stmt.get("cursor") is not None:
+            prepared_stmt["cursor"].close()
+            prepared_stmt["cursor"] = None
+
+        if executor.result_set is None:
             resp = SQLAnswer(
                 resp_type=RESPONSE_TYPE.OK, state_track=executor.state_track
             )
             return self.send_query_answer(resp)
 
+        cursor = ResultCursor(executor.result_set)
+        prepared_stmt["fetched"] = 0
+
         # TODO prepared_stmt['type'] == 'lock' is not used but it works
         columns_def = self.to_mysql_columns(executor.columns)
         packages = [self.packet(ColumnCountPacket, count=len(columns_def))]
@@ -592,41 +651,45 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
         packages.extend(self._get_column_defenition_packets(columns_def))
 
         if self.client_capabilities.DEPRECATE_EOF is False:
+            # rows will be read by fetch commands
             packages.append(self.packet(EofPacket, status=0x0062))
-        else:
-            # send all
-            for row in executor.data:
-                packages.append(
-                    self.packet(BinaryResultsetRowPacket, data=row, columns=columns_def)
-                )
+            prepared_stmt["cursor"] = cursor
+            return self.send_package_group(packages)
 
-            server_status = executor.server_status or 0x0002
-            packages.append(self.last_packet(status=server_status))
-            prepared_stmt["fetched"] += len(executor.data)
+        # send all
+        self.send_package_group(packages)
+        for df in cursor.iter_all():
+            buffer = bytearray()
+            self.session.packet_sequence_number = dump.write_binary_rows(
+                buffer, dump.encode_binary_df(df, columns_def), self.session.packet_sequence_number
+            )
+            self.socket.sendall(buffer)
+        prepared_stmt["fetched"] += cursor.fetched
 
-        return self.send_package_group(packages)
+        server_status = executor.server_status or 0x0002
+        self.send_package_group([self.last_packet(status=server_status)])
 
     def answer_stmt_fetch(self, stmt_id, limit):
         prepared_stmt = self.session.prepared_stmts[stmt_id]
         executor = prepared_stmt["statement"]
-        fetched = prepared_stmt["fetched"]
+        cursor = prepared_stmt.get("cursor")
 
-        if executor.data is None:
+        if cursor is None:
             resp = SQLAnswer(
                 resp_type=RESPONSE_TYPE.OK, state_track=executor.state_track
             )
             return self.send_query_answer(resp)
 
-        packages = []
         columns = self.to_mysql_columns(executor.columns)
-        for row in executor.data[fetched:limit]:
-            packages.append(
-                self.packet(BinaryResultsetRowPacket, data=row, columns=columns)
-            )
+        df = cursor.fetch(limit)
 
-        prepared_stmt["fetched"] += len(executor.data[fetched:limit])
+        buffer = bytearray()
+        self.session.packet_sequence_number = dump.write_binary_rows(
+            buffer, dump.encode_binary_df(df, columns), self.session.packet_sequence_number
+        )
+        prepared_stmt["fetched"] += len(df)
 
-        if len(executor.data) <= limit + fetched:
+        if cursor.is_exhausted:
             status = sum(
                 [
                     SERVER_STATUS.SERVER_STATUS_AUTOCOMMIT,
@@ -641,8 +704,8 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 ]
             )
 
-        packages.append(self.last_packet(status=status))
-        self.send_package_group(packages)
+        buffer += self.last_packet(status=status).accum()
+        self.socket.sendall(buffer)
 
     def handle(self):
         """
@@ -0,0 +1,291 @@
+"""
+Bulk encoding of query results to mysql text and binary protocols.
+
+Instead of creating a packet object per row and a datum object per value, the result is
+converted column by column, and rows are framed into packets directly in one buffer.
+
+Implementation based on:
+https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_com_query_response_text_resultset_row.html
+https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_binary_resultset.html
+https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_basic_packets.html
+"""
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packets.binary_resultset_row_package import (
+    BinaryResultsetRowPacket
+)
+from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import MAX_PACKET_SIZE, NULL_VALUE, TYPES
+
+# prefixes for length-encoded strings shorter than 251 bytes
+_SHORT_LENGTH_PREFIXES = [bytes([i]) for i in range(NULL_VALUE[0])]
+
+
+def lenenc_prefix(length: int) -> bytes:
+    """Length prefix of length-encoded string
+
+    Args:
+        length (int): length of the string in bytes
+
+    Returns:
+        bytes
+    """
+    if length < NULL_VALUE[0]:
+        return _SHORT_LENGTH_PREFIXES[length]
+    if length < 1 << 16:
+        return b'\xfc' + length.to_bytes(2, 'little')
+    if length < 1 << 24:
+        return b'\xfd' + length.to_bytes(3, 'little')
+    return b'\xfe' + length.to_bytes(8, 'little')
+
+
+_INT_TYPES = {int, np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64}
+_FLOAT_TYPES = {float, np.float16, np.float32, np.float64}
+
+
+def _values_to_strings(values) -> list:
+    # homogeneous numeric values are converted to strings by numpy, result is the same as str(value)
+    types = set(map(type, values))
+    if len(types) > 0 and (types <= _INT_TYPES or types <= _FLOAT_TYPES):
+        try:
+            arr = np.asarray(values)
+        except (ValueError, OverflowError):
+            arr = None
+        if arr is not None and arr.ndim == 1 and arr.dtype.kind in 'iuf':
+            return arr.astype(str).tolist()
+
+    return [None if value is None else str(value) for value in values]
+
+
+def _datetimes_to_strings(arr: np.ndarray) -> list:
+    # the same as str(pd.Timestamp): fraction of second is added only if it is not zero
+    nat = np.isnat(arr)
+    fraction = arr.view(np.int64) % 1_000_000_000
+    strings = np.datetime_as_string(arr, unit='s')
+    has_us = fraction != 0
+    if has_us.any():
+        has_ns = fraction % 1000 != 0
+        strings = np.where(has_us, np.datetime_as_string(arr, unit='us'), strings)
+        if has_ns.any():
+            strings = np.where(has_ns, np.datetime_as_string(arr, unit='ns'), strings)
+
+    # replace 'T' separator with space: all strings have the same 'YYYY-MM-DDTHH:MM:SS' prefix
+    if len(strings) > 0:
+        strings = strings.copy()
+        chars = strings.view(np.uint32).reshape(len(strings), -1)
+        chars[:, 10] = ord(' ')
+
+    strings = strings.astype(object)
+    strings[nat] = None
+    return strings.tolist()
+
+
+def _series_to_strings(series: pd.Series) -> list:
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in 'iu':
+            return series.to_numpy().astype(str).tolist()
+        if dtype.kind == 'f':
+            arr = series.to_numpy()
+            strings = arr.astype(str).astype(object)
+            strings[np.isnan(arr)] = None
+            return strings.tolist()
+        if dtype.kind == 'M':
+            return _datetimes_to_strings(series.to_numpy(dtype='datetime64[ns]'))
+    return _values_to_strings(series.tolist())
+
+
+def _encode_strings(strings) -> Tuple[List[bytes], int]:
+    cells = []
+    max_length = 1
+    for value in strings:
+        if value is None:
+            cells.append(NULL_VALUE)
+            continue
+        if len(value) > max_length:
+            max_length = len(value)
+        value = value.encode('utf-8')
+        cells.append(lenenc_prefix(len(value)) + value)
+    return cells, max_length
+
+
+def encode_text_column(values) -> Tuple[List[bytes], int]:
+    """Convert values of one column to length-encoded strings
+
+    Args:
+        values (list | pd.Series): values of the column
+
+    Returns:
+        List[bytes]: encoded values, NULL_VALUE for None
+        int: max length of value (in characters), is used in column definition
+    """
+    if isinstance(values, pd.Series):
+        return _encode_strings(_series_to_strings(values))
+    return _encode_strings(_values_to_strings(values))
+
+
+def encode_text_rows(rows: List[list], columns_count: int) -> Tuple[List[List[bytes]], List[int]]:
+    """Encode rows of result column-wise
+
+    Args:
+        rows (List[list]): rows of result
+        columns_count (int): number of columns, is used if there are no rows
+
+    Returns:
+        List[List[bytes]]: encoded values for every column
+        List[int]: max length of value for every column
+    """
+    if len(rows) == 0:
+        return [[] for _ in range(columns_count)], [1] * columns_count
+
+    encoded = [encode_text_column(column_values) for column_values in zip(*rows)]
+    return [x[0] for x in encoded], [x[1] for x in encoded]
+
+
+def encode_text_df(df: pd.DataFrame) -> Tuple[List[List[bytes]], List[int]]:
+    """Encode dataframe column-wise. Numeric and datetime columns are converted to strings by numpy
+
+    Args:
+        df (pd.DataFrame): content of result, columns can have any names (they are accessed by position)
+
+    Returns:
+        List[List[bytes]]: encoded values for every column
+        List[int]: max length of value for every column
+    """
+    encoded = [encode_text_column(df.iloc[:, i]) for i in range(len(df.columns))]
+    return [x[0] for x in encoded], [x[1] for x in encoded]
+
+
+# numpy formats of binary-encoded numeric types
+_BINARY_NUMERIC_FORMATS = {
+    TYPES.MYSQL_TYPE_DOUBLE: '<f8',
+    TYPES.MYSQL_TYPE_FLOAT: '<f4',
+    TYPES.MYSQL_TYPE_LONGLONG: '<i8',
+    TYPES.MYSQL_TYPE_LONG: '<i4',
+    TYPES.MYSQL_TYPE_YEAR: '<i2',
+}
+
+_BINARY_DATE_TYPES = (TYPES.MYSQL_TYPE_DATE, TYPES.MYSQL_TYPE_DATETIME, TYPES.MYSQL_TYPE_TIMESTAMP)
+
+
+def _encode_binary_column(series: pd.Series, col_type: int, nulls: np.ndarray) -> List[bytes]:
+    # returns encoded values, empty bytes for nulls
+    if col_type in _BINARY_NUMERIC_FORMATS:
+        fmt = np.dtype(_BINARY_NUMERIC_FORMATS[col_type])
+        arr = series.to_numpy()
+        if nulls.any():
+            arr = np.where(nulls, 0, arr)
+        if fmt.kind == 'i' and arr.dtype.kind not in 'iub':
+            # the same as int(float(value))
+            arr = arr.astype(np.float64)
+        raw = arr.astype(fmt).tobytes()
+        size = fmt.itemsize
+        cells = [raw[i:i + size] for i in range(0, len(raw), size)]
+    elif col_type in _BINARY_DATE_TYPES:
+        cells = [
+            b'' if is_null else BinaryResultsetRowPacket.encode_date(value)
+            for value, is_null in zip(series.tolist(), nulls)
+        ]
+    elif col_type in (TYPES.MYSQL_TYPE_TIME, TYPES.MYSQL_TYPE_NEWDECIMAL):
+        raise Exception(f'Column with type {col_type} cant be encripted')
+    else:
+        cells, _ = _encode_strings(_series_to_strings(series))
+
+    if nulls.any():
+        for i in np.flatnonzero(nulls):
+            cells[i] = b''
+    return cells
+
+
+def encode_binary_df(df: pd.DataFrame, columns: List[dict]) -> List[bytes]:
+    """Encode dataframe to payloads of binary resultset rows, the same as BinaryResultsetRowPacket does
+
+    Args:
+        df (pd.DataFrame): content of result, columns are accessed by position
+        columns (List[dict]): mysql columns definition, 'type' of column is used
+
+    Returns:
+        List[bytes]: payload for every row
+    """
+    rows_count = len(df)
+    if rows_count == 0:
+        return []
+    columns_count = len(columns)
+
+    nulls = df.iloc[:, :columns_count].isna().to_numpy(dtype=bool)
+
+    # null bitmap with offset 2
+    bitmap_width = (columns_count + 2 + 7) // 8
+    bitmap = np.zeros((rows_count, bitmap_width * 8), dtype=bool)
+    bitmap[:, 2:columns_count + 2] = nulls
+    bitmap = np.packbits(bitmap, axis=1, bitorder='little')
+    row_headers = [b'\x00' + row.tobytes() for row in bitmap]
+
+    encoded = [
+        _encode_binary_column(df.iloc[:, i], column['type'], nulls[:, i])
+        for i, column in enumerate(columns)
+    ]
+    return [b''.join(row) for row in zip(row_headers, *encoded)]
+
+
+def write_packet(buffer: bytearray, payload: bytes, sequence_id: int) -> int:
+    """Add payload to buffer as mysql packet(s)
+
+    Args:
+        buffer (bytearray): output buffer
+        payload (bytes): content of the packet
+        sequence_id (int): sequence id of the packet
+
+    Returns:
+        int: next sequence id
+    """
+    length = len(payload)
+    if length < MAX_PACKET_SIZE:
+        buffer += length.to_bytes(3, 'little')
+        buffer.append(sequence_id)
+        buffer += payload
+        return (sequence_id + 1) % 256
+
+    # payload is split into packets with max size, the last packet is shorter (may be empty)
+    view = memoryview(payload)
+    for start in range(0, length + 1, MAX_PACKET_SIZE):
+        chunk = view[start:start + MAX_PACKET_SIZE]
+        buffer += len(chunk).to_bytes(3, 'little')
+        buffer.append(sequence_id)
+        buffer += chunk
+        sequence_id = (sequence_id + 1) % 256
+    return sequence_id
+
+
+def write_binary_rows(buffer: bytearray, payloads: List[bytes], sequence_id: int) -> int:
+    """Add rows to buffer as BinaryResultsetRow packets
+
+    Args:
+        buffer (bytearray): output buffer
+        payloads (List[bytes]): result of encode_binary_df
+        sequence_id (int): sequence id of the first packet
+
+    Returns:
+        int: next sequence id
+    """
+    for payload in payloads:
+        sequence_id = write_packet(buffer, payload, sequence_id)
+    return sequence_id
+
+
+def write_text_rows(buffer: bytearray, encoded_columns: List[List[bytes]], sequence_id: int) -> int:
+    """Add rows to buffer as ResultsetRow packets
+
+    Args:
+        buffer (bytearray): output buffer
+        encoded_columns (List[List[bytes]]): result of encode_text_rows or encode_text_df
+        sequence_id (int): sequence id of the first packet
+
+    Returns:
+        int: next sequence id
+    """
+    for row_cells in zip(*encoded_columns):
+        sequence_id = write_packet(buffer, b''.join(row_cells), sequence_id)
+    return sequence_id
@@ -5,6 +5,7 @@ import pandas as pd
 from anthropic import AI_PROMPT, HUMAN_PROMPT, Anthropic
 
 from mindsdb.integrations.libs.base import BaseMLEngine
+from mindsdb.integrations.libs.llm.completion_engine import get_completion_engine
 from mindsdb.utilities import log
 from mindsdb.utilities.config import Config
 
@@ -25,6 +26,7 @@ class AnthropicHandler(BaseMLEngine):
         self.default_chat_model = "claude-2.1"
         self.supported_chat_models = ["claude-instant-1.2", "claude-2.1", "claude-3-opus-20240229", "claude-3-sonnet-20240229"]
         self.default_max_tokens = 100
+        self.max_concurrency = 8  # max number of parallel requests
         self.generative = True
         self.connection = None
 
@@ -61,6 +63,7 @@ class AnthropicHandler(BaseMLEngine):
 
         self.connection = Anthropic(
             api_key=api_key,
+            max_retries=0,  # requests are retried by completion engine
         )
 
         input_column = args["using"]["column"]
@@ -68,21 +71,34 @@ class AnthropicHandler(BaseMLEngine):
         if input_column not in df.columns:
             raise RuntimeError(f'Column "{input_column}" not found in input data')
 
+        # rows are sent in parallel, respecting requests and tokens per minute limits of the account
+        engine = get_completion_engine(
+            (self.name, api_key),
+            rpm=args["using"].get("rpm"),
+            tpm=args["using"].get("tpm"),
+            max_concurrency=self.max_concurrency,
+        )
+        predictions = engine.run(
+            lambda batch: [self.predict_answer(batch[0], args)],
+            list(df[input_column]),
+        )
+
         result_df = pd.DataFrame()
 
-        result_df["predictions"] = df[input_column].apply(self.predict_answer)
+        result_df["predictions"] = predictions
 
         result_df = result_df.rename(columns={"predictions": args["target"]})
 
         return result_df
 
-    def predict_answer(self, text):
+    def predict_answer(self, text, args=None):
         """
         connects with anthropic messages api to predict the answer for the particular question
 
         """
 
-        args = self.model_storage.json_get("args")
+        if args is None:
+            args = self.model_storage.json_get("args")
 
         message = self.connection.messages.create(
             model=args["using"]["model"],
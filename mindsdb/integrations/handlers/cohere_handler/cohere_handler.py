@@ -6,6 +6,7 @@ import pandas as pd
 
 from mindsdb.utilities.config import Config
 from mindsdb.integrations.libs.base import BaseMLEngine
+from mindsdb.integrations.libs.llm.completion_engine import get_completion_engine
 
 from mindsdb.utilities import log
 
@@ -42,18 +43,35 @@ class CohereHandler(BaseMLEngine):
         
         result_df = pd.DataFrame() 
 
+        # function which gets predictions for a batch of texts
         if args['using']['task'] == 'text-summarization':
-            result_df['predictions'] = df[input_column].apply(self.predict_text_summary)     
+            submit = self.predict_text_summaries
+            batch_size = 1
 
         elif args['using']['task'] == 'text-generation':
-            result_df['predictions'] = df[input_column].apply(self.predict_text_generation)     
+            submit = self.predict_text_generations
+            batch_size = 1
 
         elif args['using']['task'] == 'language-detection':
-            result_df['predictions'] = df[input_column].apply(self.predict_language)     
+            # several texts are sent in one request
+            submit = self.predict_languages
+            batch_size = 96
       
         else:
             raise Exception(f"Task {args['using']['task']} is not supported!")
 
+        api_key = get_api_key('cohere', args["using"], self.engine_storage, strict=False)
+        # requests are retried by completion engine
+        self.client = cohere.Client(api_key, max_retries=0)
+
+        # rows are sent in parallel, respecting requests per minute limit of the account
+        engine = get_completion_engine(
+            (self.name, api_key),
+            rpm=args['using'].get('rpm'),
+            max_concurrency=8,
+        )
+        result_df['predictions'] = engine.run(submit, list(df[input_column]), batch_size=batch_size)
+
         result_df = result_df.rename(columns={'predictions': args['target']})
         
         return result_df
@@ -65,43 +83,33 @@ class CohereHandler(BaseMLEngine):
 
         """ 
 
-        args = self.model_storage.json_get('args')
-
-        api_key = get_api_key('cohere', args["using"], self.engine_storage, strict=False)
-        co = cohere.Client(api_key)
-
-        response = co.summarize(text)
+        response = self.client.summarize(text)
         text_summary = response.summary
 
         return text_summary
 
+    def predict_text_summaries(self, texts):
+        return [self.predict_text_summary(text) for text in texts]
+
+    def predict_text_generations(self, texts):
+        return [self.predict_text_generation(text) for text in texts]
+
     def predict_text_generation(self,text):
         """    
         connects with cohere api to predict the next prompt of the input text
 
         """
-        args = self.model_storage.json_get('args')
-
-        api_key = get_api_key('cohere', args["using"], self.engine_storage, strict=False)
-        co = cohere.Client(api_key)
-
-        response = co.generate(text)
+        response = self.client.generate(text)
         text_generated = response.generations[0].text
 
         return text_generated
 
-    def predict_language(self,text):
+    def predict_languages(self, texts):
         """    
-        connects with cohere api to predict the input language 
+        connects with cohere api to predict the languages of the input texts
 
         """
-        args = self.model_storage.json_get('args')
-
-        api_key = get_api_key('cohere', args["using"], self.engine_storage, strict=False)
-        co = cohere.Client(api_key)
-
-        response = co.detect_language([text])
-        language_detected = response.results[0].language_name
+        response = self.client.detect_language(texts)
 
-        return language_detected
+        return [result.language_name for result in response.results]
     
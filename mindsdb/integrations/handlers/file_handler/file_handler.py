@@ -3,9 +3,12 @@ import csv
 import json
 import os
 import tempfile
+import shutil
 import traceback
+from concurrent.futures import wait, FIRST_COMPLETED
 from io import BytesIO, StringIO
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import magic
@@ -17,25 +20,64 @@ from mindsdb_sql.parser.ast import DropTables, Select
 from mindsdb_sql.parser.ast.base import ASTNode
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-from mindsdb.api.executor.utilities.sql import query_df
+from mindsdb.api.executor.utilities.sql import query_df, duckdb_connection, get_analyze_sample_size
 from mindsdb.integrations.libs.base import DatabaseHandler
 from mindsdb.integrations.libs.response import RESPONSE_TYPE
 from mindsdb.integrations.libs.response import HandlerResponse as Response
 from mindsdb.integrations.libs.response import HandlerStatusResponse as StatusResponse
 from mindsdb.utilities import log
+from mindsdb.utilities.context_executor import ContextThreadPoolExecutor
 
 logger = log.getLogger(__name__)
 
 DEFAULT_CHUNK_SIZE = 500
 DEFAULT_CHUNK_OVERLAP = 250
 
+# parsed content of file is stored in the folder of file, in the file with name of source file and that suffix:
+# the name can't be the same as name of uploaded file
+CACHE_FILE_SUFFIX = ".__cache__.parquet"
+# marker of file which content can't be stored in cache (nested values, error on write)
+NO_CACHE_FILE_SUFFIX = ".__nocache__"
+
+EMPTY_VALUES = ["", " ", "  ", "NaN", "nan", "NA"]
+
+# size of the beginning of file which is used to detect encoding and format
+SAMPLE_SIZE = 32 * 1024
+# csv file is written to cache by chunks of that number of rows
+CSV_CHUNK_ROWS = 100000
+# number of chunks which are cleaned and written in parallel
+CSV_CHUNK_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
 
 def clean_cell(val):
-    if str(val) in ["", " ", "  ", "NaN", "nan", "NA"]:
+    if str(val) in EMPTY_VALUES:
         return None
     return val
 
 
+def clean_df(df: pd.DataFrame) -> pd.DataFrame:
+    """The same as df.applymap(clean_cell), but by columns"""
+    df = df.copy(deep=False)
+    for i in range(len(df.columns)):
+        column = df.iloc[:, i]
+        empty = column.astype(str).isin(EMPTY_VALUES)
+        if empty.any():
+            df.isetitem(i, column.astype(object).where(~empty, None).infer_objects())
+    return df
+
+
+def get_cache_path(file_path) -> Path:
+    """Path to parquet cache of the file"""
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + CACHE_FILE_SUFFIX)
+
+
+def get_no_cache_path(file_path) -> Path:
+    """Path to marker that the file can't be cached"""
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + NO_CACHE_FILE_SUFFIX)
+
+
 class FileHandler(DatabaseHandler):
     """
     Handler for files
@@ -92,6 +134,30 @@ class FileHandler(DatabaseHandler):
         elif type(query) is Select:
             table_name = query.from_table.parts[-1]
             file_path = self.file_controller.get_file_path(table_name)
+
+            use_cache = (
+                self.clean_rows is True
+                and self.custom_parser is None
+                and self.chunk_size == DEFAULT_CHUNK_SIZE
+                and self.chunk_overlap == DEFAULT_CHUNK_OVERLAP
+            )
+            cache_path = get_cache_path(file_path)
+            if use_cache and cache_path.exists():
+                # columns and filters of query are pushed down to the scan of cache
+                result_df = query_df(cache_path, query)
+                return Response(RESPONSE_TYPE.TABLE, data_frame=result_df)
+
+            no_cache_path = get_no_cache_path(file_path)
+            if use_cache and no_cache_path.exists():
+                # it was tried before: file is only parsed
+                use_cache = False
+
+            if use_cache and self.csv_to_cache(file_path, cache_path) is not None:
+                # file was uploaded before cache was introduced
+                self._store_cache(file_path)
+                result_df = query_df(cache_path, query)
+                return Response(RESPONSE_TYPE.TABLE, data_frame=result_df)
+
             df, _columns = self._handle_source(
                 file_path,
                 self.clean_rows,
@@ -99,6 +165,11 @@ class FileHandler(DatabaseHandler):
                 self.chunk_size,
                 self.chunk_overlap,
             )
+            if use_cache:
+                if not self.write_cache(df, cache_path):
+                    # file was uploaded before cache was introduced and it can't be cached
+                    no_cache_path.touch()
+                self._store_cache(file_path)
             result_df = query_df(df, query)
             return Response(RESPONSE_TYPE.TABLE, data_frame=result_df)
         else:
@@ -107,6 +178,13 @@ class FileHandler(DatabaseHandler):
                 error_message="Only 'select' and 'drop' queries allowed for files",
             )
 
+    def _store_cache(self, file_path):
+        try:
+            self.file_controller.store_file_cache(file_path)
+        except Exception as e:
+            # the cache is used until the file is synchronized with the store
+            logger.warning(f"Can't save cache of '{file_path}' to the store: {e}")
+
     def native_query(self, query: str) -> Response:
         ast = self.parser(query, dialect="mindsdb")
         return self.query(ast)
@@ -188,12 +266,188 @@ class FileHandler(DatabaseHandler):
         header = df.columns.values.tolist()
 
         df = df.rename(columns={key: key.strip() for key in header})
-        df = df.applymap(clean_cell)
+        df = clean_df(df)
 
         header = [x.strip() for x in header]
         col_map = dict((col, col) for col in header)
         return df, col_map
 
+    @staticmethod
+    def write_cache(df: pd.DataFrame, cache_path: Path) -> bool:
+        """
+        Store parsed file to parquet, with the same types which duckdb infers for the dataframe.
+        Dataframes with nested values (dicts, lists) are not stored: they would be changed by parquet
+        :return: True if cache is written
+        """
+        if df.columns.has_duplicates:
+            return False
+        for column in df.columns[df.dtypes == object]:
+            if df[column].map(lambda v: isinstance(v, (dict, list))).any():
+                return False
+
+        cache_path = Path(cache_path)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        path_str = str(tmp_path).replace("'", "''")
+        try:
+            with duckdb_connection() as con:
+                con.register("df_cache", df)
+                try:
+                    con.execute(f"set pandas_analyze_sample={get_analyze_sample_size({'df': df})};")
+                    con.execute(f"copy df_cache to '{path_str}' (format parquet)")
+                finally:
+                    con.unregister("df_cache")
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write cache of file: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return False
+        return True
+
+    @staticmethod
+    def parse_to_cache(file_path, cache_path: Path) -> Tuple[int, List[str]]:
+        """
+        Parse file and write it to parquet cache.
+        Csv files are parsed by chunks and are not loaded in memory entirely
+        :return: number of rows and names of columns
+        """
+        meta = FileHandler.csv_to_cache(file_path, cache_path)
+        if meta is not None:
+            return meta
+        df, _col_map = FileHandler._handle_source(file_path)
+        FileHandler.write_cache(df, cache_path)
+        return len(df), list(df.columns)
+
+    @staticmethod
+    def csv_to_cache(
+        file_path, cache_path: Path, chunk_rows: int = CSV_CHUNK_ROWS, workers: int = CSV_CHUNK_WORKERS
+    ) -> Optional[Tuple[int, List[str]]]:
+        """
+        Write csv file to parquet cache by chunks: every chunk is cleaned and written to a separate part
+        (in parallel with parsing of next chunks), then parts are merged into cache file.
+        Columns which have different types in different chunks are stored as text.
+        :return: number of rows and names of columns, None if it is not a csv file or it was not written
+        """
+        csv_source = FileHandler._sniff_csv(file_path)
+        if csv_source is None:
+            return None
+        encoding, dialect = csv_source
+
+        cache_path = Path(cache_path)
+        parts_dir = Path(tempfile.mkdtemp(prefix="parts_", dir=cache_path.parent))
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            parts = []
+            row_count = 0
+            columns = None
+            with ContextThreadPoolExecutor(max_workers=workers) as executor:
+                pending = set()
+                for i, chunk in enumerate(FileHandler._read_csv_chunks(file_path, encoding, dialect, chunk_rows)):
+                    if columns is None:
+                        columns = list(chunk.columns)
+                    row_count += len(chunk)
+                    part_path = parts_dir / f"{i:06d}.parquet"
+                    parts.append(part_path)
+                    # don't keep in memory more chunks than workers can process
+                    if len(pending) >= workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(FileHandler._write_chunk, chunk, part_path))
+                for future in pending:
+                    future.result()
+
+            if columns is None:
+                # file without rows
+                return None
+
+            parts_list = ", ".join("'{}'".format(str(x).replace("'", "''")) for x in parts)
+            path_str = str(tmp_path).replace("'", "''")
+            with duckdb_connection() as con:
+                con.execute(
+                    f"copy (select * from read_parquet([{parts_list}], union_by_name=true)) "
+                    f"to '{path_str}' (format parquet)"
+                )
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write cache of csv file by chunks: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return None
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+        return row_count, columns
+
+    @staticmethod
+    def _read_csv_chunks(file_path, encoding: str, dialect: csv.Dialect, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        reader = pd.read_csv(
+            file_path,
+            sep=dialect.delimiter,
+            index_col=False,
+            encoding=encoding,
+            encoding_errors="replace",
+            chunksize=chunk_rows,
+        )
+        with reader:
+            for chunk in reader:
+                yield chunk.rename(columns={key: key.strip() for key in chunk.columns})
+
+    @staticmethod
+    def _write_chunk(chunk: pd.DataFrame, path: Path):
+        chunk = clean_df(chunk)
+        path_str = str(path).replace("'", "''")
+        with duckdb_connection() as con:
+            con.register("df_chunk", chunk)
+            try:
+                con.execute(f"set pandas_analyze_sample={get_analyze_sample_size({'df': chunk})};")
+                con.execute(f"copy df_chunk to '{path_str}' (format parquet)")
+            finally:
+                con.unregister("df_chunk")
+
+    @staticmethod
+    def _sniff_csv(file_path) -> Optional[Tuple[str, csv.Dialect]]:
+        """
+        Detect by the beginning of the file if it is a csv file
+        :return: encoding and dialect of the file, or None if it is not a csv file
+        """
+        suffix = Path(file_path).suffix.strip(".").lower()
+        if suffix in ("json", "xlsx", "xls", "parquet", "txt", "pdf"):
+            return None
+        try:
+            with open(file_path, "rb") as fp:
+                sample = fp.read(SAMPLE_SIZE)
+        except Exception:
+            return None
+        if suffix != "csv":
+            # parquet, xlsx (zip) and pdf signatures
+            if sample[:4] in (b"PAR1", b"PK\x03\x04", b"%PDF") or FileHandler.is_it_xlsx(file_path):
+                return None
+
+        if sample.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8-sig"
+        else:
+            best_meta = from_bytes(sample, steps=32, chunk_size=1024, explain=False).best()
+            encoding = best_meta.encoding if best_meta is not None else "utf-8"
+        sample_str = StringIO(sample.decode(encoding, "replace"))
+
+        if suffix != "csv":
+            if sample_str.read(100).strip()[:1] in ("{", "["):
+                # json
+                return None
+            sample_str.seek(0)
+            try:
+                csv.Sniffer().sniff(sample_str.readline())
+            except Exception:
+                return None
+            sample_str.seek(0)
+        try:
+            dialect = FileHandler._get_csv_dialect(sample_str)
+        except Exception:
+            return None
+        if dialect is None:
+            return None
+        return encoding, dialect
+
     @staticmethod
     def is_it_parquet(data: BytesIO) -> bool:
         # Check first and last 4 bytes equal to PAR1.
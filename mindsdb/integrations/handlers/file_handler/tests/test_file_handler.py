@@ -12,7 +12,7 @@ from mindsdb_sql.exceptions import ParsingException
 from mindsdb_sql.parser.ast import CreateTable, DropTables, Identifier, Select, Star
 from pytest_lazyfixture import lazy_fixture
 
-from mindsdb.integrations.handlers.file_handler.file_handler import FileHandler
+from mindsdb.integrations.handlers.file_handler.file_handler import FileHandler, get_cache_path, get_no_cache_path
 from mindsdb.integrations.libs.response import RESPONSE_TYPE
 from mindsdb.interfaces.file.file_controller import FileController
 
@@ -50,6 +50,9 @@ class MockFileController:
     def delete_file(self, name):
         return True
 
+    def store_file_cache(self, file_path):
+        pass
+
 
 def curr_dir():
     return os.path.dirname(os.path.realpath(__file__))
@@ -212,20 +215,33 @@ class TestQuery:
         )
 
         file_handler = FileHandler(file_controller=file_controller)
-        response = file_handler.query(
-            Select(
-                targets=[Star()],
-                from_table=Identifier(
-                    parts=[os.path.splitext(os.path.basename(csv_file))[0]]
-                ),
-            )
+        query = Select(
+            targets=[Star()],
+            from_table=Identifier(
+                parts=[os.path.splitext(os.path.basename(csv_file))[0]]
+            ),
         )
+        response = file_handler.query(query)
 
         assert response.type == RESPONSE_TYPE.TABLE
         assert response.error_code == 0
         assert response.error_message is None
         assert expected_df.equals(response.data_frame)
 
+        # file was uploaded before cache was introduced: cache is created on query and is saved to the store
+        file_path = file_controller.get_file_path("test")
+        file_dir = os.path.basename(os.path.dirname(file_path))
+        stored_cache_path = get_cache_path(os.path.join(file_controller.fs_store.storage, file_dir, "test.csv"))
+        for path in (get_cache_path(file_path), stored_cache_path):
+            os.unlink(path)
+        assert file_handler.query(query).data_frame.equals(expected_df)
+        assert stored_cache_path.exists()
+
+        # the next queries read the cache
+        with patch.object(FileHandler, "_handle_source", side_effect=RuntimeError):
+            assert file_handler.query(query).data_frame.equals(expected_df)
+        assert get_cache_path(file_controller.get_file_path("test")).exists()
+
     def test_query_bad_type(self):
         """Test an invalid query type for files"""
         file_handler = FileHandler(file_controller=MockFileController())
@@ -390,3 +406,100 @@ def test_get_columns():
     )
 
     assert response.data_frame.equals(expected_df)
+
+
+@pytest.mark.parametrize(
+    "file_path,cached",
+    [
+        (lazy_fixture("csv_file"), True),
+        (lazy_fixture("json_file"), True),
+        (lazy_fixture("xlsx_file"), True),
+        (lazy_fixture("txt_file"), False),  # metadata column contains dicts
+    ],
+)
+def test_query_cache(file_path, cached):
+    tmp_path = os.path.join(tempfile.mkdtemp(), os.path.basename(file_path))
+    shutil.copy(file_path, tmp_path)
+
+    class FileController(MockFileController):
+        def get_file_path(self, name):
+            return tmp_path
+
+    file_handler = FileHandler(file_controller=FileController())
+    query = Select(targets=[Star()], from_table=Identifier(parts=["one"]))
+
+    # the first query parses the file and writes cache
+    expected_df = file_handler.query(query).data_frame
+    cache_path = get_cache_path(tmp_path)
+    assert cache_path.exists() is cached
+
+    if cached:
+        # the next query reads the cache
+        with patch.object(FileHandler, "_handle_source", side_effect=RuntimeError) as handle_source:
+            response = file_handler.query(query)
+        assert response.data_frame.equals(expected_df)
+        assert not handle_source.called
+    else:
+        # file can't be cached, the next query only parses the file
+        assert get_no_cache_path(tmp_path).exists()
+        with patch.object(FileHandler, "csv_to_cache") as csv_to_cache, \
+                patch.object(FileHandler, "write_cache") as write_cache, \
+                patch.object(FileHandler, "_handle_source", wraps=FileHandler._handle_source) as handle_source:
+            response = file_handler.query(query)
+        assert response.data_frame.equals(expected_df)
+        assert handle_source.call_count == 1
+        assert not csv_to_cache.called and not write_cache.called
+
+
+def test_query_cache_name(parquet_file):
+    # uploaded file has name which was used for cache
+    tmp_path = os.path.join(tempfile.mkdtemp(), "__cache__.parquet")
+    shutil.copy(parquet_file, tmp_path)
+    with open(tmp_path, "rb") as f:
+        content = f.read()
+
+    class FileController(MockFileController):
+        def get_file_path(self, name):
+            return tmp_path
+
+    file_handler = FileHandler(file_controller=FileController())
+    query = Select(targets=[Star()], from_table=Identifier(parts=["one"]))
+
+    expected_df, _ = FileHandler._handle_source(tmp_path)
+    for _ in range(2):
+        assert file_handler.query(query).data_frame.equals(expected_df)
+
+    # the file is not overwritten by its cache
+    assert get_cache_path(tmp_path).exists()
+    with open(tmp_path, "rb") as f:
+        assert f.read() == content
+
+
+def test_csv_to_cache():
+    tmp_dir = tempfile.mkdtemp()
+    file_path = os.path.join(tmp_dir, "data.csv")
+    rows = ["a, b ,c,d"]
+    for i in range(250):
+        # column 'c' is text only in the last chunk, column 'd' is empty in the first chunk
+        rows.append(f"{i},{i / 2},{'x' if i == 240 else i},{'' if i < 100 else 'text'}")
+    with open(file_path, "w") as f:
+        f.write("\n".join(rows))
+
+    cache_path = get_cache_path(file_path)
+    row_count, columns = FileHandler.csv_to_cache(file_path, cache_path, chunk_rows=100, workers=2)
+    assert row_count == 250
+    assert columns == ["a", "b", "c", "d"]
+
+    df = pandas.read_parquet(cache_path)
+    expected_df, _ = FileHandler._handle_source(file_path)
+    assert list(df.columns) == columns
+    assert df["a"].tolist() == expected_df["a"].tolist()
+    assert df["b"].tolist() == expected_df["b"].tolist()
+    assert df["c"].tolist() == expected_df["c"].tolist()
+    assert df["d"].tolist() == expected_df["d"].tolist()
+
+    # not csv files are not parsed by chunks
+    json_path = os.path.join(tmp_dir, "data.json")
+    with open(json_path, "w") as f:
+        json.dump([{"a": 1}], f)
+    assert FileHandler.csv_to_cache(json_path, get_cache_path(json_path)) is None
@@ -7,6 +7,7 @@ from typing import Any, Iterable, List, Optional
 from langchain.sql_database import SQLDatabase
 
 from mindsdb.interfaces.skills.skill_tool import skill_tool
+from mindsdb.interfaces.skills.tool_cache import ToolCallCache
 from mindsdb.utilities import log
 
 logger = log.getLogger(__name__)
@@ -26,6 +27,7 @@ class MindsDBSQL(SQLDatabase):
         indexes_in_table_info: bool = False,
         custom_table_info: Optional[dict] = None,
         view_support: Optional[bool] = True,
+        tool_cache: Optional[ToolCallCache] = None,
     ):
         # Some args above are not used in this class, but are kept for compatibility
 
@@ -33,7 +35,8 @@ class MindsDBSQL(SQLDatabase):
             database,
             include_tables,
             ignore_tables,
-            sample_rows_in_table_info
+            sample_rows_in_table_info,
+            tool_cache
         )
 
     @property
@@ -19,6 +19,7 @@ from langchain.chains import ReduceDocumentsChain, MapReduceDocumentsChain
 from mindsdb.integrations.utilities.rag.rag_pipeline_builder import RAG
 from mindsdb.integrations.utilities.rag.settings import RAGPipelineModel, VectorStoreType, DEFAULT_COLLECTION_NAME
 from mindsdb.interfaces.skills.skill_tool import skill_tool, SkillType
+from mindsdb.interfaces.skills.tool_cache import get_agent_tool_cache
 from mindsdb.interfaces.storage import db
 from mindsdb.utilities import log
 
@@ -283,7 +284,9 @@ def _build_retrieval_tool(tool: dict, pred_args: dict, skill: db.Skills):
 
 def langchain_tools_from_skill(skill, pred_args, llm):
     # Makes Langchain compatible tools from a skill
-    tools = skill_tool.get_tools_from_skill(skill, llm)
+    # results of tool calls are cached per agent, to be reused by the next turns of conversation
+    tool_cache = get_agent_tool_cache(pred_args.get('agent_id'))
+    tools = skill_tool.get_tools_from_skill(skill, llm, tool_cache)
 
     all_tools = []
     for tool in tools:
@@ -4,11 +4,12 @@ from typing import Dict, Optional, List
 import pandas as pd
 
 from mindsdb.integrations.libs.base import BaseMLEngine
+from mindsdb.integrations.libs.llm.completion_engine import get_completion_engine
 from mindsdb.utilities import log
 
 from mindsdb.integrations.handlers.litellm_handler.settings import CompletionParameters
 
-from litellm import completion, batch_completion
+from litellm import completion
 
 
 logger = log.getLogger(__name__)
@@ -24,6 +25,7 @@ class LiteLLMHandler(BaseMLEngine):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.generative = True
+        self.max_concurrency = 8  # max number of parallel requests
 
     @staticmethod
     def create_validation(target, args=None, **kwargs):
@@ -72,15 +74,26 @@ class LiteLLMHandler(BaseMLEngine):
         # remove prompt_template from args
         args.pop('prompt_template', None)
 
-        if len(args['messages']) > 1:
-            # if more than one message, use batch completion
-            responses = batch_completion(**args)
-            return pd.DataFrame({"result": [response.choices[0].message.content for response in responses]})
-
-        # run completion
-        response = completion(**args)
+        # rate limits of the account are used by completion engine, they are not args of completion
+        rpm = args.pop('rpm', None)
+        tpm = args.pop('tpm', None)
 
-        return pd.DataFrame({"result": [response.choices[0].message.content]})
+        if len(args['messages']) > 1:
+            # if more than one message, every message is completed in its own request
+            messages = args.pop('messages')
+        else:
+            messages = [args.pop('messages')]
+
+        # requests are sent in parallel, respecting requests and tokens per minute limits of the account
+        engine = get_completion_engine(
+            (self.name, args.get('base_url'), args.get('api_key')),
+            rpm=rpm,
+            tpm=tpm,
+            max_concurrency=self.max_concurrency,
+        )
+        responses = engine.run(lambda batch: [completion(messages=batch[0], **args)], messages)
+
+        return pd.DataFrame({"result": [response.choices[0].message.content for response in responses]})
 
     @staticmethod
     def _prompt_to_messages(prompt: str, **kwargs) -> List[Dict]:
@@ -35,6 +35,10 @@ class CompletionParameters(BaseModel):
     api_key: str  # API key for authentication.
     llm_model_list: Optional[List] = None  # List of models, API bases, keys, etc., for dynamic selection.
 
+    # rate limits of the account
+    rpm: Optional[int] = None  # Max number of requests per minute.
+    tpm: Optional[int] = None  # Max number of tokens per minute.
+
     class Config:
         extra = Extra.forbid
         arbitrary_types_allowed = True
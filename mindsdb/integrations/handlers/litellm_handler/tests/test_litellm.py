@@ -79,7 +79,7 @@ class TestLiteLLM(BaseExecutorTest):
 
         assert ret["result"][0]
 
-        # completion with openai using multiple messages in predict using batch_completion
+        # completion with openai using multiple messages in predict, every message in its own request
 
         # run predict
         ret = self.run_sql(
@@ -4,6 +4,7 @@ import mysql.connector
 from mindsdb_sql import parse_sql
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast import Insert
 
 from mindsdb.utilities import log
 from mindsdb.integrations.libs.base import DatabaseHandler
@@ -130,12 +131,13 @@ class MySQLHandler(DatabaseHandler):
 
         return result
 
-    def native_query(self, query: str) -> Response:
+    def native_query(self, query: str, params=None) -> Response:
         """
         Executes a SQL query on the MySQL database and returns the result.
 
         Args:
             query (str): The SQL query to be executed.
+            params (list): rows of parameters, the query is executed for every row of them
 
         Returns:
             Response: A response object containing the result of the query or an error message.
@@ -145,7 +147,10 @@ class MySQLHandler(DatabaseHandler):
         try:
             connection = self.connect()
             with connection.cursor(dictionary=True, buffered=True) as cur:
-                cur.execute(query)
+                if params is not None:
+                    cur.executemany(query, params)
+                else:
+                    cur.execute(query)
                 if cur.with_rows:
                     result = cur.fetchall()
                     response = Response(
@@ -176,6 +181,10 @@ class MySQLHandler(DatabaseHandler):
         Retrieve the data from the SQL statement.
         """
         renderer = SqlalchemyRender('mysql')
+        if isinstance(query, Insert) and query.is_plain and query.values is not None:
+            # values are sent as parameters, multi-row insert is built by the driver
+            query_str, params = renderer.get_exec_params(query, with_failback=True)
+            return self.native_query(query_str, params)
         query_str = renderer.get_string(query, with_failback=True)
         return self.native_query(query_str)
 
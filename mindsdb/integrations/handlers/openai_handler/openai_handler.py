@@ -1,12 +1,11 @@
 import os
-import math
+import re
 import json
 import shutil
 import tempfile
 import datetime
 import textwrap
 import subprocess
-import concurrent.futures
 from typing import Text, Tuple, Dict, List, Optional, Any
 import openai
 from openai import OpenAI, NotFoundError, AuthenticationError
@@ -29,11 +28,28 @@ from mindsdb.integrations.handlers.openai_handler.constants import (
     OPENAI_API_BASE,
 )
 from mindsdb.integrations.libs.llm.utils import get_completed_prompts
+from mindsdb.integrations.libs.llm.completion_engine import get_completion_engine
 from mindsdb.integrations.utilities.handler_utils import get_api_key
 
 logger = log.getLogger(__name__)
 
 
+def get_max_batch_size(error: Exception) -> Optional[int]:
+    """
+    Get max number of prompts in one request from the error raised by OpenAI API, if the batch was too large.
+
+    Args:
+        error (Exception): error raised by OpenAI API.
+
+    Returns:
+        Optional[int]: max batch size of the account, None if the error is not about batch size.
+    """
+    match = re.search(r'you can currently request up to at most a total of (\d+)', str(error))
+    if match is None:
+        return None
+    return int(match.group(1))
+
+
 class OpenAIHandler(BaseMLEngine):
     """
     This handler handles connection and inference with the OpenAI API.
@@ -58,6 +74,7 @@ class OpenAIHandler(BaseMLEngine):
         ]
         self.rate_limit = 60  # requests per minute
         self.max_batch_size = 20
+        self.max_concurrency = 32  # max number of parallel requests
         self.default_max_tokens = 100
         self.chat_completion_models = CHAT_MODELS
         self.supported_ft_models = FINETUNING_MODELS  # base models compatible with finetuning
@@ -184,7 +201,9 @@ class OpenAIHandler(BaseMLEngine):
                 "temperature",
                 "openai_api_key",
                 "api_organization",
-                "api_base"
+                "api_base",
+                "rpm",
+                "tpm"
             }
         )
 
@@ -270,6 +289,10 @@ class OpenAIHandler(BaseMLEngine):
                             or os.environ.get('OPENAI_API_BASE', OPENAI_API_BASE))
         if pred_args.get('api_organization'):
             args['api_organization'] = pred_args['api_organization']
+        # rate limits of account: requests and tokens per minute
+        for limit in ('rpm', 'tpm'):
+            if pred_args.get(limit):
+                args[limit] = pred_args[limit]
         df = df.reset_index(drop=True)
 
         if pred_args.get('mode'):
@@ -499,12 +522,9 @@ class OpenAIHandler(BaseMLEngine):
             - _submit_image_completion: Submit a request to the image completion endpoint of the OpenAI API.
             - _log_api_call: Log the API call made to the OpenAI API.
 
-        There are a couple checks that should be done when calling OpenAI's API:
-          - account max batch size, to maximize batch size first
-          - account rate limit, to maximize parallel calls second
-
-        Additionally, single completion calls are done with exponential backoff to guarantee all prompts are processed,
-        because even with previous checks the tokens-per-minute limit may apply.
+        Prompts are split into batches of `max_batch_size` (one prompt per request for chat and image models) and
+        are sent by the shared completion engine, which respects requests and tokens per minute limits (`rpm` and
+        `tpm` args), adapts the number of parallel requests and retries rate-limited and failed requests.
 
         Args:
             model_name (Text): OpenAI Model name.
@@ -519,7 +539,6 @@ class OpenAIHandler(BaseMLEngine):
             List[Any]: List of completions. The type of completion depends on the task type.
         """
 
-        @retry_with_exponential_backoff()
         def _submit_completion(model_name: Text, prompts: List[Text], api_args: Dict, args: Dict, df: pd.DataFrame) -> List[Text]:
             """
             Submit a request to the relevant completion endpoint of the OpenAI API based on the type of task.
@@ -796,64 +815,47 @@ class OpenAIHandler(BaseMLEngine):
             api_key=api_key,
             base_url=args.get('api_base'),
             org=args.pop('api_organization') if 'api_organization' in args else None,
+            max_retries=0,  # requests are retried by completion engine
         )
 
-        try:
-            # check if simple completion works
-            completion = _submit_completion(
-                model_name, prompts, api_args, args, df
-            )
-            return completion
-        except Exception as e:
-            # else, we get the max batch size
-            if 'you can currently request up to at most a total of' in str(e):
-                pattern = 'a total of'
-                max_batch_size = int(e[e.find(pattern) + len(pattern):].split(').')[0])
+        if model_name in IMAGE_MODELS:
+            batch_size = 1
+        elif model_name in self.chat_completion_models:
+            if args.get('mode', 'conversational') == 'default':
+                batch_size = 1
             else:
-                max_batch_size = (
-                    self.max_batch_size
-                )  # guards against changes in the API message
-
-        if not parallel:
-            completion = None
-            for i in range(math.ceil(len(prompts) / max_batch_size)):
-                partial = _submit_completion(
-                    model_name,
-                    prompts[i * max_batch_size: (i + 1) * max_batch_size],
-                    api_args,
-                    args,
-                    df,
-                )
-                if not completion:
-                    completion = partial
-                else:
-                    completion['choices'].extend(partial['choices'])
-                    for field in ('prompt_tokens', 'completion_tokens', 'total_tokens'):
-                        completion['usage'][field] += partial['usage'][field]
+                # every message of conversation depends on the previous ones
+                batch_size = max(1, len(prompts))
         else:
-            promises = []
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                for i in range(math.ceil(len(prompts) / max_batch_size)):
-                    logger.debug(
-                        f'{i * max_batch_size}:{(i+1) * max_batch_size}/{len(prompts)}'
-                    )
-                    future = executor.submit(
-                        _submit_completion,
-                        model_name,
-                        prompts[i * max_batch_size: (i + 1) * max_batch_size],
-                        api_args,
-                        args,
-                        df,
-                    )
-                    promises.append({"choices": future})
-            completion = None
-            for p in promises:
-                if not completion:
-                    completion = p['choices'].result()
-                else:
-                    completion.extend(p['choices'].result())
+            batch_size = self.max_batch_size
+
+        engine = get_completion_engine(
+            (self.name, args.get('api_base'), api_key),
+            rpm=args.get('rpm'),
+            tpm=args.get('tpm'),
+            max_concurrency=self.max_concurrency if parallel else 1,
+        )
 
-        return completion
+        def _run(batch_size: int) -> List[Any]:
+            return engine.run(
+                lambda batch: _submit_completion(model_name, batch, api_args, args, df),
+                prompts,
+                batch_size=batch_size,
+            )
+
+        try:
+            try:
+                return _run(batch_size)
+            except openai.BadRequestError as e:
+                # max batch size of the account can be lower than the default one, it is told in the error
+                max_batch_size = get_max_batch_size(e)
+                if max_batch_size is None or max_batch_size >= batch_size:
+                    raise
+                return _run(max_batch_size)
+        except openai.APIStatusError as e:
+            raise Exception(
+                f'Error status {e.status_code} raised by OpenAI API: {e.body.get("message", "Please refer to `https://platform.openai.com/docs/guides/error-codes` for more information.") if isinstance(e.body, dict) else e.message}'  # noqa
+            )
 
     def describe(self, attribute: Optional[Text] = None) -> pd.DataFrame:
         """
@@ -1159,7 +1161,8 @@ class OpenAIHandler(BaseMLEngine):
         return ft_stats, result_file_id
 
     @staticmethod
-    def _get_client(api_key: Text, base_url: Text, org: Optional[Text] = None) -> OpenAI:
+    def _get_client(api_key: Text, base_url: Text, org: Optional[Text] = None,
+                    max_retries: int = openai.DEFAULT_MAX_RETRIES) -> OpenAI:
         """
         Get an OpenAI client with the given API key, base URL, and organization.
 
@@ -1167,8 +1170,9 @@ class OpenAIHandler(BaseMLEngine):
             api_key (Text): OpenAI API key.
             base_url (Text): OpenAI base URL.
             org (Optional[Text]): OpenAI organization.
+            max_retries (int): Max number of retries of a failed request made by the client.
 
         Returns:
             openai.OpenAI: OpenAI client.
         """
-        return OpenAI(api_key=api_key, base_url=base_url, organization=org)
+        return OpenAI(api_key=api_key, base_url=base_url, organization=org, max_retries=max_retries)
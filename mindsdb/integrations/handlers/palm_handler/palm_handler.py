@@ -9,6 +9,7 @@ from mindsdb.utilities.hooks import before_palm_query, after_palm_query
 from mindsdb.utilities import log
 from mindsdb.integrations.libs.base import BaseMLEngine
 from mindsdb.integrations.libs.llm.utils import get_completed_prompts
+from mindsdb.integrations.libs.llm.completion_engine import get_completion_engine
 
 from mindsdb.integrations.utilities.handler_utils import get_api_key
 
@@ -34,6 +35,9 @@ class PalmHandlerArgs(BaseModel):
     temperature: float = 0.0
     api_key: str = None
     palm_api_key: str = None
+    # rate limits of the account: requests and tokens per minute
+    rpm: int = None
+    tpm: int = None
 
     question_column: str = None
     answer_column: str = None
@@ -66,6 +70,7 @@ class PalmHandler(BaseMLEngine):
         ]
         self.rate_limit = 60  # requests per minute
         self.max_batch_size = 20
+        self.max_concurrency = 8  # max number of parallel requests
         self.default_max_output_tokens = 64
         self.chat_completion_models = CHAT_MODELS
 
@@ -273,8 +278,8 @@ class PalmHandler(BaseMLEngine):
     def _completion(self, model_name, prompts, api_key, api_args, args_model, df):
         """
         Handles completion for an arbitrary amount of rows.
-        Additionally, single completion calls are done with exponential backoff to guarantee all prompts are processed,
-        because even with previous checks the tokens-per-minute limit may apply.
+        Requests are sent by the shared completion engine, which respects requests and tokens per minute limits
+        (`rpm` and `tpm` args) and retries rate-limited and failed requests.
         """
 
         def _submit_completion(model_name, prompts, api_key, api_args, args_model, df):
@@ -435,10 +440,26 @@ class PalmHandler(BaseMLEngine):
 
             return completions
 
+        engine = get_completion_engine(
+            (self.name, api_key),
+            rpm=args_model.rpm,
+            tpm=args_model.tpm,
+            max_concurrency=self.max_concurrency,
+        )
         try:
-            completion = _submit_completion(
-                model_name, prompts, api_key, api_args, args_model, df
-            )
+            if model_name == args_model.model_name and args_model.mode == "default":
+                # prompts don't depend on each other: they are sent in parallel
+                completions = engine.run(
+                    lambda batch: [_submit_completion(model_name, batch, api_key, api_args, args_model, df)],
+                    prompts,
+                )
+                return [item for completion in completions for item in completion]
+
+            # all prompts are sent in one request
+            completion = engine.run(
+                lambda batch: [_submit_completion(model_name, batch[0], api_key, api_args, args_model, df)],
+                [prompts],
+            )[0]
             return completion
         except Exception as e:
             completion = []
@@ -250,6 +250,47 @@ class PostgresHandler(DatabaseHandler):
         logger.debug(f"Executing SQL query: {query_str}")
         return self.native_query(query_str, params)
 
+    def query_stream(self, query: ASTNode, fetch_size: int = 1000):
+        """
+        Executes a SQL query represented by an ASTNode and yields the result by chunks.
+        Data is fetched using server-side cursor, so only one chunk is kept in memory.
+
+        Args:
+            query (ASTNode): An ASTNode representing the SQL query to be executed.
+            fetch_size (int): Max number of rows in one chunk.
+
+        Returns:
+            Iterator[DataFrame]: chunks of the result
+        """
+        query_str, params = self.renderer.get_exec_params(query, with_failback=True)
+        logger.debug(f"Executing SQL query by chunks: {query_str}")
+
+        need_to_close = not self.is_connected
+        connection = self.connect()
+        try:
+            with connection.cursor(name=f'mindsdb_stream_{id(query)}') as cur:
+                cur.execute(query_str, params)
+                columns = None
+                while True:
+                    result = cur.fetchmany(fetch_size)
+                    if columns is None:
+                        columns = [x.name for x in cur.description]
+                    elif len(result) == 0:
+                        break
+                    df = DataFrame(result, columns=columns)
+                    self._cast_dtypes(df, cur.description)
+                    yield df
+                    if len(result) < fetch_size:
+                        break
+            connection.commit()
+        except Exception as e:
+            logger.error(f'Error running query: {query_str} on {self.database}, {e}!')
+            connection.rollback()
+            raise
+        finally:
+            if need_to_close:
+                self.disconnect()
+
     def get_tables(self) -> Response:
         """
         Retrieves a list of all non-system tables and views in the current schema of the PostgreSQL database.
@@ -2,13 +2,13 @@ import ast
 import inspect
 import textwrap
 from _ast import AnnAssign, AugAssign
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import pandas as pd
 from mindsdb_sql.parser.ast.base import ASTNode
 from mindsdb.utilities import log
 
-from mindsdb.integrations.libs.response import HandlerResponse, HandlerStatusResponse
+from mindsdb.integrations.libs.response import HandlerResponse, HandlerStatusResponse, RESPONSE_TYPE
 
 logger = log.getLogger(__name__)
 
@@ -76,6 +76,29 @@ class BaseHandler:
         """
         raise NotImplementedError()
 
+    def query_stream(self, query: ASTNode, fetch_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """Receive SELECT query as AST and return result by chunks.
+
+        By default the query is executed by self.query and its result is split to chunks.
+        Handlers which are able to fetch data partially (e.g. using server-side cursors)
+        should override this method to keep memory usage bounded by chunk size.
+
+        Args:
+            query (ASTNode): sql query represented as AST
+            fetch_size (int): max number of rows in one chunk
+
+        Returns:
+            Iterator[pd.DataFrame]: chunks of the result, all with the same columns
+        """
+        response = self.query(query)
+        if response.type == RESPONSE_TYPE.ERROR:
+            raise Exception(response.error_message)
+        if response.data_frame is None:
+            return
+        df = response.data_frame
+        for start in range(0, max(len(df), 1), fetch_size):
+            yield df.iloc[start:start + fetch_size]
+
     def get_tables(self) -> HandlerResponse:
         """ Return list of entities
 
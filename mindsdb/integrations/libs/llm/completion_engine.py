@@ -0,0 +1,403 @@
+"""
+Shared executor of requests to LLM APIs.
+
+Handlers provide a function which sends one batch of inputs (prompts, texts for embeddings, etc) to the API and
+returns results for every input of the batch. CompletionEngine splits inputs into batches and sends them
+concurrently, keeping the API quota saturated but not exceeded:
+
+    - requests-per-minute and tokens-per-minute limits are enforced by token buckets before sending
+    - concurrency is adaptive: it grows while requests succeed and is halved on rate limit errors
+    - retryable errors (rate limits, timeouts, 5xx) are retried with exponential backoff, `Retry-After` is respected
+    - results are returned in the order of inputs
+
+How to use it:
+
+    engine = get_completion_engine(('openai', api_key), rpm=500, tpm=100000)
+    embeddings = engine.run(submit_embeddings, texts, batch_size=100)
+
+State of rate limits is kept in the engine, so the same engine should be used for all requests with the same
+credentials. If users of the engine set different limits, the lowest of them is used.
+"""
+import time
+import random
+import asyncio
+import inspect
+import hashlib
+import threading
+from typing import Any, Callable, Hashable, List, Optional
+
+from mindsdb.utilities import log
+from mindsdb.utilities.context_executor import ContextThreadPoolExecutor
+
+logger = log.getLogger(__name__)
+
+RETRYABLE_STATUSES = (408, 409, 429, 500, 502, 503, 504)
+RETRYABLE_ERRORS = (
+    'APITimeoutError', 'APIConnectionError', 'RateLimitError', 'Timeout', 'ConnectionError',
+    # google api
+    'ResourceExhausted', 'ServiceUnavailable', 'DeadlineExceeded'
+)
+
+
+def estimate_tokens(value: Any) -> int:
+    """ Rough number of tokens in the input: ~4 characters per token
+
+        Args:
+            value (Any): input of request
+
+        Returns:
+            int
+    """
+    return len(str(value)) // 4 + 1
+
+
+def _get_status(error: Exception) -> Optional[int]:
+    # http status is stored differently by clients of APIs: openai, anthropic - status_code, cohere - http_status,
+    # google - code
+    for attr in ('status_code', 'http_status', 'code'):
+        status = getattr(error, attr, None)
+        if isinstance(status, int):
+            return status
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    return _get_status(error) == 429 or type(error).__name__ == 'RateLimitError'
+
+
+def is_retryable_error(error: Exception) -> bool:
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if _get_status(error) in RETRYABLE_STATUSES:
+        return True
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """ Delay (in seconds) requested by API, from 'Retry-After' header of response
+
+        Args:
+            error (Exception): error raised by API client
+
+        Returns:
+            float | None
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    value = headers.get('retry-after-ms')
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """ Limit of amount per minute. Bucket is refilled continuously, its capacity is the amount per minute.
+
+        Amount is reserved in advance and bucket may go negative: waiting time of the next request includes
+        time of previous reservations, so requests are served in order of reservation.
+        It is thread-safe and does not depend on event loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float = 1) -> float:
+        """ Take amount from bucket
+
+            Args:
+                amount (float): amount to take. It is limited by capacity of bucket
+
+            Returns:
+                float: time (in seconds) to wait before using the amount
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+    def set_limit(self, per_minute: float):
+        """ Change amount per minute. Amount which was taken during the last minute is taken from the new limit
+
+            Args:
+                per_minute (float): new amount per minute
+        """
+        with self._lock:
+            self._refill()
+            used = self.capacity - self.tokens
+            self.capacity = float(per_minute)
+            self.rate = self.capacity / 60
+            self.tokens = self.capacity - used
+
+    def pause(self, seconds: float):
+        """ Nothing can be taken from bucket during the time
+
+            Args:
+                seconds (float): pause duration
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class AdaptiveConcurrency:
+    """ Additive increase / multiplicative decrease of the number of parallel requests
+    """
+
+    def __init__(self, initial: int, maximum: int):
+        self.maximum = max(1, maximum)
+        self.limit = float(min(max(1, initial), self.maximum))
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        return int(self.limit)
+
+    def set_maximum(self, maximum: int):
+        with self._lock:
+            self.maximum = max(1, maximum)
+            self.limit = min(self.limit, float(self.maximum))
+
+    def on_success(self):
+        with self._lock:
+            # +1 after the number of successful requests equal to the current limit
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_rate_limit(self):
+        with self._lock:
+            self.limit = max(1.0, self.limit / 2)
+
+
+class CompletionEngine:
+    """ Rate-limit-aware executor of batched requests to LLM API
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_concurrency: int = 32, initial_concurrency: int = 4, max_retries: int = 8,
+                 initial_delay: float = 1, max_delay: float = 60,
+                 count_tokens: Callable[[Any], int] = estimate_tokens):
+        """
+            Args:
+                rpm (float): max number of requests per minute, None - no limit
+                tpm (float): max number of tokens per minute, None - no limit
+                max_concurrency (int): max number of requests which are executed at the same time
+                initial_concurrency (int): number of parallel requests at start
+                max_retries (int): max number of retries of one request
+                initial_delay (float): delay (in seconds) before the first retry, it is doubled on every next retry
+                max_delay (float): max delay between retries
+                count_tokens (Callable): returns number of tokens in one input
+        """
+        self.requests_bucket = TokenBucket(rpm) if rpm else None
+        self.tokens_bucket = TokenBucket(tpm) if tpm else None
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, max_concurrency)
+        self._limits_lock = threading.Lock()
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.count_tokens = count_tokens
+
+    def update_limits(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                      max_concurrency: Optional[int] = None):
+        """ Apply limits of another user of the engine: the lowest of the limits is used.
+            State of rate limits (reserved amounts, concurrency) is kept
+
+            Args:
+                rpm (float): max number of requests per minute, None - no limit
+                tpm (float): max number of tokens per minute, None - no limit
+                max_concurrency (int): max number of requests which are executed at the same time
+        """
+        with self._limits_lock:
+            if rpm:
+                if self.requests_bucket is None:
+                    self.requests_bucket = TokenBucket(rpm)
+                elif rpm < self.requests_bucket.capacity:
+                    self.requests_bucket.set_limit(rpm)
+            if tpm:
+                if self.tokens_bucket is None:
+                    self.tokens_bucket = TokenBucket(tpm)
+                elif tpm < self.tokens_bucket.capacity:
+                    self.tokens_bucket.set_limit(tpm)
+            if max_concurrency and max_concurrency < self.concurrency.maximum:
+                self.concurrency.set_maximum(max_concurrency)
+
+    def make_batches(self, items: List[Any], batch_size: int = 1,
+                     max_batch_tokens: Optional[int] = None) -> List[List[Any]]:
+        """ Split inputs into batches, keeping their order
+
+            Args:
+                items (List[Any]): inputs
+                batch_size (int): max number of inputs in batch
+                max_batch_tokens (int): max number of tokens in batch, None - no limit
+
+            Returns:
+                List[List[Any]]
+        """
+        batch_size = max(1, batch_size)
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for item in items:
+            tokens = self.count_tokens(item) if max_batch_tokens else 0
+            if batch and (len(batch) >= batch_size or (max_batch_tokens and batch_tokens + tokens > max_batch_tokens)):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(item)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def run(self, submit: Callable[[List[Any]], List[Any]], items: List[Any], batch_size: int = 1,
+            max_batch_tokens: Optional[int] = None) -> List[Any]:
+        """ Process all inputs
+
+            Args:
+                submit (Callable): function or coroutine function which sends one batch to API and
+                    returns list of results, one per input of the batch
+                items (List[Any]): inputs
+                batch_size (int): max number of inputs in one request
+                max_batch_tokens (int): max number of tokens in one request, None - no limit
+
+            Returns:
+                List[Any]: results in the order of inputs
+        """
+        coroutine = self.arun(submit, items, batch_size=batch_size, max_batch_tokens=max_batch_tokens)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # called from coroutine: event loop of the thread is busy
+        with ContextThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    async def arun(self, submit: Callable[[List[Any]], List[Any]], items: List[Any], batch_size: int = 1,
+                   max_batch_tokens: Optional[int] = None) -> List[Any]:
+        """ The same as run, for use from coroutines
+        """
+        batches = self.make_batches(items, batch_size, max_batch_tokens)
+        if len(batches) == 0:
+            return []
+        results = [None] * len(batches)
+        slots = asyncio.Condition()
+        active = 0
+
+        if inspect.iscoroutinefunction(submit):
+            executor = None
+        else:
+            executor = ContextThreadPoolExecutor(max_workers=self.concurrency.maximum)
+
+        async def call(batch):
+            if executor is None:
+                return await submit(batch)
+            return await asyncio.get_running_loop().run_in_executor(executor, submit, batch)
+
+        async def process(idx: int, batch: List[Any]):
+            nonlocal active
+            tokens = sum(self.count_tokens(item) for item in batch) if self.tokens_bucket else 0
+            attempt = 0
+            while True:
+                async with slots:
+                    await slots.wait_for(lambda: active < self.concurrency.get())
+                    active += 1
+                try:
+                    await self._wait_quota(tokens)
+                    result = await call(batch)
+                except Exception as e:
+                    if not is_retryable_error(e) or attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    delay = self._on_error(e, attempt)
+                    logger.debug(f'LLM request is failed ({e}), retry {attempt} in {delay:.1f}s')
+                else:
+                    self.concurrency.on_success()
+                    delay = None
+                finally:
+                    async with slots:
+                        active -= 1
+                        slots.notify_all()
+
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+
+            if len(result) != len(batch):
+                raise ValueError(f'Expected {len(batch)} results for the batch, got {len(result)}')
+            results[idx] = result
+
+        try:
+            await asyncio.gather(*[process(idx, batch) for idx, batch in enumerate(batches)])
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+        return [item for batch_result in results for item in batch_result]
+
+    async def _wait_quota(self, tokens: int):
+        wait = 0
+        if self.requests_bucket is not None:
+            wait = self.requests_bucket.reserve(1)
+        if self.tokens_bucket is not None:
+            wait = max(wait, self.tokens_bucket.reserve(tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _on_error(self, error: Exception, attempt: int) -> float:
+        # returns delay before retry
+        delay = min(self.max_delay, self.initial_delay * 2 ** (attempt - 1)) * (1 + random.random() * 0.1)
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            delay = retry_after
+        if is_rate_limit_error(error):
+            self.concurrency.on_rate_limit()
+            # other requests have to wait too
+            for bucket in (self.requests_bucket, self.tokens_bucket):
+                if bucket is not None:
+                    bucket.pause(delay)
+        return delay
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_completion_engine(key: Hashable, **kwargs) -> CompletionEngine:
+    """ Engine which is shared by all requests with the key (e.g. provider + api key)
+
+        Args:
+            key (Hashable): key of engine, it is hashed and is not stored
+            kwargs: arguments of CompletionEngine, they are used on creation of engine. Limits (rpm, tpm,
+                max_concurrency) of existing engine are lowered to them, if they are lower
+
+        Returns:
+            CompletionEngine
+    """
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()
+    with _engines_lock:
+        engine = _engines.get(digest)
+        if engine is None:
+            engine = CompletionEngine(**kwargs)
+            _engines[digest] = engine
+            return engine
+    engine.update_limits(
+        rpm=kwargs.get('rpm'), tpm=kwargs.get('tpm'), max_concurrency=kwargs.get('max_concurrency')
+    )
+    return engine
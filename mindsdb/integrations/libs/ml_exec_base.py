@@ -42,6 +42,7 @@ import mindsdb.utilities.profiler as profiler
 from mindsdb.utilities.ml_task_queue.producer import MLTaskProducer
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
 from mindsdb.integrations.libs.process_cache import process_cache, empty_callback, MLProcessException
+from mindsdb.integrations.libs.predict_batcher import predict_batcher
 
 try:
     import torch.multiprocessing as mp
@@ -225,7 +226,9 @@ class BaseMLEngineExec:
         }
 
         with self._catch_exception(model_name):
-            task = self.base_ml_executor.apply_async(
+            # concurrent predictions of the model can be coalesced into one task
+            task = predict_batcher.apply_async(
+                self.base_ml_executor,
                 task_type=ML_TASK_TYPE.PREDICT,
                 model_id=predictor_record.id,
                 payload={
@@ -1,28 +1,24 @@
-import time
-from collections import UserDict
+from collections import OrderedDict, UserDict
 
 
 class HandlersCache(UserDict):
+    """ LRU cache of ML handlers of the process
+    """
     def __init__(self, max_size: int = 5) -> None:
         self._max_size = max_size
         super().__init__()
+        self.data = OrderedDict()
 
     def __setitem__(self, key, value) -> None:
-        if len(self.data) > self._max_size:
-            sorted_elements = sorted(
-                self.data.items(),
-                key=lambda x: x[1]['last_usage_at']
-            )
-            del self.data[sorted_elements[0][0]]
-        self.data[key] = {
-            'last_usage_at': time.time(),
-            'handler': value
-        }
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self._max_size:
+            self.data.popitem(last=False)
 
     def __getitem__(self, key: int) -> object:
-        el = super().__getitem__(key)
-        el['last_usage_at'] = time.time()
-        return el['handler']
+        handler = self.data[key]
+        self.data.move_to_end(key)
+        return handler
 
 
 handlers_cacher = HandlersCache()
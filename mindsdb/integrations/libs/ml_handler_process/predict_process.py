@@ -6,23 +6,39 @@ import mindsdb.interfaces.storage.db as db
 from mindsdb.interfaces.storage.model_fs import ModelStorage, HandlerStorage
 from mindsdb.integrations.libs.ml_handler_process.handlers_cacher import handlers_cacher
 from mindsdb.utilities.functions import mark_process
+from mindsdb.utilities.dataframe_transport import pack_dataframe, unpack_dataframe
+
+
+def get_ml_handler(integration_id: int, predictor_record: db.Predictor, module_path: str):
+    """ get handler of the model from cache of the process or create it
+    """
+    if predictor_record.id in handlers_cacher:
+        return handlers_cacher[predictor_record.id]
+
+    module = importlib.import_module(module_path)
+    handlerStorage = HandlerStorage(integration_id)
+    modelStorage = ModelStorage(predictor_record.id)
+    ml_handler = module.Handler(
+        engine_storage=handlerStorage,
+        model_storage=modelStorage,
+    )
+    handlers_cacher[predictor_record.id] = ml_handler
+    return ml_handler
+
+
+@mark_process(name='learn')
+def prewarm_process(integration_id: int, predictor_record: db.Predictor, module_path: str) -> None:
+    """ load handler of the model to the process in advance, before predict is requested
+    """
+    get_ml_handler(integration_id, predictor_record, module_path)
 
 
 @mark_process(name='learn')
 def predict_process(integration_id: int, predictor_record: db.Predictor, args: dict,
                     module_path: str, ml_engine_name: str, dataframe: DataFrame) -> DataFrame:
-    module = importlib.import_module(module_path)
-
-    if predictor_record.id not in handlers_cacher:
-        handlerStorage = HandlerStorage(integration_id)
-        modelStorage = ModelStorage(predictor_record.id)
-        ml_handler = module.Handler(
-            engine_storage=handlerStorage,
-            model_storage=modelStorage,
-        )
-        handlers_cacher[predictor_record.id] = ml_handler
-    else:
-        ml_handler = handlers_cacher[predictor_record.id]
+    # dataframes may be passed via shared memory, it is released by the main process
+    dataframe = unpack_dataframe(dataframe)
+    ml_handler = get_ml_handler(integration_id, predictor_record, module_path)
 
     if ml_engine_name == 'lightwood':
         args['code'] = predictor_record.code
@@ -32,4 +48,4 @@ def predict_process(integration_id: int, predictor_record: db.Predictor, args: d
 
     predictions = ml_handler.predict(dataframe, args)
     ml_handler.close()
-    return predictions
+    return pack_dataframe(predictions)
@@ -0,0 +1,201 @@
+"""
+Micro-batching of predict tasks.
+
+Many small concurrent predictions of the same model (for example, dashboards which send a lot of one-row queries)
+are coalesced into one task: the first request of a batch waits `window_ms` for others, then one dataframe with
+rows of all requests is sent to ML engine and the result is split back to the requests by row counts.
+
+Batching is disabled by default, it is enabled by `predict_batching` section of config. Only requests with the same
+model, company, prediction format, params and input columns are coalesced. If the prediction of a batch can't be
+split (number of rows is changed) or it fails, requests of the batch are executed one by one.
+"""
+import json
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+import pandas as pd
+
+from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
+
+logger = log.getLogger(__name__)
+
+
+class PredictBatch:
+    """ Requests which will be sent to ML engine in one task
+    """
+    def __init__(self):
+        self.dataframes: List[pd.DataFrame] = []
+        self.futures: List[Future] = []
+        self.rows = 0
+        # is set when batch is full and has to be sent without waiting for the end of window
+        self.full = threading.Event()
+
+
+def _chain(task, future: Future):
+    # copy result of the task (Future of process cache or Task of redis queue) to the future
+    try:
+        future.set_result(task.result())
+    except Exception as e:
+        future.set_exception(e)
+
+
+class PredictBatcher:
+    """ Coalesces concurrent predict tasks for the same model
+    """
+
+    def __init__(self):
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_settings() -> dict:
+        return Config().get('predict_batching') or {}
+
+    @staticmethod
+    def _get_key(model_id: int, payload: dict, dataframe: pd.DataFrame) -> Optional[tuple]:
+        """ Key of batch. Requests can be coalesced only if they have the same key
+
+            Returns:
+                tuple | None: None if request can not be batched
+        """
+        args = payload['args']
+        if args.get('pred_format') != 'dict':
+            # explain and other formats don't return rows of dataframe
+            return None
+        predictor_record = payload['predictor_record']
+        learn_args = getattr(predictor_record, 'learn_args', None) or {}
+        if (learn_args.get('timeseries_settings') or {}).get('is_timeseries'):
+            # rows of timeseries depend on each other
+            return None
+        if dataframe.columns.has_duplicates:
+            return None
+        try:
+            args_key = json.dumps(args, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        return (
+            model_id,
+            payload['context'].get('company_id'),
+            args_key,
+            tuple(dataframe.columns),
+            tuple(str(dtype) for dtype in dataframe.dtypes)
+        )
+
+    def apply_async(self, executor, task_type: ML_TASK_TYPE, model_id: Optional[int],
+                    payload: dict, dataframe: Optional[pd.DataFrame] = None):
+        """ Run the task using executor. Predict task can be merged with other predict tasks
+
+            Args:
+                executor: ProcessCache or MLTaskProducer
+                task_type (ML_TASK_TYPE): type of the task
+                model_id (int): id of the model
+                payload (dict): payload of the task
+                dataframe (DataFrame): input of the task
+
+            Returns:
+                object with 'result' method (Future or Task)
+        """
+        settings = self._get_settings()
+        max_rows = settings.get('max_rows', 0)
+        key = None
+        if (
+            settings.get('enabled', False)
+            and task_type == ML_TASK_TYPE.PREDICT
+            and isinstance(dataframe, pd.DataFrame)
+            and 0 < len(dataframe) < max_rows
+        ):
+            key = self._get_key(model_id, payload, dataframe)
+        if key is None:
+            return executor.apply_async(
+                task_type=task_type, model_id=model_id, payload=payload, dataframe=dataframe
+            )
+
+        future = Future()
+        with self._lock:
+            batch = self._batches.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = PredictBatch()
+                self._batches[key] = batch
+            batch.dataframes.append(dataframe)
+            batch.futures.append(future)
+            batch.rows += len(dataframe)
+            if batch.rows >= max_rows:
+                # next requests will start a new batch
+                del self._batches[key]
+                batch.full.set()
+
+        if is_leader:
+            # the first request of batch waits for others and sends the batch
+            batch.full.wait(settings.get('window_ms', 20) / 1000)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+            self._run(executor, batch, model_id, payload)
+        return future
+
+    @staticmethod
+    def _run(executor, batch: PredictBatch, model_id: Optional[int], payload: dict):
+        def apply(dataframe):
+            return executor.apply_async(
+                task_type=ML_TASK_TYPE.PREDICT, model_id=model_id, payload=payload, dataframe=dataframe
+            )
+
+        if len(batch.dataframes) == 1:
+            _chain(apply(batch.dataframes[0]), batch.futures[0])
+            return
+
+        dataframe = pd.concat(batch.dataframes, ignore_index=True)
+        try:
+            predictions = apply(dataframe).result()
+            parts = split_predictions(predictions, batch.dataframes)
+        except Exception as e:
+            # error may be caused by rows of one request only
+            logger.debug(f'Batch of {len(batch.dataframes)} predictions is failed: {e}')
+            parts = None
+
+        if parts is None:
+            tasks = [apply(df) for df in batch.dataframes]
+            for task, future in zip(tasks, batch.futures):
+                _chain(task, future)
+            return
+
+        for part, future in zip(parts, batch.futures):
+            future.set_result(part)
+
+
+def split_predictions(predictions: pd.DataFrame, dataframes: List[pd.DataFrame]) -> Optional[List[pd.DataFrame]]:
+    """ Split result of prediction of concatenated dataframes
+
+        Args:
+            predictions (pd.DataFrame): result of predict
+            dataframes (List[pd.DataFrame]): input dataframes of requests
+
+        Returns:
+            List[pd.DataFrame] | None: predictions for every input dataframe, None if they can't be matched by rows
+    """
+    if not isinstance(predictions, pd.DataFrame):
+        return None
+    if len(predictions) != sum(len(df) for df in dataframes):
+        return None
+    if '__mindsdb_row_id' in predictions.columns and '__mindsdb_row_id' in dataframes[0].columns:
+        # order of rows must be kept
+        row_ids = pd.concat([df['__mindsdb_row_id'] for df in dataframes], ignore_index=True)
+        if not (predictions['__mindsdb_row_id'].reset_index(drop=True) == row_ids).all():
+            return None
+
+    parts = []
+    start = 0
+    for df in dataframes:
+        part = predictions.iloc[start:start + len(df)].copy()
+        # index is the same as input's, it is used to restore row ids
+        part.index = df.index
+        parts.append(part)
+        start += len(df)
+    return parts
+
+
+predict_batcher = PredictBatcher()
@@ -1,19 +1,24 @@
 import sys
 import time
 import threading
+from collections import deque
+from functools import partial
 from typing import Optional, Callable
 from concurrent.futures import ProcessPoolExecutor, Future
 
 from pandas import DataFrame
 
 import mindsdb.interfaces.storage.db as db
+from mindsdb.metrics import metrics
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.dataframe_transport import pack_dataframe, unpack_dataframe, SharedDataFrame
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
 from mindsdb.integrations.libs.ml_handler_process import (
     learn_process,
     update_process,
     predict_process,
+    prewarm_process,
     describe_process,
     create_engine_process,
     update_engine_process,
@@ -176,8 +181,26 @@ def warm_function(func, context: str, *args, **kwargs):
         raise MLProcessException(base_exception=e)
 
 
+class QueuedTask:
+    """ Task which is executed in a WarmProcess or waits for a free one
+    """
+    def __init__(self, task_type: Optional[ML_TASK_TYPE], func: Callable, context: dict,
+                 kwargs: dict, marker: tuple):
+        self.task_type = task_type
+        self.func = func
+        self.context = context
+        self.kwargs = kwargs
+        self.marker = marker
+        # result of the task, is set when the task is done
+        self.result = Future()
+
+
 class ProcessCache:
-    """ simple cache for WarmProcess-es
+    """ cache for WarmProcess-es
+
+        Tasks for a model are routed to a process which already has the model loaded. If there is no
+        free process and the limit of processes for the ML engine is reached, the task waits in the queue.
+        The most used models are loaded in advance to idle processes.
     """
     def __init__(self, ttl: int = 120):
         """ Args:
@@ -185,9 +208,16 @@ class ProcessCache:
         """
         self.cache = {}
         self._init = False
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
         self._ttl = ttl
         self._keep_alive = {}
+        # {(ml_engine_name, model_marker): {'count': int, 'payload': dict}}
+        self._models_usage = {}
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'queued': 0
+        }
         self._stop_event = threading.Event()
         self.cleaner_thread = None
         self._start_clean()
@@ -217,36 +247,67 @@ class ProcessCache:
         """ run processes for specified handlers
         """
         from mindsdb.interfaces.database.integrations import integration_controller
-        preload_handlers = {}
         config = Config()
         is_cloud = config.get('cloud', False)
 
+        keep_alive = {}
         if config['ml_task_queue']['type'] != 'redis':
-            lightwood_handler = integration_controller.handler_modules['lightwood']
-            if lightwood_handler.Handler is not None:
-                preload_handlers[lightwood_handler.Handler] = 4 if is_cloud else 1
-
-            huggingface_handler = integration_controller.handler_modules['huggingface']
-            if huggingface_handler.Handler is not None:
-                preload_handlers[huggingface_handler.Handler] = 1 if is_cloud else 0
-
-            openai_handler = integration_controller.handler_modules['openai']
-            if openai_handler.Handler is not None:
-                preload_handlers[openai_handler.Handler] = 1 if is_cloud else 0
+            keep_alive = {
+                'lightwood': 4 if is_cloud else 1,
+                'huggingface': 1 if is_cloud else 0,
+                'openai': 1 if is_cloud else 0
+            }
+            keep_alive.update(config['ml_process_cache'].get('keep_alive', {}))
 
         with self._lock:
             if self._init is False:
                 self._init = True
-                for handler in preload_handlers:
-                    self._keep_alive[handler.__name__] = preload_handlers[handler]
-                    self.cache[handler.__name__] = {
-                        'last_usage_at': time.time(),
-                        'handler_module': handler.__module__,
-                        'processes': [
-                            WarmProcess(init_ml_handler, (handler.__module__,))
-                            for _x in range(preload_handlers[handler])
-                        ]
-                    }
+                for ml_engine_name, count in keep_alive.items():
+                    handler_module = integration_controller.handler_modules.get(ml_engine_name)
+                    if handler_module is None or handler_module.Handler is None:
+                        continue
+                    self._keep_alive[ml_engine_name] = count
+                    engine = self._get_engine(ml_engine_name, handler_module.Handler.__module__)
+                    engine['last_usage_at'] = time.time()
+                    for _x in range(count):
+                        engine['processes'].append(
+                            WarmProcess(init_ml_handler, (engine['handler_module'],))
+                        )
+
+    def _get_engine(self, ml_engine_name: str, handler_module_path: str) -> dict:
+        if ml_engine_name not in self.cache:
+            self.cache[ml_engine_name] = {
+                'last_usage_at': None,
+                'handler_module': handler_module_path,
+                'processes': [],
+                'queue': deque()
+            }
+        return self.cache[ml_engine_name]
+
+    def _get_max_processes(self, ml_engine_name: str) -> int:
+        max_processes = Config()['ml_process_cache'].get('max_processes', {})
+        return max_processes.get(ml_engine_name, max_processes.get('default', 8))
+
+    def get_stats(self) -> dict:
+        """ state of the processes and the scheduler
+
+            Returns:
+                dict: numbers of processes and queue depth for every ML engine, hit rate of model affinity
+        """
+        with self._lock:
+            engines = {
+                ml_engine_name: {
+                    'processes': len(engine['processes']),
+                    'busy': sum(1 for p in engine['processes'] if p.task is not None and not p.task.done()),
+                    'queue_depth': len(engine['queue'])
+                }
+                for ml_engine_name, engine in self.cache.items()
+            }
+            stats = dict(self._stats)
+        predicts = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / predicts if predicts > 0 else None
+        stats['engines'] = engines
+        return stats
 
     def apply_async(self, task_type: ML_TASK_TYPE, model_id: Optional[int],
                     payload: dict, dataframe: Optional[DataFrame] = None) -> Future:
@@ -278,6 +339,8 @@ class ProcessCache:
             }
         elif task_type == ML_TASK_TYPE.PREDICT:
             func = predict_process
+            # large dataframe is sent via shared memory
+            dataframe = pack_dataframe(dataframe)
             kwargs = {
                 'predictor_record': payload['predictor_record'],
                 'ml_engine_name': payload['handler_meta']['engine'],
@@ -337,46 +400,158 @@ class ProcessCache:
 
         ml_engine_name = payload['handler_meta']['engine']
         model_marker = (model_id, payload['context']['company_id'])
+        queued_task = QueuedTask(task_type, func, payload['context'], kwargs, model_marker)
         with self._lock:
-            if ml_engine_name not in self.cache:
-                warm_process = WarmProcess(init_ml_handler, (handler_module_path,))
-                self.cache[ml_engine_name] = {
-                    'last_usage_at': None,
-                    'handler_module': handler_module_path,
-                    'processes': [warm_process]
-                }
+            engine = self._get_engine(ml_engine_name, handler_module_path)
+            if task_type == ML_TASK_TYPE.PREDICT:
+                usage = self._models_usage.setdefault((ml_engine_name, model_marker), {'count': 0})
+                usage['count'] += 1
+                usage['payload'] = payload
+
+            # learning is long, it is not limited to not block other tasks
+            no_limit = task_type in (ML_TASK_TYPE.LEARN, ML_TASK_TYPE.FINETUNE)
+            warm_process = self._find_process(ml_engine_name, model_marker, no_limit)
+            if warm_process is None:
+                engine['queue'].append(queued_task)
+                self._stats['queued'] += 1
+                metrics.ML_TASKS_QUEUE_DEPTH.labels(ml_engine_name).set(len(engine['queue']))
             else:
-                warm_process = None
-                if model_marker is not None:
-                    try:
-                        warm_process = next(
-                            p for p in self.cache[ml_engine_name]['processes']
-                            if p.ready() and p.has_marker(model_marker)
-                        )
-                    except StopIteration:
-                        pass
-                if warm_process is None:
-                    try:
-                        warm_process = next(
-                            p for p in self.cache[ml_engine_name]['processes']
-                            if p.ready()
-                        )
-                    except StopIteration:
-                        pass
-                if warm_process is None:
-                    warm_process = WarmProcess(init_ml_handler, (handler_module_path,))
-                    self.cache[ml_engine_name]['processes'].append(warm_process)
+                self._run(ml_engine_name, warm_process, queued_task)
+        return queued_task.result
+
+    def _find_process(self, ml_engine_name: str, model_marker: tuple, no_limit: bool = False) -> Optional[WarmProcess]:
+        """ find free process for the task, the process where the model is loaded is preferred.
+            Start new process if the limit of processes is not reached
 
-            task = warm_process.apply_async(warm_function, func, payload['context'], **kwargs)
-            self.cache[ml_engine_name]['last_usage_at'] = time.time()
-            warm_process.add_marker(model_marker)
-        return task
+            Returns:
+                WarmProcess | None: None if task has to wait
+        """
+        processes = self.cache[ml_engine_name]['processes']
+        ready = [p for p in processes if p.ready()]
+        for process in ready:
+            if process.has_marker(model_marker):
+                return process
+        if len(ready) > 0:
+            # not used process is preferred: it doesn't have other models loaded
+            return next((p for p in ready if not p.is_marked()), ready[0])
+
+        if no_limit or len(processes) < self._get_max_processes(ml_engine_name):
+            warm_process = WarmProcess(init_ml_handler, (self.cache[ml_engine_name]['handler_module'],))
+            processes.append(warm_process)
+            return warm_process
+        return None
+
+    def _run(self, ml_engine_name: str, warm_process: WarmProcess, queued_task: QueuedTask):
+        """ run task in the process
+        """
+        if queued_task.task_type == ML_TASK_TYPE.PREDICT:
+            if warm_process.has_marker(queued_task.marker):
+                self._stats['hits'] += 1
+                metrics.ML_PROCESS_AFFINITY.labels(ml_engine_name, 'hit').inc()
+            else:
+                self._stats['misses'] += 1
+                metrics.ML_PROCESS_AFFINITY.labels(ml_engine_name, 'miss').inc()
+
+        try:
+            task = warm_process.apply_async(warm_function, queued_task.func, queued_task.context, **queued_task.kwargs)
+        except Exception as e:
+            # process is broken (for example BrokenProcessPool): it is not used anymore, the task is failed
+            processes = self.cache[ml_engine_name]['processes']
+            if warm_process in processes:
+                processes.remove(warm_process)
+            warm_process.shutdown()
+            dataframe = queued_task.kwargs.get('dataframe')
+            if isinstance(dataframe, SharedDataFrame):
+                dataframe.unlink()
+            queued_task.result.set_exception(e)
+            return
+        self.cache[ml_engine_name]['last_usage_at'] = time.time()
+        warm_process.add_marker(queued_task.marker)
+        task.add_done_callback(partial(self._task_done, ml_engine_name, queued_task))
+
+    def _task_done(self, ml_engine_name: str, queued_task: QueuedTask, task: Future):
+        """ set result of the task and run next tasks from queue
+        """
+        dataframe = queued_task.kwargs.get('dataframe')
+        if isinstance(dataframe, SharedDataFrame):
+            dataframe.unlink()
+        try:
+            # dataframe from shared memory is restored and the memory is released
+            queued_task.result.set_result(unpack_dataframe(task.result(), unlink=True))
+        except BaseException as e:
+            queued_task.result.set_exception(e)
+        self._dispatch(ml_engine_name)
+
+    def _dispatch(self, ml_engine_name: str):
+        """ run queued tasks in free processes
+        """
+        with self._lock:
+            engine = self.cache[ml_engine_name]
+            queue = engine['queue']
+            while len(queue) > 0:
+                ready = [p for p in engine['processes'] if p.ready()]
+                if len(ready) == 0:
+                    if len(engine['processes']) >= self._get_max_processes(ml_engine_name):
+                        break
+                    # broken processes were removed: start new one instead
+                    warm_process = WarmProcess(init_ml_handler, (engine['handler_module'],))
+                    engine['processes'].append(warm_process)
+                    ready = [warm_process]
+                # task for a model which is loaded in one of free processes is preferred
+                for i, queued_task in enumerate(queue):
+                    warm_process = next((p for p in ready if p.has_marker(queued_task.marker)), None)
+                    if warm_process is not None:
+                        del queue[i]
+                        break
+                else:
+                    queued_task = queue.popleft()
+                    warm_process = next((p for p in ready if not p.is_marked()), ready[0])
+                self._run(ml_engine_name, warm_process, queued_task)
+            metrics.ML_TASKS_QUEUE_DEPTH.labels(ml_engine_name).set(len(queue))
+
+    def _get_top_models(self) -> list:
+        """ the most used models, which have to be loaded in advance
+
+            Returns:
+                list[tuple]: (ml_engine_name, model_marker, payload of the last predict)
+        """
+        prewarm_models = Config()['ml_process_cache'].get('prewarm_models', 0)
+        usage = sorted(self._models_usage.items(), key=lambda x: x[1]['count'], reverse=True)
+        # forget rarely used models
+        self._models_usage = dict(usage[:100])
+        return [
+            (ml_engine_name, model_marker, item['payload'])
+            for (ml_engine_name, model_marker), item in usage[:prewarm_models]
+        ]
+
+    def _prewarm(self, top_models: list):
+        """ load the most used models to idle processes
+        """
+        for ml_engine_name, model_marker, payload in top_models:
+            engine = self.cache[ml_engine_name]
+            if len(engine['queue']) > 0:
+                continue
+            processes = engine['processes']
+            if any(p.has_marker(model_marker) for p in processes):
+                continue
+            warm_process = next((p for p in processes if p.ready() and not p.is_marked()), None)
+            if warm_process is None:
+                continue
+            kwargs = {
+                'integration_id': payload['handler_meta']['integration_id'],
+                'predictor_record': payload['predictor_record'],
+                'module_path': payload['handler_meta']['module_path']
+            }
+            self._run(ml_engine_name, warm_process, QueuedTask(None, prewarm_process, payload['context'], kwargs,
+                                                               model_marker))
 
     def _clean(self) -> None:
         """ worker that stop unused processes
         """
         while self._stop_event.wait(timeout=10) is False:
             with self._lock:
+                top_models = self._get_top_models()
+                top_markers = set(model_marker for _, model_marker, _ in top_models)
                 for handler_name in self.cache.keys():
                     processes = self.cache[handler_name]['processes']
                     processes.sort(key=lambda x: x.is_marked())
@@ -391,6 +566,7 @@ class ProcessCache:
                             process.ready()
                             and process.is_marked()
                             and (time.time() - process.last_usage_at) > self._ttl
+                            and not any(process.has_marker(marker) for marker in top_markers)
                         ):
                             processes.pop(i)
                             # del process
@@ -402,5 +578,7 @@ class ProcessCache:
                             WarmProcess(init_ml_handler, (self.cache[handler_name]['handler_module'],))
                         )
 
+                self._prewarm(top_models)
+
 
 process_cache = ProcessCache()
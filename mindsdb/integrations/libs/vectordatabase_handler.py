@@ -27,6 +27,9 @@ from .base import BaseHandler
 
 LOG = log.getLogger(__name__)
 
+# number of rows in one existence check and write of upsert
+UPSERT_BATCH_SIZE = 1000
+
 
 class TableField(Enum):
     """
@@ -41,6 +44,31 @@ class TableField(Enum):
     DISTANCE = "distance"
 
 
+def fill_content_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Set ids of rows without id: md5 hash of content
+    :param df: dataframe with content column and optional id column
+    :return: copy of dataframe with filled id column
+    """
+    id_col = TableField.ID.value
+    content_col = TableField.CONTENT.value
+
+    def gen_hashes(values) -> list:
+        return [hashlib.md5(str(v).encode()).hexdigest() for v in values]
+
+    df = df.copy(deep=False)
+    if id_col not in df.columns:
+        # generate for all
+        df[id_col] = gen_hashes(df[content_col])
+    else:
+        # generate for empty
+        empty = df[id_col].isna().to_numpy()
+        if empty.any():
+            df[id_col] = df[id_col].astype(object)
+            df.loc[empty, id_col] = gen_hashes(df.loc[empty, content_col])
+    return df
+
+
 class VectorStoreHandler(BaseHandler):
     """
     Base class for handlers associated to vector databases.
@@ -262,52 +290,52 @@ class VectorStoreHandler(BaseHandler):
 
         return self.do_upsert(table_name, df)
 
-    def do_upsert(self, table_name, df):
+    def do_upsert(self, table_name, df, batch_size: int = UPSERT_BATCH_SIZE):
+        """
+        Insert new rows and update existing ones.
+        Rows without id get hash of content as id.
+        Rows are processed by batches: existence of ids is checked and data is written for every batch
+        """
         # if handler supports it, call upsert method
 
         id_col = TableField.ID.value
-        content_col = TableField.CONTENT.value
 
-        def gen_hash(v):
-            return hashlib.md5(str(v).encode()).hexdigest()
-
-        if id_col not in df.columns:
-            # generate for all
-            df[id_col] = df[content_col].apply(gen_hash)
-        else:
-            # generate for empty
-            for i in range(len(df)):
-                if pd.isna(df.loc[i, id_col]):
-                    df.loc[i, id_col] = gen_hash(df.loc[i, content_col])
+        df = fill_content_ids(df)
 
         # remove duplicated ids
         df = df.drop_duplicates([TableField.ID.value])
 
         # id is string TODO is it ok?
-        df[id_col] = df[id_col].apply(str)
+        df[id_col] = df[id_col].astype(str)
 
-        if hasattr(self, 'upsert'):
-            self.upsert(table_name, df)
-            return
+        total = len(df)
+        for start in range(0, total, batch_size):
+            chunk = df.iloc[start:start + batch_size]
 
-        # find existing ids
-        res = self.select(
-            table_name,
-            columns=[id_col],
-            conditions=[
-                FilterCondition(column=id_col, op=FilterOperator.IN, value=list(df[id_col]))
-            ]
-        )
-        existed_ids = list(res[id_col])
+            if hasattr(self, 'upsert'):
+                self.upsert(table_name, chunk)
+            else:
+                # find existing ids
+                res = self.select(
+                    table_name,
+                    columns=[id_col],
+                    conditions=[
+                        FilterCondition(column=id_col, op=FilterOperator.IN, value=list(chunk[id_col]))
+                    ]
+                )
+                existed = chunk[id_col].isin(res[id_col])
+
+                # update existed
+                df_update = chunk[existed]
+                df_insert = chunk[~existed]
 
-        # update existed
-        df_update = df[df[id_col].isin(existed_ids)]
-        df_insert = df[~df[id_col].isin(existed_ids)]
+                if not df_update.empty:
+                    self.update(table_name, df_update, [id_col])
+                if not df_insert.empty:
+                    self.insert(table_name, df_insert)
 
-        if not df_update.empty:
-            self.update(table_name, df_update, [id_col])
-        if not df_insert.empty:
-            self.insert(table_name, df_insert)
+            if total > batch_size:
+                LOG.debug(f'Upsert to {table_name}: {min(start + batch_size, total)}/{total} rows')
 
     def _dispatch_delete(self, query: Delete):
         """
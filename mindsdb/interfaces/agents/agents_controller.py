@@ -8,6 +8,7 @@ from mindsdb.interfaces.model.functions import PredictorRecordNotFound
 from mindsdb.interfaces.storage.db import Predictor
 from mindsdb.interfaces.model.model_controller import ModelController
 from mindsdb.interfaces.skills.skills_controller import SkillsController
+from mindsdb.interfaces.skills.tool_cache import drop_agent_tool_cache
 from mindsdb.interfaces.storage import db
 from mindsdb.interfaces.database.projects import ProjectController
 from mindsdb.utilities.context import context as ctx
@@ -231,6 +232,7 @@ class AgentsController:
             # See: https://docs.sqlalchemy.org/en/20/orm/session_api.html#sqlalchemy.orm.attributes.flag_modified
             flag_modified(existing_agent, 'params')
         db.session.commit()
+        drop_agent_tool_cache(existing_agent.id)
 
         return existing_agent
 
@@ -251,6 +253,7 @@ class AgentsController:
             raise ValueError(f'Agent with name does not exist: {agent_name}')
         db.session.delete(agent)
         db.session.commit()
+        drop_agent_tool_cache(agent.id)
 
     def get_completion(
             self,
@@ -288,6 +291,8 @@ class AgentsController:
             # Underlying handler (e.g. Langchain) will handle default tools like mdb_read, mdb_write, etc.
             'tools': tools,
             'skills': [s for s in agent.skills],
+            # is used to cache results of tool calls of the agent between calls
+            'agent_id': agent.id,
             **(agent.params or {})
         }
         if observation_id is not None:
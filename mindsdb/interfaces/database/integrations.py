@@ -1,4 +1,5 @@
 import os
+import ast
 import sys
 import base64
 import shutil
@@ -7,12 +8,14 @@ import importlib
 import threading
 import inspect
 import multiprocessing
-from time import time
+from time import time, perf_counter
 from pathlib import Path
 from copy import deepcopy
-from typing import Optional
+from typing import Callable, Iterator, Optional
 from textwrap import dedent
-from collections import OrderedDict
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
 
 from sqlalchemy import func
 
@@ -22,22 +25,223 @@ from mindsdb.utilities.exception import EntityNotExistsError
 from mindsdb.interfaces.storage.fs import FsStore, FileStorage, RESOURCE_GROUP
 from mindsdb.interfaces.storage.model_fs import HandlerStorage
 from mindsdb.interfaces.file.file_controller import FileController
+from mindsdb.interfaces.database.metadata_catalog import metadata_catalog
 from mindsdb.integrations.libs.base import DatabaseHandler
 from mindsdb.integrations.libs.base import BaseMLEngine
 from mindsdb.integrations.libs.api_handler import APIHandler
 from mindsdb.integrations.libs.const import HANDLER_CONNECTION_ARG_TYPE as ARG_TYPE, HANDLER_TYPE
 from mindsdb.interfaces.model.functions import get_model_records
 from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.functions import get_handler_install_message
 from mindsdb.utilities import log
 from mindsdb.integrations.libs.ml_exec_base import BaseMLEngineExec
 from mindsdb.integrations.libs.base import BaseHandler
+from mindsdb.metrics import metrics
 import mindsdb.utilities.profiler as profiler
 
 logger = log.getLogger(__name__)
 
 
+class HandlersPool:
+    """ Bounded pool of data handlers of one integration, shared by all threads of the process.
+        A handler is taken by one thread for the time of a call and then is returned to the pool
+    """
+
+    def __init__(
+        self, name: str, factory: Callable[[], DatabaseHandler], max_size: int = 10, acquire_timeout: float = 60,
+        max_idle: float = 60, max_lifetime: float = 3600, health_check_after: float = 30
+    ):
+        """ init pool
+
+            Args:
+                name (str): name of integration
+                factory (Callable): function that creates new handler
+                max_size (int): max number of handlers (idle and in use)
+                acquire_timeout (float): time (in seconds) to wait for a free handler
+                max_idle (float): idle handlers are disconnected after that time (in seconds)
+                max_lifetime (float): handlers are disconnected after that time from creation (in seconds)
+                health_check_after (float): check connection of handler which was idle for that time (in seconds)
+        """
+        self.name = name
+        self.factory = factory
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+
+        self._idle = deque()
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'closed': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'failed_health_checks': 0,
+        }
+
+    def put(self, handler: DatabaseHandler) -> None:
+        """ add new handler to the pool, if there is a room for it
+        """
+        with self._cond:
+            if self._closed or len(self._idle) + self._in_use >= self.max_size:
+                return
+            now = time()
+            self._idle.append({'handler': handler, 'created_at': now, 'used_at': now, 'check': False})
+            self.stats['created'] += 1
+            self._cond.notify()
+        self._update_metrics()
+
+    def _acquire(self) -> dict:
+        deadline = time() + self.acquire_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise Exception(f"Integration '{self.name}' was changed or deleted")
+                if len(self._idle) > 0:
+                    record = self._idle.pop()    # most recently used
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_size:
+                    self._in_use += 1
+                    record = None
+                    break
+                timeout = deadline - time()
+                if timeout <= 0:
+                    self.stats['timeouts'] += 1
+                    metrics.INTEGRATION_HANDLERS_POOL_ACQUIRE.labels(self.name, 'timeout').inc()
+                    raise Exception(
+                        f"All {self.max_size} connections to '{self.name}' are in use, "
+                        f"no one was released in {self.acquire_timeout} seconds"
+                    )
+                self.stats['waits'] += 1
+                self._cond.wait(timeout)
+
+        try:
+            if record is not None and self._is_healthy(record):
+                self.stats['reused'] += 1
+                metrics.INTEGRATION_HANDLERS_POOL_ACQUIRE.labels(self.name, 'reused').inc()
+            else:
+                if record is not None:
+                    self._disconnect(record)
+                now = time()
+                record = {'handler': self.factory(), 'created_at': now, 'used_at': now, 'check': False}
+                self.stats['created'] += 1
+                metrics.INTEGRATION_HANDLERS_POOL_ACQUIRE.labels(self.name, 'created').inc()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        self._update_metrics()
+        return record
+
+    def _release(self, record: dict) -> None:
+        now = time()
+        record['used_at'] = now
+        with self._cond:
+            self._in_use -= 1
+            keep = self._closed is False and now - record['created_at'] < self.max_lifetime
+            if keep:
+                self._idle.append(record)
+            self._cond.notify()
+        if not keep:
+            self._disconnect(record)
+        self._update_metrics()
+
+    def _is_healthy(self, record: dict) -> bool:
+        now = time()
+        if now - record['created_at'] >= self.max_lifetime:
+            return False
+        if record['check'] is False and now - record['used_at'] < self.health_check_after:
+            return True
+        try:
+            healthy = record['handler'].check_connection().success is True
+        except Exception:
+            healthy = False
+        if not healthy:
+            self.stats['failed_health_checks'] += 1
+        record['check'] = False
+        return healthy
+
+    def _disconnect(self, record: dict) -> None:
+        try:
+            record['handler'].disconnect()
+        except Exception:
+            pass
+        self.stats['closed'] += 1
+
+    @contextmanager
+    def lease(self) -> Iterator[DatabaseHandler]:
+        """ take handler from the pool for the time of the call
+
+            Yields:
+                DatabaseHandler
+        """
+        record = self._acquire()
+        try:
+            yield record['handler']
+        except Exception:
+            # connection may be broken, check it before next use
+            record['check'] = True
+            raise
+        finally:
+            self._release(record)
+
+    def clean(self) -> None:
+        """ disconnect handlers that are idle longer than max_idle or live longer than max_lifetime
+        """
+        now = time()
+        expired = []
+        with self._cond:
+            for record in list(self._idle):
+                if now - record['used_at'] >= self.max_idle or now - record['created_at'] >= self.max_lifetime:
+                    self._idle.remove(record)
+                    expired.append(record)
+        for record in expired:
+            self._disconnect(record)
+        if len(expired) > 0:
+            self._update_metrics()
+
+    def close(self) -> None:
+        """ disconnect idle handlers, handlers in use are disconnected when they are released
+        """
+        with self._cond:
+            self._closed = True
+            records = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for record in records:
+            self._disconnect(record)
+        self._update_metrics()
+
+    def is_empty(self) -> bool:
+        with self._cond:
+            return len(self._idle) == 0 and self._in_use == 0
+
+    def get_stats(self) -> dict:
+        """ metrics of the pool
+        """
+        with self._cond:
+            return {
+                'name': self.name,
+                'max_size': self.max_size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                **self.stats
+            }
+
+    def _update_metrics(self) -> None:
+        metrics.INTEGRATION_HANDLERS_POOL_SIZE.labels(self.name, 'idle').set(len(self._idle))
+        metrics.INTEGRATION_HANDLERS_POOL_SIZE.labels(self.name, 'in_use').set(self._in_use)
+
+
 class HandlersCache:
-    """ Cache for data handlers that keep connections opened during ttl time from handler last use
+    """ Cache for data handlers that keep connections opened during ttl time from handler last use.
+        Also keeps pools of handlers which are shared between threads
     """
 
     def __init__(self, ttl: int = 60):
@@ -48,6 +252,7 @@ class HandlersCache:
         """
         self.ttl = ttl
         self.handlers = {}
+        self.pools = {}
         self._lock = threading.RLock()
         self._stop_event = threading.Event()
         self.cleaner_thread = None
@@ -113,6 +318,35 @@ class HandlersCache:
             self.handlers[key]['expired_at'] = time() + self.ttl
             return self.handlers[key]['handler']
 
+    def get_pool(self, name: str, factory: Callable[[], DatabaseHandler]) -> HandlersPool:
+        """ get pool of handlers of integration, create it if not exists
+
+            Args:
+                name (str): handler name
+                factory (Callable): function that creates new handler
+
+            Returns:
+                HandlersPool
+        """
+        key = (name.lower(), ctx.company_id)
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool_config = Config().get('data_handlers_pool') or {}
+                pool = HandlersPool(name, factory, **pool_config)
+                # handlers processes don't share handlers between calls
+                if multiprocessing.current_process().name.startswith('HandlerProcess'):
+                    return pool
+                self.pools[key] = pool
+            self._start_clean()
+            return pool
+
+    def get_pools_stats(self) -> list:
+        """ metrics of all pools of the process
+        """
+        with self._lock:
+            return [pool.get_stats() for pool in self.pools.values()]
+
     def delete(self, name: str) -> None:
         """ delete handler from cache
 
@@ -123,11 +357,14 @@ class HandlersCache:
             key = (name, ctx.company_id, threading.get_native_id())
             if key in self.handlers:
                 try:
-                    self.handlers[key].disconnect()
+                    self.handlers[key]['handler'].disconnect()
                 except Exception:
                     pass
                 del self.handlers[key]
-            if len(self.handlers) == 0:
+            pool = self.pools.pop((name.lower(), ctx.company_id), None)
+            if pool is not None:
+                pool.close()
+            if len(self.handlers) == 0 and len(self.pools) == 0:
                 self._stop_clean()
 
     def _clean(self) -> None:
@@ -145,10 +382,49 @@ class HandlersCache:
                         except Exception:
                             pass
                         del self.handlers[key]
-                if len(self.handlers) == 0:
+                pools = list(self.pools.values())
+            for pool in pools:
+                pool.clean()
+            with self._lock:
+                if len(self.handlers) == 0 and all(pool.is_empty() for pool in self.pools.values()):
                     self._stop_event.set()
 
 
+class LazyHandlersDict(MutableMapping):
+    """ Dict of handlers (modules or metadata) by name of handler.
+        Names of all handlers are known from start, handler is imported on first access to its value
+    """
+
+    def __init__(self, controller: 'IntegrationController'):
+        self._data = {}
+        self._controller = controller
+
+    def __getitem__(self, name: str):
+        if name not in self._data:
+            self._controller._import_lazy_handler(name)
+        return self._data[name]
+
+    def __setitem__(self, name: str, value) -> None:
+        self._data[name] = value
+
+    def __delitem__(self, name: str) -> None:
+        del self._data[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._data or name in self._controller._lazy_handlers
+
+    def __iter__(self):
+        return iter(list(self._data) + [x for x in self._controller._lazy_handlers if x not in self._data])
+
+    def __len__(self) -> int:
+        return len(set(self._data) | set(self._controller._lazy_handlers))
+
+    def loaded_items(self) -> list:
+        """ items of handlers which are already imported
+        """
+        return list(self._data.items())
+
+
 class IntegrationController:
     @staticmethod
     def _is_not_empty_str(s):
@@ -211,6 +487,7 @@ class IntegrationController:
 
     def modify(self, name, data):
         self.handlers_cache.delete(name)
+        metadata_catalog.refresh(name)
         integration_record = self._get_integration_record(name)
         old_data = deepcopy(integration_record.data)
         for k in old_data:
@@ -225,6 +502,7 @@ class IntegrationController:
             raise Exception('Unable to drop: is system database')
 
         self.handlers_cache.delete(name)
+        metadata_catalog.refresh(name)
 
         # check permanent integration
         if name in self.handler_modules:
@@ -506,6 +784,34 @@ class IntegrationController:
         if handler is not None:
             return handler
 
+        handler = self._create_data_handler(name, case_sensitive)
+        self.handlers_cache.set(handler)
+
+        return handler
+
+    def get_data_handler_pool(self, name: str, case_sensitive: bool = False) -> HandlersPool:
+        """Get pool of DATA handlers (DB or API) by name. Handlers of the pool are shared between threads:
+        a handler is taken from the pool by 'lease' for the time of a call
+        Args:
+            name (str): name of the handler
+            case_sensitive (bool): should case be taken into account when searching by name
+
+        Returns:
+            HandlersPool: pool of data handlers
+        """
+        pool = self.handlers_cache.pools.get((name.lower(), ctx.company_id))
+        if pool is not None:
+            return pool
+
+        # check that the handler can be used before the pool is created
+        handler = self._create_data_handler(name, case_sensitive)
+        pool = self.handlers_cache.get_pool(
+            handler.name, lambda: self._create_data_handler(name, case_sensitive)
+        )
+        pool.put(handler)
+        return pool
+
+    def _create_data_handler(self, name: str, case_sensitive: bool = False) -> BaseHandler:
         integration_record = self._get_integration_record(name, case_sensitive)
         integration_engine = integration_record.engine
 
@@ -573,10 +879,7 @@ class IntegrationController:
             integration_engine, handler_ars
         )
         HandlerClass = self.handler_modules[integration_engine].Handler
-        handler = HandlerClass(**handler_ars)
-        self.handlers_cache.set(handler)
-
-        return handler
+        return HandlerClass(**handler_ars)
 
     def reload_handler_module(self, handler_name):
         importlib.reload(self.handler_modules[handler_name])
@@ -622,7 +925,7 @@ class IntegrationController:
             handler_meta['import']['error_message'] = str(import_error)
 
         # for ml engines, patch the connection_args from the argument probing
-        if hasattr(module, 'Handler'):
+        if hasattr(module, 'Handler') and getattr(module, 'type', None) == HANDLER_TYPE.ML:
             handler_class = module.Handler
             try:
                 prediction_args = handler_class.prediction_args()
@@ -690,23 +993,109 @@ class IntegrationController:
             mindsdb_path = Path(importlib.util.find_spec('mindsdb').origin).parent.joinpath('mindsdb')
             handlers_path = mindsdb_path.joinpath('integrations/handlers')
 
-        self.handler_modules = {}
-        self.handlers_import_status = {}
+        self._import_lock = threading.RLock()
+        # handlers which are not imported yet: {name: (base_import, handler_dir)}
+        self._lazy_handlers = {}
+        # metadata of handlers which is read from files of handler without import
+        self.handlers_metadata = {}
+        # time (in seconds) of import of handlers
+        self.handlers_import_time = {}
+        self.handler_modules = LazyHandlersDict(self)
+        self.handlers_import_status = LazyHandlersDict(self)
         for handler_dir in handlers_path.iterdir():
             if handler_dir.is_dir() is False or handler_dir.name.startswith('__'):
                 continue
-            self.import_handler('mindsdb.integrations.handlers.', handler_dir)
+            handler_meta = self._read_handler_metadata(handler_dir)
+            if handler_meta is None:
+                self.import_handler('mindsdb.integrations.handlers.', handler_dir)
+                continue
+            self.handlers_metadata[handler_meta['name']] = handler_meta
+            self._lazy_handlers[handler_meta['name']] = ('mindsdb.integrations.handlers.', handler_dir)
+
+    def _read_handler_metadata(self, handler_dir: Path) -> Optional[dict]:
+        """ read metadata of handler from its __init__.py and __about__.py, without import
+
+            Returns:
+                dict: metadata, None if it can't be read
+        """
+        attrs = {}
+        try:
+            for file_name, names in (
+                ('__init__.py', ('name', 'type', 'title', 'icon_path', 'permanent')),
+                ('__about__.py', ('__version__', '__description__'))
+            ):
+                file_path = handler_dir.joinpath(file_name)
+                if not file_path.is_file():
+                    continue
+                for node in ast.parse(file_path.read_text()).body:
+                    if not (
+                        isinstance(node, ast.Assign)
+                        and len(node.targets) == 1
+                        and isinstance(node.targets[0], ast.Name)
+                        and node.targets[0].id in names
+                    ):
+                        continue
+                    if isinstance(node.value, ast.Attribute):
+                        # type = HANDLER_TYPE.DATA
+                        attrs[node.targets[0].id] = getattr(HANDLER_TYPE, node.value.attr, None)
+                    else:
+                        attrs[node.targets[0].id] = ast.literal_eval(node.value)
+        except Exception as e:
+            logger.debug(f"Can't read metadata of handler {handler_dir.name}: {e}")
+            return None
+        if not isinstance(attrs.get('name'), str) or attrs.get('type') is None:
+            return None
+
+        handler_meta = {
+            'import': {
+                # handler is not imported yet
+                'success': None,
+                'folder': handler_dir.name,
+                'dependencies': self._read_dependencies(handler_dir)
+            },
+            'name': attrs['name'],
+            'type': attrs['type'],
+            'title': attrs.get('title'),
+            'version': attrs.get('__version__'),
+            'description': attrs.get('__description__'),
+            'permanent': attrs.get('permanent', attrs['name'] in ('files', 'views', 'lightwood')),
+        }
+        return handler_meta
 
-    def import_handler(self, base_import: str, handler_dir: Path):
+    def _import_lazy_handler(self, name: str) -> None:
+        with self._import_lock:
+            if name not in self._lazy_handlers:
+                return
+            base_import, handler_dir = self._lazy_handlers[name]
+            self.import_handler(base_import, handler_dir, name)
+
+    def import_handlers(self) -> dict:
+        """ import all handlers which are not imported yet and log time of import
+
+            Returns:
+                dict: time (in seconds) of import of each handler
+        """
+        for name in list(self._lazy_handlers):
+            self._import_lazy_handler(name)
+        timings = sorted(self.handlers_import_time.items(), key=lambda x: x[1], reverse=True)
+        logger.info(
+            f'Handlers are imported in {sum(self.handlers_import_time.values()):.2f}s, the slowest: '
+            + ', '.join(f'{name} {seconds:.2f}s' for name, seconds in timings[:10])
+        )
+        return dict(timings)
+
+    def import_handler(self, base_import: str, handler_dir: Path, handler_name: Optional[str] = None):
         handler_folder_name = str(handler_dir.name)
 
+        start_time = perf_counter()
         try:
             handler_module = importlib.import_module(f'{base_import}{handler_folder_name}')
             handler_meta = self._get_handler_meta(handler_module)
         except Exception as e:
-            handler_name = handler_folder_name
-            if handler_name.endswith('_handler'):
-                handler_name = handler_name[:-8]
+            if handler_name is None:
+                handler_name = handler_folder_name
+                if handler_name.endswith('_handler'):
+                    handler_name = handler_name[:-8]
             dependencies = self._read_dependencies(handler_dir)
             handler_meta = {
                 'import': {
@@ -717,11 +1106,31 @@ class IntegrationController:
                 },
                 'name': handler_name
             }
+        import_time = perf_counter() - start_time
 
         self.handlers_import_status[handler_meta['name']] = handler_meta
+        self.handlers_import_time[handler_meta['name']] = import_time
+        self._lazy_handlers.pop(handler_meta['name'], None)
+        if handler_name is not None:
+            self._lazy_handlers.pop(handler_name, None)
+
+        if handler_meta['import']['success'] is not True:
+            logger.debug(f"Dependencies for the handler '{handler_meta['name']}' are not installed.")
+            logger.debug(get_handler_install_message(handler_meta['name']))
+        logger.debug(f"Handler '{handler_meta['name']}' is imported in {import_time:.3f}s")
 
     def get_handlers_import_status(self):
+        """ metadata of handlers, handler is imported on first access to its metadata
+        """
         return self.handlers_import_status
 
+    def get_handlers_metadata(self) -> dict:
+        """ metadata of all handlers which is known without import: name, type, title, permanent, dependencies
+        """
+        metadata = dict(self.handlers_metadata)
+        for name, handler_meta in self.handlers_import_status.loaded_items():
+            metadata[name] = handler_meta
+        return metadata
+
 
 integration_controller = IntegrationController()
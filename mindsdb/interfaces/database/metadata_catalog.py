@@ -0,0 +1,139 @@
+import copy
+import threading
+import contextvars
+from time import time
+from typing import Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+
+class MetadataCatalog:
+    """ Cache of lists of tables and columns of integrations.
+        Lists which are older than ttl are returned as they are and are updated in background,
+        lists which are older than max_stale are fetched again before return
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_stale: Optional[float] = None, max_workers: int = 4):
+        """ init catalog
+
+            Args:
+                ttl (float): time (in seconds) while cached list is used without update, 0 to disable cache
+                max_stale (float): time (in seconds) while cached list can be used during update
+                max_workers (int): max number of background updates at the same time
+        """
+        self._ttl = ttl
+        self._max_stale = max_stale
+        self.max_workers = max_workers
+        self._entries = {}
+        self._refreshing = set()
+        # is increased on refresh: results of updates which were started before are dropped
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_config(self, name: str, default: float) -> float:
+        value = getattr(self, f'_{name}')
+        if value is None:
+            value = (Config().get('metadata_cache') or {}).get(name, default)
+        return value
+
+    @property
+    def ttl(self) -> float:
+        return self._get_config('ttl', 60)
+
+    @property
+    def max_stale(self) -> float:
+        return self._get_config('max_stale', 3600)
+
+    def get_tables(self, integration_name: str, fetch: Callable[[], list]) -> list:
+        """ get list of tables of integration
+
+            Args:
+                integration_name (str): name of integration
+                fetch (Callable): function that gets list of tables from integration
+
+            Returns:
+                list: tables of integration
+        """
+        return self._get((integration_name.lower(), 'tables', None), fetch)
+
+    def get_columns(self, integration_name: str, table_name: str, fetch: Callable[[], Any]) -> Any:
+        """ get columns of table of integration
+
+            Args:
+                integration_name (str): name of integration
+                table_name (str): name of table
+                fetch (Callable): function that gets columns of the table from integration
+
+            Returns:
+                columns of the table
+        """
+        return self._get((integration_name.lower(), 'columns', table_name), fetch)
+
+    def refresh(self, integration_name: Optional[str] = None) -> None:
+        """ forget cached lists, next request will get them from integration
+
+            Args:
+                integration_name (str): name of integration, all integrations if None
+        """
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries.keys()):
+                company_id, name, _kind, _table = key
+                if company_id != ctx.company_id:
+                    continue
+                if integration_name is None or name == integration_name.lower():
+                    del self._entries[key]
+
+    def _get(self, key: tuple, fetch: Callable[[], Any]) -> Any:
+        ttl = self.ttl
+        if ttl <= 0:
+            return fetch()
+
+        key = (ctx.company_id, ) + key
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            age = time() - entry['updated_at']
+            if age < ttl:
+                return copy.deepcopy(entry['value'])
+            if age < self.max_stale:
+                self._refresh_in_background(key, fetch)
+                return copy.deepcopy(entry['value'])
+
+        generation = self._generation
+        value = fetch()
+        self._set(key, value, generation)
+        return copy.deepcopy(value)
+
+    def _set(self, key: tuple, value: Any, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = {'value': value, 'updated_at': time()}
+
+    def _refresh_in_background(self, key: tuple, fetch: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # fetch is executed with context (company, user) of the current request
+        self._executor.submit(contextvars.copy_context().run, self._refresh, key, fetch, self._generation)
+
+    def _refresh(self, key: tuple, fetch: Callable[[], Any], generation: int) -> None:
+        try:
+            self._set(key, fetch(), generation)
+        except Exception as e:
+            logger.warning(f"Can't update metadata of '{key[1]}': {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+metadata_catalog = MetadataCatalog()
@@ -1,9 +1,11 @@
 import json
 import os
 import shutil
+import tempfile
 from pathlib import Path
 
 from mindsdb.integrations.handlers.file_handler import Handler as FileHandler
+from mindsdb.integrations.handlers.file_handler.file_handler import get_cache_path, get_no_cache_path
 from mindsdb.interfaces.storage import db
 from mindsdb.interfaces.storage.fs import FsStore
 from mindsdb.utilities import log
@@ -81,10 +83,14 @@ class FileController:
             file_name = Path(file_path).name
 
         file_dir = None
+        Path(self.config["paths"]["tmp"]).mkdir(parents=True, exist_ok=True)
+        parse_dir = Path(tempfile.mkdtemp(prefix="mindsdb_file_", dir=self.config["paths"]["tmp"]))
         try:
-            df, _col_map = FileHandler._handle_source(file_path)
+            # parsed content is stored with the file, queries to file don't parse it again
+            parsed_path = get_cache_path(parse_dir / file_name)
+            row_count, columns = FileHandler.parse_to_cache(file_path, parsed_path)
 
-            ds_meta = {"row_count": len(df), "column_names": list(df.columns)}
+            ds_meta = {"row_count": row_count, "column_names": columns}
 
             file_record = db.File(
                 name=name,
@@ -105,6 +111,11 @@ class FileController:
             source = file_dir.joinpath(file_name)
             # NOTE may be delay between db record exists and file is really in folder
             shutil.move(file_path, str(source))
+            if parsed_path.exists():
+                shutil.move(str(parsed_path), str(get_cache_path(source)))
+            else:
+                # content of file can't be cached, queries don't try it again
+                get_no_cache_path(source).touch()
 
             self.fs_store.put(store_file_path, base_dir=self.dir)
         except Exception as e:
@@ -113,6 +124,7 @@ class FileController:
         finally:
             if file_dir is not None:
                 shutil.rmtree(file_dir)
+            shutil.rmtree(parse_dir, ignore_errors=True)
 
         return file_record.id
 
@@ -130,6 +142,15 @@ class FileController:
         self.fs_store.delete(f"file_{ctx.company_id}_{file_id}")
         return True
 
+    def store_file_cache(self, file_path):
+        """Save the folder of the file to the store after the cache of its content was created in it,
+        otherwise the cache is removed by the next get_file_path
+
+        Args:
+            file_path (str): path to the file, returned by get_file_path
+        """
+        self.fs_store.put(Path(file_path).parent.name, base_dir=self.dir)
+
     def get_file_path(self, name):
         file_record = (
             db.session.query(db.File)
@@ -16,9 +16,21 @@ from mindsdb_sql.parser.ast import (
 from mindsdb_sql.parser.dialects.mindsdb import CreatePredictor
 
 import mindsdb.interfaces.storage.db as db
-from mindsdb.integrations.libs.vectordatabase_handler import TableField
+from mindsdb.integrations.libs.vectordatabase_handler import TableField, fill_content_ids
 from mindsdb.interfaces.database.projects import ProjectController
+from mindsdb.interfaces.knowledge_base.storage import get_kb_storage, delete_kb_storage
+from mindsdb.interfaces.knowledge_base.embedding_cache import (
+    EmbeddingCache, content_hash, CACHE_FILE_NAME, query_embedding_cache
+)
+from mindsdb.interfaces.knowledge_base.manifest import IngestionManifest, MANIFEST_FILE_NAME
+from mindsdb.utilities.cache import dataframe_row_hashes
 from mindsdb.utilities.exception import EntityExistsError, EntityNotExistsError
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+# number of rows which are embedded and sent to vector db at once
+INSERT_BATCH_SIZE = 1000
 
 
 class KnowledgeBaseTable:
@@ -30,6 +42,9 @@ class KnowledgeBaseTable:
     def __init__(self, kb: db.KnowledgeBase, session):
         self._kb = kb
         self._vector_db = None
+        self._storage = None
+        self._embedding_cache = None
+        self._manifest = None
         self.session = session
 
     def select_query(self, query: Select) -> pd.DataFrame:
@@ -89,6 +104,7 @@ class KnowledgeBaseTable:
         # send to vectordb
         db_handler = self._get_vector_db()
         db_handler.query(query)
+        self._clear_manifest()
 
     def delete_query(self, query: Delete):
         """
@@ -104,6 +120,7 @@ class KnowledgeBaseTable:
         # send to vectordb
         db_handler = self._get_vector_db()
         db_handler.query(query)
+        self._clear_manifest()
 
     def clear(self):
         """
@@ -112,11 +129,13 @@ class KnowledgeBaseTable:
         """
         db_handler = self._get_vector_db()
         db_handler.delete(self._kb.vector_database_table)
+        self._clear_manifest()
 
     def insert(self, df: pd.DataFrame):
         """
         Insert dataframe to KB table
-        Adds embedding column to dataframe and calls .upsert method of vector db
+        Rows which were inserted before without changes are skipped (if manifest is enabled).
+        The rest is processed by batches: embeddings are added and batch is sent to .do_upsert method of vector db
         :param df: input dataframe
 
         """
@@ -124,14 +143,49 @@ class KnowledgeBaseTable:
             return
 
         df = self._adapt_column_names(df)
+        df = fill_content_ids(df).drop_duplicates([TableField.ID.value])
 
-        # add embeddings
-        df_emb = self._df_to_embeddings(df)
-        df = pd.concat([df, df_emb], axis=1)
+        hash_columns = [col for col in (TableField.CONTENT.value, TableField.METADATA.value) if col in df.columns]
+        hashes = dataframe_row_hashes(df[hash_columns])
 
-        # send to vector db
+        params = self._kb.params
+        if params.get('embeddings_cache') is not False or params.get('incremental_insert') is not False:
+            # storage could be changed by other processes
+            self._get_storage(refresh=True)
+        manifest = self._get_manifest()
+        if manifest is not None:
+            changed = manifest.get_changed(df[TableField.ID.value].to_numpy(), hashes)
+            if not changed.all():
+                logger.info(f'Knowledge base {self._kb.name}: {len(df) - changed.sum()} unchanged rows are skipped')
+                df = df[changed]
+                hashes = hashes[changed]
+            if df.empty:
+                return
+
+        batch_size = self._kb.params.get('insert_batch_size', INSERT_BATCH_SIZE)
         db_handler = self._get_vector_db()
-        db_handler.do_upsert(self._kb.vector_database_table, df)
+        total = len(df)
+        try:
+            for start in range(0, total, batch_size):
+                batch = df.iloc[start:start + batch_size]
+
+                # add embeddings
+                df_emb = self._df_to_embeddings(batch, sync_cache=False)
+                batch = pd.concat([batch, df_emb], axis=1)
+
+                # send to vector db
+                db_handler.do_upsert(self._kb.vector_database_table, batch)
+
+                if manifest is not None:
+                    manifest.set_many(batch[TableField.ID.value].to_numpy(), hashes[start:start + batch_size])
+                if total > batch_size:
+                    logger.info(
+                        f'Knowledge base {self._kb.name}: {min(start + batch_size, total)}/{total} rows inserted'
+                    )
+        finally:
+            # save the progress: embeddings and manifest of inserted batches
+            if self._storage is not None:
+                self._storage.push()
 
     def _adapt_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
 
@@ -259,18 +313,98 @@ class KnowledgeBaseTable:
             self._vector_db = self.session.integration_controller.get_data_handler(database_name)
         return self._vector_db
 
-    def _df_to_embeddings(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _get_storage(self, refresh: bool = False):
+        """
+        helper to get file storage of KB
+        :param refresh: pull storage even if it was pulled by the process before
+        """
+        if self._storage is None:
+            self._storage = get_kb_storage(self._kb.id, refresh=refresh)
+        return self._storage
+
+    def _get_embedding_cache(self):
+        """
+        helper to get cache of embeddings, None if it is disabled in params of KB
+        """
+        if self._kb.params.get('embeddings_cache') is False:
+            return None
+        if self._embedding_cache is None:
+            storage = self._get_storage()
+            self._embedding_cache = EmbeddingCache(
+                storage.folder_path / CACHE_FILE_NAME, self._kb.embedding_model_id, storage=storage
+            )
+        return self._embedding_cache
+
+    def _get_manifest(self):
+        """
+        helper to get manifest of inserted rows, None if incremental insert is disabled in params of KB
+        """
+        if self._kb.params.get('incremental_insert') is False:
+            return None
+        if self._manifest is None:
+            storage = self._get_storage()
+            self._manifest = IngestionManifest(storage.folder_path / MANIFEST_FILE_NAME, storage=storage)
+        return self._manifest
+
+    def _clear_manifest(self):
+        """
+        Content of vector db was changed not by insert: stored hashes are not valid anymore
+        """
+        manifest = self._get_manifest()
+        if manifest is not None:
+            manifest.clear()
+
+    def _df_to_embeddings(self, df: pd.DataFrame, sync_cache: bool = True, is_query: bool = False) -> pd.DataFrame:
         """
         Returns embeddings for input dataframe.
-        Uses model embedding model to convert content to embeddings.
-        Automatically detects input and output of model using model description
-        :param df:
+        Embeddings are taken from cache by hash of content, the rest of contents is converted by embedding model.
+        Identical contents are sent to model once.
+        :param df: dataframe with content column
+        :param sync_cache: push new embeddings to storage of knowledge base
+        :param is_query: contents are from query: new embeddings are kept in memory of process, not in storage
         :return: dataframe with embeddings
         """
 
         if df.empty:
             return pd.DataFrame([], columns=[TableField.EMBEDDINGS.value])
 
+        contents = list(df[TableField.CONTENT.value])
+        hashes = [content_hash(content) for content in contents]
+
+        model_id = self._kb.embedding_model_id
+        cache = self._get_embedding_cache()
+        embeddings = {}
+        if cache is not None:
+            embeddings = cache.get_many(hashes)
+            if is_query and len(embeddings) < len(set(hashes)):
+                embeddings.update(query_embedding_cache.get_many(model_id, hashes))
+
+        missing = {}
+        for key, content in zip(hashes, contents):
+            if key not in embeddings and key not in missing:
+                missing[key] = content
+
+        if len(missing) > 0:
+            new_embeddings = dict(zip(missing.keys(), self._predict_embeddings(list(missing.values()))))
+            if cache is not None:
+                if is_query:
+                    query_embedding_cache.set_many(model_id, new_embeddings)
+                else:
+                    cache.set_many(new_embeddings, sync=sync_cache)
+            embeddings.update(new_embeddings)
+
+        return pd.DataFrame(
+            {TableField.EMBEDDINGS.value: [embeddings[key] for key in hashes]},
+            index=df.index
+        )
+
+    def _predict_embeddings(self, contents: List[str]) -> list:
+        """
+        Converts contents to embeddings using embedding model.
+        Automatically detects input and output of model using model description
+        :param contents: list of contents
+        :return: list of embeddings
+        """
         model_id = self._kb.embedding_model_id
         # get the input columns
         model_rec = db.session.query(db.Predictor).filter_by(id=model_id).first()
@@ -281,7 +415,7 @@ class KnowledgeBaseTable:
         project_datanode = self.session.datahub.get(model_project.name)
 
         # keep only content
-        df = df[[TableField.CONTENT.value]]
+        df = pd.DataFrame({TableField.CONTENT.value: contents})
 
         input_col = model_rec.learn_args.get('using', {}).get('question_column')
 
@@ -297,9 +431,8 @@ class KnowledgeBaseTable:
         if target != TableField.EMBEDDINGS.value:
             # adapt output for vectordb
             df_out = df_out.rename(columns={target: TableField.EMBEDDINGS.value})
-        df_out = df_out[[TableField.EMBEDDINGS.value]]
 
-        return df_out
+        return list(df_out[TableField.EMBEDDINGS.value])
 
     def _content_to_embeddings(self, content: str) -> List[float]:
         """
@@ -308,9 +441,38 @@ class KnowledgeBaseTable:
         :return: embeddings
         """
         df = pd.DataFrame([[content]], columns=[TableField.CONTENT.value])
-        res = self._df_to_embeddings(df)
+        res = self._df_to_embeddings(df, is_query=True)
         return res[TableField.EMBEDDINGS.value][0]
 
+    def warm_embeddings_cache(self, df: pd.DataFrame = None) -> int:
+        """
+        Fill cache of embeddings in advance
+        :param df: data to embed (the same as for insert). If it is not set, contents and embeddings which
+            are already stored in vector db are put to cache
+        :return: number of embeddings in cache
+        """
+        cache = self._get_embedding_cache()
+        if cache is None:
+            raise ValueError('Embeddings cache is disabled for the knowledge base')
+
+        if df is not None:
+            if not df.empty:
+                self._df_to_embeddings(self._adapt_column_names(df))
+            return cache.size()
+
+        query = Select(
+            targets=[Identifier(TableField.CONTENT.value), Identifier(TableField.EMBEDDINGS.value)],
+            from_table=Identifier(parts=[self._kb.vector_database_table])
+        )
+        stored = self._get_vector_db().query(query).data_frame
+        if stored is not None and not stored.empty:
+            cache.set_many({
+                content_hash(content): embedding
+                for content, embedding in zip(stored[TableField.CONTENT.value], stored[TableField.EMBEDDINGS.value])
+                if embedding is not None
+            })
+        return cache.size()
+
 
 class KnowledgeBaseController:
     """
@@ -487,6 +649,8 @@ class KnowledgeBaseController:
             except EntityNotExistsError:
                 pass
 
+        delete_kb_storage(kb.id)
+
         # kb exists
         db.session.delete(kb)
         db.session.commit()
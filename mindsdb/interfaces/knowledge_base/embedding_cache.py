@@ -0,0 +1,143 @@
+import json
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from mindsdb.interfaces.storage.fs import FileStorage
+from mindsdb.interfaces.knowledge_base.storage import SqliteFile, QUERY_CHUNK_SIZE
+
+CACHE_FILE_NAME = 'embeddings.sqlite'
+# max number of embeddings of queries which are kept in memory of process
+QUERY_CACHE_MAX_ENTRIES = 1000
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(str(content).encode()).hexdigest()
+
+
+class EmbeddingCache(SqliteFile):
+    """
+    Embeddings of contents, keyed by hash of content and id of embedding model.
+    Stored in sqlite file in the storage of knowledge base
+    """
+
+    def __init__(self, path: Path, model_id: int, storage: Optional[FileStorage] = None):
+        """
+        :param path: path to sqlite file
+        :param model_id: id of embedding model
+        :param storage: file storage which contains the file, it is synced after changes
+        """
+        super().__init__(path, storage)
+        self.model_id = model_id
+        with self._connect() as con:
+            con.execute(
+                'create table if not exists embeddings ('
+                'model_id integer, hash text, embedding text, primary key (model_id, hash))'
+            )
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Get embeddings by hashes of content
+        :param hashes: hashes of contents
+        :return: dict hash -> embedding, only for found hashes
+        """
+        hashes = list(set(hashes))
+        found = {}
+        with self._connect() as con:
+            for i in range(0, len(hashes), QUERY_CHUNK_SIZE):
+                chunk = hashes[i:i + QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = con.execute(
+                    f'select hash, embedding from embeddings where model_id = ? and hash in ({placeholders})',
+                    [self.model_id] + chunk
+                )
+                for key, embedding in rows:
+                    found[key] = json.loads(embedding)
+        return found
+
+    def set_many(self, embeddings: Dict[str, List[float]], sync: bool = True):
+        """
+        Store embeddings
+        :param embeddings: dict hash of content -> embedding
+        :param sync: push changes to the storage of knowledge base
+        """
+        rows = []
+        for key, embedding in embeddings.items():
+            if isinstance(embedding, str):
+                # not a vector
+                continue
+            try:
+                value = json.dumps([float(x) for x in embedding])
+            except (TypeError, ValueError):
+                continue
+            rows.append((self.model_id, key, value))
+        if len(rows) == 0:
+            return
+        with self._connect() as con:
+            con.executemany(
+                'insert or replace into embeddings (model_id, hash, embedding) values (?, ?, ?)',
+                rows
+            )
+        if sync:
+            self.push()
+
+    def clear(self):
+        """
+        Remove all embeddings, including ones of other models
+        """
+        with self._connect() as con:
+            con.execute('delete from embeddings')
+        self.push()
+
+    def size(self) -> int:
+        with self._connect() as con:
+            return con.execute(
+                'select count(*) from embeddings where model_id = ?', [self.model_id]
+            ).fetchone()[0]
+
+
+class QueryEmbeddingCache:
+    """
+    Embeddings of contents of queries, keyed by hash of content and id of embedding model.
+    Kept in memory of process: they are not written to the storage of knowledge base,
+    least recently used are dropped when max_entries is exceeded
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, model_id: int, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Get embeddings by hashes of content
+        :param model_id: id of embedding model
+        :param hashes: hashes of contents
+        :return: dict hash -> embedding, only for found hashes
+        """
+        found = {}
+        with self._lock:
+            for key in hashes:
+                embedding = self._entries.get((model_id, key))
+                if embedding is not None:
+                    self._entries.move_to_end((model_id, key))
+                    found[key] = embedding
+        return found
+
+    def set_many(self, model_id: int, embeddings: Dict[str, List[float]]):
+        """
+        Store embeddings
+        :param model_id: id of embedding model
+        :param embeddings: dict hash of content -> embedding
+        """
+        with self._lock:
+            for key, embedding in embeddings.items():
+                self._entries[(model_id, key)] = embedding
+                self._entries.move_to_end((model_id, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+query_embedding_cache = QueryEmbeddingCache()
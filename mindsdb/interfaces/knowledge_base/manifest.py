@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from mindsdb.interfaces.storage.fs import FileStorage
+from mindsdb.interfaces.knowledge_base.storage import SqliteFile, QUERY_CHUNK_SIZE
+
+MANIFEST_FILE_NAME = 'manifest.sqlite'
+
+
+class IngestionManifest(SqliteFile):
+    """
+    Hashes of rows which are stored in vector db of knowledge base, by id of row.
+    Is used to skip unchanged rows on insert without embedding them and querying vector db
+    """
+
+    def __init__(self, path: Path, storage: Optional[FileStorage] = None):
+        """
+        :param path: path to sqlite file
+        :param storage: file storage which contains the file
+        """
+        super().__init__(path, storage)
+        with self._connect() as con:
+            con.execute('create table if not exists manifest (id text primary key, hash integer)')
+
+    def get_changed(self, ids: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """
+        Find rows which are not stored yet or stored with other hash
+        :param ids: ids of rows
+        :param hashes: uint64 hashes of rows
+        :return: boolean mask of changed rows
+        """
+        ids = [str(x) for x in ids]
+        stored = {}
+        with self._connect() as con:
+            for i in range(0, len(ids), QUERY_CHUNK_SIZE):
+                chunk = ids[i:i + QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = con.execute(f'select id, hash from manifest where id in ({placeholders})', chunk)
+                stored.update(rows)
+
+        # sqlite stores signed integers
+        hashes = np.asarray(hashes, dtype=np.uint64).view(np.int64)
+        return np.array([stored.get(x) != int(h) for x, h in zip(ids, hashes)], dtype=bool)
+
+    def set_many(self, ids: np.ndarray, hashes: np.ndarray):
+        """
+        Remember hashes of stored rows
+        :param ids: ids of rows
+        :param hashes: uint64 hashes of rows
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64).view(np.int64)
+        with self._connect() as con:
+            con.executemany(
+                'insert or replace into manifest (id, hash) values (?, ?)',
+                [(str(x), int(h)) for x, h in zip(ids, hashes)]
+            )
+
+    def clear(self):
+        """
+        Forget all rows: next insert will send all of them to vector db
+        """
+        with self._connect() as con:
+            con.execute('delete from manifest')
+        self.push()
+
+    def size(self) -> int:
+        with self._connect() as con:
+            return con.execute('select count(*) from manifest').fetchone()[0]
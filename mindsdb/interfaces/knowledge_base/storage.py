@@ -0,0 +1,68 @@
+import sqlite3
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from mindsdb.interfaces.storage.fs import FileStorage, RESOURCE_GROUP
+
+# max number of parameters in one sqlite query
+QUERY_CHUNK_SIZE = 500
+
+
+class SqliteFile:
+    """
+    Base class for data of knowledge base which is stored in sqlite file in the storage of knowledge base
+    """
+
+    def __init__(self, path: Path, storage: Optional[FileStorage] = None):
+        """
+        :param path: path to sqlite file
+        :param storage: file storage which contains the file, it is synced by push
+        """
+        self.path = Path(path)
+        self.storage = storage
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        con = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with con:
+                # commit or rollback
+                yield con
+        finally:
+            con.close()
+
+    def push(self):
+        """
+        Save changes to the storage of knowledge base
+        """
+        if self.storage is not None:
+            self.storage.push()
+
+
+# folders of knowledge bases which were pulled by the process
+_pulled_storages = set()
+_pulled_storages_lock = threading.Lock()
+
+
+def get_kb_storage(kb_id: int, refresh: bool = False) -> FileStorage:
+    """
+    File storage of knowledge base, it is pulled on the first use in the process
+    :param kb_id: id of knowledge base
+    :param refresh: pull storage even if it was pulled before
+    :return: FileStorage
+    """
+    storage = FileStorage(resource_group=RESOURCE_GROUP.KNOWLEDGE_BASE, resource_id=kb_id)
+    with _pulled_storages_lock:
+        if refresh or storage.folder_name not in _pulled_storages:
+            storage.pull()
+            _pulled_storages.add(storage.folder_name)
+    return storage
+
+
+def delete_kb_storage(kb_id: int):
+    storage = FileStorage(resource_group=RESOURCE_GROUP.KNOWLEDGE_BASE, resource_id=kb_id, sync=False)
+    storage.delete()
+    with _pulled_storages_lock:
+        _pulled_storages.discard(storage.folder_name)
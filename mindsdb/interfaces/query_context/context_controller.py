@@ -206,8 +206,8 @@ class QueryContextController:
             context_stack = ctx.context_stack or []
         except AttributeError:
             context_stack = []
-        context_stack.append(self.gen_context_name(object_type, object_id))
-        ctx.context_stack = context_stack
+        # stack is not changed in place: it can be shared with copies of the context
+        ctx.context_stack = context_stack + [self.gen_context_name(object_type, object_id)]
 
     def release_context(self, object_type: str = None, object_id: int = None):
         """
@@ -221,8 +221,7 @@ class QueryContextController:
             return
         context_name = self.gen_context_name(object_type, object_id)
         if context_stack[-1] == context_name:
-            context_stack.pop()
-        ctx.context_stack = context_stack
+            ctx.context_stack = context_stack[:-1]
 
     def gen_context_name(self, object_type: str, object_id: int) -> str:
         """
@@ -7,6 +7,7 @@ from mindsdb_sql.parser.ast import Select, BinaryOperation, Identifier, Constant
 from mindsdb.integrations.libs.vectordatabase_handler import TableField
 from mindsdb.interfaces.storage import db
 from .sql_agent import SQLAgent
+from .tool_cache import ToolCallCache
 
 _DEFAULT_TOP_K_SIMILARITY_SEARCH = 5
 _DEFAULT_SQL_LLM_MODEL = 'gpt-3.5-turbo'
@@ -39,6 +40,7 @@ class SkillToolController:
         include_tables: Optional[List[str]] = None,
         ignore_tables: Optional[List[str]] = None,
         sample_rows_in_table_info: int = 3,
+        tool_cache: Optional[ToolCallCache] = None,
     ):
         return SQLAgent(
             self.get_command_executor(),
@@ -46,9 +48,10 @@ class SkillToolController:
             include_tables,
             ignore_tables,
             sample_rows_in_table_info,
+            tool_cache,
         )
 
-    def _make_text_to_sql_tools(self, skill: db.Skills, llm) -> dict:
+    def _make_text_to_sql_tools(self, skill: db.Skills, llm, tool_cache: Optional[ToolCallCache] = None) -> dict:
         '''
            Uses SQLAgent to execute tool
         '''
@@ -66,7 +69,8 @@ class SkillToolController:
             engine=self.get_command_executor(),
             database=database,
             metadata=self.get_command_executor().session.integration_controller,
-            include_tables=tables_to_include
+            include_tables=tables_to_include,
+            tool_cache=tool_cache
         )
         # Users probably don't need to configure this for now.
         sql_database_tools = SQLDatabaseToolkit(db=db, llm=llm).get_tools()
@@ -103,13 +107,11 @@ class SkillToolController:
             type=skill.type
         )
 
-    def _get_rag_query_function(self, skill: db.Skills):
+    def _get_rag_query_function(self, skill: db.Skills, tool_cache: Optional[ToolCallCache] = None):
 
         session_controller = self.get_command_executor().session
 
-        def _answer_question(question: str) -> str:
-            knowledge_base_name = skill.params['source']
-
+        def _query_knowledge_base(knowledge_base_name: str, question: str) -> str:
             # make select in KB table
             query = Select(
                 targets=[Star()],
@@ -123,24 +125,36 @@ class SkillToolController:
             res = kb_table.select_query(query)
             return '\n'.join(res.content)
 
+        def _answer_question(question: str) -> str:
+            knowledge_base_name = skill.params['source']
+            if tool_cache is None:
+                return _query_knowledge_base(knowledge_base_name, question)
+            # the same questions of agent are answered from cache
+            return tool_cache.get_kb_result(
+                knowledge_base_name,
+                question,
+                lambda: _query_knowledge_base(knowledge_base_name, question)
+            )
+
         return _answer_question
 
-    def _make_knowledge_base_tools(self, skill: db.Skills) -> dict:
+    def _make_knowledge_base_tools(self, skill: db.Skills, tool_cache: Optional[ToolCallCache] = None) -> dict:
         # To prevent dependency on Langchain unless an actual tool uses it.
         description = skill.params.get('description', '')
 
         return dict(
             name='Knowledge Base Retrieval',
-            func=self._get_rag_query_function(skill),
+            func=self._get_rag_query_function(skill, tool_cache),
             description=f'Use this tool to get more context or information to answer a question about {description}. The input should be the exact question the user is asking.',
             type=skill.type
         )
 
-    def get_tools_from_skill(self, skill: db.Skills, llm) -> dict:
+    def get_tools_from_skill(self, skill: db.Skills, llm, tool_cache: Optional[ToolCallCache] = None) -> dict:
         """
             Creates function for skill and metadata (name, description)
         Args:
             skill (Skills): Skill to make a tool from
+            tool_cache (ToolCallCache): cache of results of tool calls of the agent
 
         Returns:
             dict with keys: name, description, func
@@ -153,9 +167,9 @@ class SkillToolController:
                 f'skill of type {skill.type} is not supported as a tool, supported types are: {list(SkillType._member_names_)}')
 
         if skill_type == SkillType.TEXT2SQL or skill_type == SkillType.TEXT2SQL_LEGACY:
-            return self._make_text_to_sql_tools(skill, llm)
+            return self._make_text_to_sql_tools(skill, llm, tool_cache)
         if skill_type == SkillType.KNOWLEDGE_BASE:
-            return [self._make_knowledge_base_tools(skill)]
+            return [self._make_knowledge_base_tools(skill, tool_cache)]
         if skill_type == SkillType.RETRIEVAL:
             return [self._make_retrieval_tools(skill)]
 
@@ -2,9 +2,11 @@ from typing import Iterable, List, Optional
 
 import pandas as pd
 from mindsdb_sql import parse_sql, Identifier
+from mindsdb_sql.parser.ast import Select, Show
 from mindsdb_sql.planner.utils import query_traversal
 
-
+from mindsdb.interfaces.database.metadata_catalog import metadata_catalog
+from mindsdb.interfaces.skills.tool_cache import ToolCallCache
 from mindsdb.utilities import log
 
 logger = log.getLogger(__name__)
@@ -19,8 +21,10 @@ class SQLAgent:
             include_tables: Optional[List[str]] = None,
             ignore_tables: Optional[List[str]] = None,
             sample_rows_in_table_info: int = 3,
+            tool_cache: Optional[ToolCallCache] = None,
     ):
         self._database = database
+        self._tool_cache = tool_cache
         self._command_executor = command_executor
         self._integration_controller = command_executor.session.integration_controller
 
@@ -43,11 +47,27 @@ class SQLAgent:
         if database is None:
             database = self._database
 
-        ret = self._command_executor.execute_command(
-            ast_query,
-            database_name=database
-        )
-        return ret
+        def execute():
+            return self._command_executor.execute_command(
+                ast_query,
+                database_name=database
+            )
+
+        if self._tool_cache is None:
+            return execute()
+        # only reading queries can be answered from cache
+        if isinstance(ast_query, (Select, Show)):
+            return self._tool_cache.get_query_result(database, query, execute)
+        try:
+            return execute()
+        finally:
+            # data or tables could be changed: cached results are outdated
+            self._tool_cache.clear(['query', 'table_info'])
+
+    def _get_cached_table_info(self, key: tuple, fetch):
+        if self._tool_cache is None:
+            return fetch()
+        return self._tool_cache.get_table_info(key, fetch)
 
     def _check_tables(self, ast_query):
 
@@ -63,6 +83,12 @@ class SQLAgent:
         if self._tables_to_include:
             return self._tables_to_include
 
+        return self._get_cached_table_info(
+            ('usable_tables', self._database, tuple(self._tables_to_ignore)),
+            self._find_usable_table_names
+        )
+
+    def _find_usable_table_names(self) -> List[str]:
         ret = self._call_engine('show databases;')
         dbs = [lst[0] for lst in ret.data.to_lists() if lst[0] != 'information_schema']
         usable_tables = []
@@ -102,15 +128,22 @@ class SQLAgent:
         final_str = "\n\n".join(tables)
         return final_str
 
+    def _get_columns(self, integration: str, table_name: str) -> pd.DataFrame:
+        def fetch():
+            response = self._integration_controller.get_data_handler(integration).get_columns(table_name)
+            if response.data_frame is None:
+                raise Exception(f"Can't get columns of '{integration}.{table_name}': {response.error_message}")
+            return response.data_frame
+
+        return metadata_catalog.get_columns(integration, table_name, fetch)
+
     def get_table_columns(self, table_name: str) -> List[str]:
-        controller = self._integration_controller
-        cols_df = controller.get_data_handler(self._database).get_columns(table_name).data_frame
+        cols_df = self._get_columns(self._database, table_name)
         return cols_df['Field'].to_list()
 
     def _get_single_table_info(self, table_str: str) -> str:
-        controller = self._integration_controller
         integration, table_name = table_str.split('.')
-        cols_df = controller.get_data_handler(integration).get_columns(table_name).data_frame
+        cols_df = self._get_columns(integration, table_name)
         fields = cols_df['Field'].to_list()
         dtypes = cols_df['Type'].to_list()
 
@@ -125,8 +158,10 @@ class SQLAgent:
     def _get_sample_rows(self, table: str, fields: List[str]) -> str:
         command = f"select {','.join(fields)} from {table} limit {self._sample_rows_in_table_info};"
         try:
-            ret = self._call_engine(command)
-            sample_rows = ret.data.to_lists()
+            sample_rows = self._get_cached_table_info(
+                ('sample_rows', table, tuple(fields), self._sample_rows_in_table_info),
+                lambda: self._call_engine(command).data.to_lists()
+            )
             sample_rows = list(
                 map(lambda ls: [str(i) if len(str(i)) < 100 else str[:100] + '...' for i in ls], sample_rows))
             sample_rows_str = "\n" + "\n".join(["\t".join(row) for row in sample_rows])
@@ -0,0 +1,164 @@
+import threading
+from time import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
+
+
+def normalize_question(question: str) -> str:
+    """ question in the form used as key of cache: lowercase, without extra spaces and final punctuation
+    """
+    return ' '.join(str(question).lower().split()).rstrip('?!. ')
+
+
+class ToolCallCache:
+    """ Cache of results of tool calls of an agent.
+        Results are kept for the ttl of their kind, failed calls are not cached.
+        Least recently used results are dropped when max_entries is exceeded
+    """
+
+    def __init__(
+        self,
+        table_info_ttl: Optional[float] = None,
+        query_ttl: Optional[float] = None,
+        kb_ttl: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        """ init cache
+
+            Args:
+                table_info_ttl (float): time (in seconds) to keep tables info and sample rows, 0 to disable
+                query_ttl (float): time (in seconds) to reuse results of identical queries, 0 to disable
+                kb_ttl (float): time (in seconds) to keep results of knowledge base retrieval, 0 to disable
+                max_entries (int): max number of cached results
+        """
+        config = Config().get('agents_tool_cache') or {}
+        self.ttl = {
+            'table_info': table_info_ttl if table_info_ttl is not None else config.get('table_info_ttl', 300),
+            'query': query_ttl if query_ttl is not None else config.get('query_ttl', 30),
+            'kb': kb_ttl if kb_ttl is not None else config.get('kb_ttl', 300),
+        }
+        self.max_entries = max_entries if max_entries is not None else config.get('max_entries', 1000)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_table_info(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """ get information about tables: list of tables, description of a table, sample rows
+
+            Args:
+                key (Hashable): what is requested, for example ('sample_rows', table_name)
+                fetch (Callable): function that gets the information
+
+            Returns:
+                result of fetch
+        """
+        return self._get('table_info', key, fetch)
+
+    def get_query_result(self, database: str, query: str, fetch: Callable[[], Any]) -> Any:
+        """ get result of sql query, which was sent by tool
+
+            Args:
+                database (str): database in which query is executed
+                query (str): sql query
+                fetch (Callable): function that executes the query
+
+            Returns:
+                result of fetch
+        """
+        return self._get('query', (database, query.strip().rstrip(';').strip()), fetch)
+
+    def get_kb_result(self, knowledge_base: str, question: str, fetch: Callable[[], Any]) -> Any:
+        """ get result of retrieval from knowledge base, the same for questions which differ only in case and spaces
+
+            Args:
+                knowledge_base (str): name of knowledge base
+                question (str): question of agent
+                fetch (Callable): function that makes retrieval
+
+            Returns:
+                result of fetch
+        """
+        return self._get('kb', (knowledge_base, normalize_question(question)), fetch)
+
+    def clear(self, kinds: Optional[Iterable[str]] = None) -> None:
+        """ forget cached results
+
+            Args:
+                kinds (Iterable[str]): kinds of results to forget ('table_info', 'query', 'kb'), all if None
+        """
+        with self._lock:
+            if kinds is None:
+                self._entries.clear()
+                return
+            kinds = set(kinds)
+            for key in [key for key in self._entries if key[0] in kinds]:
+                del self._entries[key]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _get(self, kind: str, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        ttl = self.ttl[kind]
+        if ttl <= 0:
+            return fetch()
+
+        key = (kind, key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time() - entry[1] < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = fetch()
+        with self._lock:
+            self._entries[key] = (value, time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+
+# caches of agents, least recently used are dropped when 'max_agents' is exceeded
+_agents_caches = OrderedDict()
+_agents_caches_lock = threading.Lock()
+
+
+def get_agent_tool_cache(agent_id: Optional[int]) -> Optional[ToolCallCache]:
+    """ get cache of tool calls of the agent
+
+        Args:
+            agent_id (int): id of agent
+
+        Returns:
+            ToolCallCache: cache of the agent, None if agent is not known
+    """
+    if agent_id is None:
+        return None
+    key = (ctx.company_id, agent_id)
+    max_agents = (Config().get('agents_tool_cache') or {}).get('max_agents', 100)
+    with _agents_caches_lock:
+        cache = _agents_caches.get(key)
+        if cache is None:
+            cache = ToolCallCache()
+            _agents_caches[key] = cache
+        _agents_caches.move_to_end(key)
+        while len(_agents_caches) > max_agents:
+            _agents_caches.popitem(last=False)
+        return cache
+
+
+def drop_agent_tool_cache(agent_id: int) -> None:
+    """ forget results of tool calls of the agent
+
+        Args:
+            agent_id (int): id of agent
+    """
+    with _agents_caches_lock:
+        _agents_caches.pop((ctx.company_id, agent_id), None)
@@ -2,7 +2,7 @@ from http import HTTPStatus
 import functools
 import time
 
-from prometheus_client import Histogram, Summary
+from prometheus_client import Counter, Gauge, Histogram, Summary
 
 
 INTEGRATION_HANDLER_QUERY_TIME = Summary(
@@ -17,6 +17,30 @@ INTEGRATION_HANDLER_RESPONSE_SIZE = Summary(
     ('integration', 'response_type')
 )
 
+ML_TASKS_QUEUE_DEPTH = Gauge(
+    'mindsdb_ml_tasks_queue_depth',
+    'How many ML tasks are waiting for a free ML process',
+    ('engine',)
+)
+
+ML_PROCESS_AFFINITY = Counter(
+    'mindsdb_ml_process_affinity',
+    'How many predict tasks were executed in a process with the model already loaded (hit) or not (miss)',
+    ('engine', 'result')
+)
+
+INTEGRATION_HANDLERS_POOL_SIZE = Gauge(
+    'mindsdb_integration_handlers_pool_size',
+    'How many connected data handlers are in the pool of integration, by state (idle or in_use)',
+    ('integration', 'state')
+)
+
+INTEGRATION_HANDLERS_POOL_ACQUIRE = Counter(
+    'mindsdb_integration_handlers_pool_acquire',
+    'How many handlers were taken from the pool of integration, by result (reused, created or timeout)',
+    ('integration', 'result')
+)
+
 _REST_API_LATENCY = Histogram(
     'mindsdb_rest_api_latency_seconds',
     'How long REST API requests take to complete, grouped by method, endpoint, and status',
@@ -20,6 +20,10 @@ Configuration:
 
 - max_size size of cache in count of records, default is 50
 - serializer, module for serialization, default is dill
+- max_bytes size of in-memory tier in bytes, default is 100Mb, 0 to disable it.
+  Deserialized values are kept in memory of the process (shared by all categories),
+  so hot records are served without reading and deserialization of file or value from redis.
+  A value in memory is used only while the record in file/redis is not changed
 
 It can be set via:
 - get_cache function:
@@ -53,12 +57,17 @@ How to test:
 """
 
 import os
+import copy
+import pickle
+import threading
 import time
 from abc import ABC
+from collections import OrderedDict
 from pathlib import Path
 import hashlib
 import typing as t
 
+import numpy as np
 import pandas as pd
 import walrus
 
@@ -68,11 +77,30 @@ from mindsdb.interfaces.storage.fs import FileLock
 from mindsdb.utilities.context import context as ctx
 
 
-def dataframe_checksum(df: pd.DataFrame):
+def dataframe_row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized hashes of rows of dataframe. Names of columns are not taken into account
+
+    Args:
+        df (pd.DataFrame): input dataframe
+
+    Returns:
+        np.ndarray: uint64 hash for every row
+    """
+    df = df.set_axis(range(len(df.columns)), axis=1)
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # columns with unhashable values (lists, dicts) are hashed by string representation
+        object_columns = df.columns[df.dtypes == object]
+        df = df.astype({col: str for col in object_columns})
+        hashes = pd.util.hash_pandas_object(df, index=False)
+    return hashes.to_numpy()
 
-    return str_checksum(str(
-        df.set_axis(range(len(df.columns)), axis=1).to_records(index=False)
-    ))
+
+def dataframe_checksum(df: pd.DataFrame):
+    checksum = hashlib.sha256(len(df.columns).to_bytes(8, 'little'))
+    checksum.update(dataframe_row_hashes(df).tobytes())
+    return checksum.hexdigest()
 
 
 def json_checksum(obj: t.Union[dict, list]):
@@ -85,12 +113,95 @@ def str_checksum(obj: str):
     return checksum
 
 
+class MemoryCache:
+    """
+    Thread-safe LRU of deserialized values of all caches of the process, limited by total size of
+    their serialized form in bytes. Every value is kept with version of its record in the backing
+    storage (file or redis) and is returned only if the record has the same version
+    """
+
+    def __init__(self, max_bytes: t.Optional[int] = None):
+        """
+        :param max_bytes: max total size of values, if None it is taken from 'cache.max_bytes' of config
+        """
+        self._max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            self._max_bytes = Config()["cache"].get("max_bytes", 0)
+        return self._max_bytes
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: str, version: t.Hashable) -> t.Any:
+        """
+        :param key: key of value
+        :param version: current version of the record in the backing storage
+        :return: copy of value or None if there is no value of this version
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] != version:
+                self._pop(key)
+                return None
+            self._items.move_to_end(key)
+        return copy.deepcopy(item[1])
+
+    def set(self, key: str, value: t.Any, size: int, version: t.Hashable):
+        """
+        :param key: key of value
+        :param value: deserialized value, a copy of it is stored
+        :param size: size of serialized value in bytes
+        :param version: version of the record in the backing storage
+        """
+        max_bytes = self.max_bytes
+        if size > max_bytes:
+            self.delete(key)
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._pop(key)
+            self._items[key] = (version, value, size)
+            self._size += size
+            while self._size > max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= evicted[2]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def _pop(self, key: str):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._size -= item[2]
+
+
+# in-memory tier of all caches of the process
+memory_cache = MemoryCache()
+
+
 class BaseCache(ABC):
-    def __init__(self, max_size=None, serializer=None):
+    def __init__(self, max_size=None, serializer=None, use_memory=True):
         self.config = Config()
         if max_size is None:
             max_size = self.config["cache"].get("max_size", 50)
         self.max_size = max_size
+        # values are also kept in the in-memory tier of the process
+        self.use_memory = use_memory
         if serializer is None:
             serializer_module = self.config["cache"].get('serializer')
             if serializer_module == 'pickle':
@@ -113,6 +224,15 @@ class BaseCache(ABC):
     def deserialize(self, value):
         return self.serializer.loads(value)
 
+    def memory_get(self, key: str, version: t.Hashable) -> t.Any:
+        if not self.use_memory or version is None:
+            return None
+        return memory_cache.get(key, version)
+
+    def memory_set(self, key: str, value: t.Any, size: int, version: t.Hashable):
+        if self.use_memory and version is not None:
+            memory_cache.set(key, value, size, version)
+
 
 class FileCache(BaseCache):
     def __init__(self, category, path=None, **kwargs):
@@ -151,43 +271,71 @@ class FileCache(BaseCache):
     def file_path(self, name):
         return self.path / name
 
-    def set_df(self, name, df):
-        path = self.file_path(name)
-        df.to_pickle(path)
-        self.clear_old_cache()
+    @staticmethod
+    def _file_version(path) -> t.Optional[tuple]:
+        # file is replaced by any process on write: version is its inode, modification time and size
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
 
-    def set(self, name, value):
+    def _write(self, name, value, data: bytes):
         path = self.file_path(name)
-        value = self.serialize(value)
-
-        with open(path, 'wb') as fd:
-            fd.write(value)
+        tmp_path = self.path / f'.{name}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as fd:
+                fd.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            # not finished file is not left in the cache folder
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self.memory_set(str(path), value, len(data), self._file_version(path))
         self.clear_old_cache()
 
-    def get_df(self, name):
-        path = self.file_path(name)
-        with FileLock(self.path):
-            if not os.path.exists(path):
-                return None
-            value = pd.read_pickle(path)
-        return value
-
-    def get(self, name):
+    def _read(self, name, loads: t.Callable[[bytes], t.Any]) -> t.Any:
         path = self.file_path(name)
+        version = self._file_version(path)
+        if version is None:
+            memory_cache.delete(str(path))
+            return None
+        value = self.memory_get(str(path), version)
+        if value is not None:
+            return value
 
         with FileLock(self.path):
-            if not os.path.exists(path):
+            version = self._file_version(path)
+            if version is None:
                 return None
             with open(path, 'rb') as fd:
-                value = fd.read()
-        value = self.deserialize(value)
+                data = fd.read()
+        value = loads(data)
+        self.memory_set(str(path), value, len(data), version)
         return value
 
+    def set_df(self, name, df):
+        # the same format as df.to_pickle
+        self._write(name, df, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def set(self, name, value):
+        self._write(name, value, self.serialize(value))
+
+    def get_df(self, name):
+        return self._read(name, pickle.loads)
+
+    def get(self, name):
+        return self._read(name, self.deserialize)
+
     def delete(self, name):
         path = self.file_path(name)
         self.delete_file(path)
 
     def delete_file(self, path):
+        memory_cache.delete(str(path))
         os.unlink(path)
 
 
@@ -230,21 +378,29 @@ class RedisCache(BaseCache):
 
     def set(self, name, value):
         key = self.redis_key(name)
-        value = self.serialize(value)
+        data = self.serialize(value)
 
-        self.client.set(key, value)
-        # using key with category name to store all keys with modify time
-        self.client.hset(self.category, key, int(time.time() * 1000))
+        # time of modification of the key is also version of the value in memory tier of processes
+        version = str(int(time.time() * 1000)).encode()
+        self.client.set(key, data)
+        self.client.hset(self.category, key, version)
+        self.memory_set(f'redis:{key}', value, len(data), version)
 
         self.clear_old_cache(key)
 
     def get(self, name):
         key = self.redis_key(name)
-        value = self.client.get(key)
-        if value is None:
+        version = self.client.hget(self.category, key)
+        value = self.memory_get(f'redis:{key}', version)
+        if value is not None:
+            return value
+        data = self.client.get(key)
+        if data is None:
             # no value in cache
             return None
-        return self.deserialize(value)
+        value = self.deserialize(data)
+        self.memory_set(f'redis:{key}', value, len(data), version)
+        return value
 
     def delete(self, name):
         key = self.redis_key(name)
@@ -252,6 +408,9 @@ class RedisCache(BaseCache):
         self.delete_key(key)
 
     def delete_key(self, key):
+        if isinstance(key, bytes):
+            key = key.decode()
+        memory_cache.delete(f'redis:{key}')
         self.client.delete(key)
         self.client.hdel(self.category, key)
 
@@ -146,7 +146,9 @@ class Config():
                     "password": "",
                     "port": "47335",
                     "database": "mindsdb",
-                    "ssl": True
+                    "ssl": True,
+                    # send rows to client by chunks as soon as they are fetched from integration
+                    "stream_results": False
                 },
                 "mongodb": {
                     "host": api_host,
@@ -160,9 +162,90 @@ class Config():
                 }
             },
             "cache": {
-                "type": "local"
+                "type": "local",
+                # size of in-memory tier of cache in bytes (0 to disable)
+                "max_bytes": 104857600
             },
-            'ml_task_queue': ml_queue
+            "executor": {
+                # storage of intermediate results of query steps: 'pandas' or 'arrow'
+                "result_set_storage": "pandas",
+                # size of chunks for streaming results
+                "stream_chunk_size": 10000,
+                # streamed result of prepared statement which is not fetched by client for that time (in seconds)
+                #   is read to memory, it releases connection to integration (0 to disable)
+                "stream_idle_timeout": 30,
+                # join: max size of the left table to filter the right table by its keys (0 to disable)
+                "semi_join_max_keys": 10000,
+                # join: max number of keys in one filter of the right table
+                "semi_join_batch_size": 1000,
+                # max number of parallel queries to integrations in MapReduceStep
+                "map_reduce_max_workers": 8,
+                # max number of parsed queries and query plans in caches (0 to disable)
+                "parse_cache_size": 1000,
+                "plan_cache_size": 500,
+                # time to live of cached query plans, in seconds
+                "plan_cache_ttl": 60,
+                # max number of rows with cached predictions per model (row-level prediction cache)
+                "prediction_cache_max_rows": 100000,
+                # max number of rows in one insert to integration (INSERT ... SELECT, CREATE TABLE ... SELECT),
+                #   batches are committed separately: insert is not atomic
+                "insert_batch_size": 10000
+            },
+            'ml_task_queue': ml_queue,
+            "ml_process_cache": {
+                # max number of processes of one ML engine, next tasks wait for a free process
+                "max_processes": {
+                    "default": 8
+                },
+                # number of processes which are kept alive for ML engine, e.g. {"lightwood": 1}
+                "keep_alive": {},
+                # number of the most used models which are loaded in advance to idle processes
+                "prewarm_models": 2
+            },
+            "predict_batching": {
+                # coalesce concurrent predictions of the same model into one task
+                "enabled": False,
+                # time (in milliseconds) while the first request of batch waits for others
+                "window_ms": 20,
+                # max number of rows in a batch, larger requests are not batched
+                "max_rows": 10000
+            },
+            "data_handlers_pool": {
+                # max number of connected handlers of one integration, shared by all threads of process
+                "max_size": 10,
+                # time (in seconds) to wait for a free handler if all of them are in use
+                "acquire_timeout": 60,
+                # idle handlers are disconnected after that time (in seconds)
+                "max_idle": 60,
+                # handlers are reconnected after that time (in seconds) from creation
+                "max_lifetime": 3600,
+                # connection of handler is checked if it was idle longer that time (in seconds)
+                "health_check_after": 30
+            },
+            "metadata_cache": {
+                # lists of tables and columns of integrations are cached for that time (in seconds), 0 to disable
+                "ttl": 60,
+                # older lists are still returned (and updated in background) during that time (in seconds)
+                "max_stale": 3600,
+                # time (in seconds) to wait for lists of tables of integrations, slower ones are skipped
+                "fetch_timeout": 10
+            },
+            "handlers": {
+                # import handlers on first use instead of start, set False to import all of them on start
+                "lazy_load": True
+            },
+            "agents_tool_cache": {
+                # tables info with sample rows are cached for that time (in seconds), 0 to disable
+                "table_info_ttl": 300,
+                # results of identical sql queries of tools are reused during that time (in seconds)
+                "query_ttl": 30,
+                # results of knowledge base retrieval are cached for that time (in seconds)
+                "kb_ttl": 300,
+                # max number of cached results of an agent
+                "max_entries": 1000,
+                # max number of agents which results are cached, least recently used are dropped
+                "max_agents": 100
+            }
         }
 
         return _merge_configs(self._default_config, self._override_config)
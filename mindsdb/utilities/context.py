@@ -1,11 +1,23 @@
-
 from contextvars import ContextVar
 from typing import Any
 from copy import deepcopy
 
 
+def _default_profiling() -> dict:
+    return {
+        'level': 0,
+        'enabled': False,
+        'pointer': None,
+        'tree': None
+    }
+
+
 class Context:
     ''' Thread independent storage
+
+        Storage dict is never changed in place: setting of attribute replaces it with a shallow copy.
+        Contexts copied to other threads (by contextvars) keep the previous version of storage,
+        so setting of attribute does not depend on size of values in it.
     '''
     __slots__ = ('_storage',)
 
@@ -17,12 +29,7 @@ class Context:
         self._storage.set({
             'company_id': None,
             'user_class': 0,
-            'profiling': {
-                'level': 0,
-                'enabled': False,
-                'pointer': None,
-                'tree': None
-            }
+            'profiling': _default_profiling()
         })
 
     def __getattr__(self, name: str) -> Any:
@@ -32,22 +39,30 @@ class Context:
         return storage[name]
 
     def __setattr__(self, name: str, value: Any) -> None:
-        storage = deepcopy(self._storage.get({}))
+        storage = dict(self._storage.get({}))
         storage[name] = value
         self._storage.set(storage)
 
     def __delattr__(self, name: str) -> None:
-        storage = deepcopy(self._storage.get({}))
+        storage = dict(self._storage.get({}))
         if name not in storage:
             raise AttributeError(name)
-        del storage['name']
+        del storage[name]
         self._storage.set(storage)
 
     def dump(self) -> dict:
-        storage = deepcopy(self._storage.get({}))
+        ''' Snapshot of the context to pass it to another thread or process.
+            Profiling data is not included: it is collected and sent by the current thread
+        '''
+        storage = dict(self._storage.get({}))
+        if 'profiling' in storage:
+            storage['profiling'] = _default_profiling()
         return storage
 
     def load(self, storage: dict) -> None:
+        storage = dict(storage)
+        # profiling is changed in place, every load gets its own copy
+        storage['profiling'] = deepcopy(storage.get('profiling', _default_profiling()))
         self._storage.set(storage)
 
 
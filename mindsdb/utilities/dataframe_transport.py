@@ -0,0 +1,203 @@
+"""
+Transport of dataframes between processes.
+
+Dataframes which are stored in redis are serialized to Arrow IPC stream (split into record batches) if their
+columns can be restored without changes of types, otherwise pickle is used.
+
+Large dataframes are passed to ML processes through shared memory: only a small picklable handle is sent
+via pipe of the process pool.
+
+How to use it:
+
+    # sender
+    obj = pack_dataframe(df)   # DataFrame or SharedDataFrame
+    ... send obj to other process ...
+
+    # receiver
+    df = unpack_dataframe(obj, unlink=True)
+"""
+import pickle
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+ARROW_FORMAT = b'A'
+PICKLE_FORMAT = b'P'
+
+# dataframes with smaller size (in bytes) are sent as is
+MIN_SHARED_SIZE = 1 << 20
+
+# max number of rows in one record batch of arrow stream
+ARROW_BATCH_SIZE = 65536
+
+
+def _to_arrow(df: pd.DataFrame) -> Optional['pa.Table']:
+    # returns None if dataframe can't be restored from arrow with the same types
+    if pa is None:
+        return None
+    if df.columns.has_duplicates or not all(isinstance(name, str) for name in df.columns):
+        return None
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+    for name, dtype in df.dtypes.items():
+        if dtype != object:
+            continue
+        # object columns of ints, lists, etc would be converted to other types
+        arrow_type = table.schema.field(name).type
+        if not (
+            pa.types.is_string(arrow_type)
+            or pa.types.is_large_string(arrow_type)
+            or pa.types.is_date(arrow_type)
+            or pa.types.is_null(arrow_type)
+        ):
+            return None
+    return table
+
+
+def dataframe_to_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize dataframe to Arrow IPC stream or pickle
+
+    Args:
+        df (pd.DataFrame): dataframe
+
+    Returns:
+        bytes: format marker + content
+    """
+    table = _to_arrow(df)
+    if table is None:
+        return PICKLE_FORMAT + pickle.dumps(df, protocol=5)
+
+    sink = pa.BufferOutputStream()
+    sink.write(ARROW_FORMAT)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=ARROW_BATCH_SIZE)
+    return sink.getvalue().to_pybytes()
+
+
+def dataframe_from_bytes(data: bytes) -> pd.DataFrame:
+    """Restore dataframe serialized by dataframe_to_bytes
+
+    Args:
+        data (bytes): serialized dataframe. Plain pickle is also accepted
+
+    Returns:
+        pd.DataFrame
+    """
+    view = memoryview(data)
+    marker = bytes(view[:1])
+    if marker == ARROW_FORMAT:
+        with pa.ipc.open_stream(pa.py_buffer(view[1:])) as reader:
+            return reader.read_all().to_pandas()
+    if marker == PICKLE_FORMAT:
+        return pickle.loads(view[1:])
+    # sent by previous version
+    return pickle.loads(data)
+
+
+def _open_shared_memory(name: str = None, size: int = 0) -> shared_memory.SharedMemory:
+    # lifetime of blocks is controlled by SharedDataFrame.unlink, blocks must not be removed by
+    # resource tracker of the process which created or attached them
+    shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+class SharedDataFrame:
+    """Picklable handle of dataframe which is placed to shared memory.
+
+    Dataframe is pickled with protocol 5: data of numpy blocks is copied to shared memory
+    as out-of-band buffers, without serialization. Shared memory block exists until unlink
+    is called, it has to be done by the side which knows that the dataframe is not needed anymore.
+    """
+
+    def __init__(self, name: str, sizes: List[int]):
+        self.name = name
+        # sizes of the pickled stream and out-of-band buffers, placed one after another
+        self.sizes = sizes
+
+    @staticmethod
+    def create(df: pd.DataFrame) -> 'SharedDataFrame':
+        buffers = []
+        data = pickle.dumps(df, protocol=5, buffer_callback=buffers.append)
+        parts = [memoryview(data)] + [buffer.raw() for buffer in buffers]
+        sizes = [part.nbytes for part in parts]
+
+        shm = _open_shared_memory(size=max(sum(sizes), 1))
+        try:
+            offset = 0
+            for part in parts:
+                shm.buf[offset:offset + part.nbytes] = part.cast('B')
+                offset += part.nbytes
+        finally:
+            shm.close()
+        return SharedDataFrame(shm.name, sizes)
+
+    def load(self) -> pd.DataFrame:
+        shm = _open_shared_memory(self.name)
+        try:
+            # content is copied: dataframe must not reference the shared memory after it is released
+            parts = []
+            offset = 0
+            for size in self.sizes:
+                parts.append(bytearray(shm.buf[offset:offset + size]))
+                offset += size
+        finally:
+            shm.close()
+        return pickle.loads(parts[0], buffers=parts[1:])
+
+    def unlink(self):
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        # also unregisters the block in resource tracker
+        shm.unlink()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name}, {sum(self.sizes)} bytes)'
+
+
+def pack_dataframe(df: Optional[pd.DataFrame]) -> Union[pd.DataFrame, SharedDataFrame, None]:
+    """Put large dataframe to shared memory
+
+    Args:
+        df (pd.DataFrame): dataframe to send to another process
+
+    Returns:
+        pd.DataFrame | SharedDataFrame: dataframe as is if it is small, else handle of shared memory
+    """
+    if not isinstance(df, pd.DataFrame):
+        return df
+    if df.memory_usage(index=False).sum() < MIN_SHARED_SIZE:
+        return df
+    return SharedDataFrame.create(df)
+
+
+def unpack_dataframe(obj, unlink: bool = False):
+    """Get dataframe back from result of pack_dataframe
+
+    Args:
+        obj (pd.DataFrame | SharedDataFrame): result of pack_dataframe, other objects are returned as is
+        unlink (bool): release shared memory after reading
+
+    Returns:
+        pd.DataFrame
+    """
+    if not isinstance(obj, SharedDataFrame):
+        return obj
+    try:
+        return obj.load()
+    finally:
+        if unlink:
+            obj.unlink()
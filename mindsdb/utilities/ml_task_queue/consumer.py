@@ -14,6 +14,7 @@ from redis.exceptions import ConnectionError as RedisConnectionError
 
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.dataframe_transport import dataframe_to_bytes, dataframe_from_bytes
 from mindsdb.integrations.libs.process_cache import process_cache
 from mindsdb.utilities.ml_task_queue.utils import RedisKey, StatusNotifier, to_bytes, from_bytes
 from mindsdb.utilities.ml_task_queue.base import BaseRedisQueue
@@ -177,7 +178,7 @@ class MLTaskConsumer(BaseRedisQueue):
             dataframe_bytes = self.cache.get(redis_key.dataframe)
             dataframe = None
             if dataframe_bytes is not None:
-                dataframe = from_bytes(dataframe_bytes)
+                dataframe = dataframe_from_bytes(dataframe_bytes)
                 self.cache.delete(redis_key.dataframe)
             # endregion
 
@@ -206,7 +207,7 @@ class MLTaskConsumer(BaseRedisQueue):
             self.wait_redis_ping()
             status_notifier.stop()
             if isinstance(result, DataFrame):
-                dataframe_bytes = to_bytes(result)
+                dataframe_bytes = dataframe_to_bytes(result)
                 self.cache.set(redis_key.dataframe, dataframe_bytes, 10)
             self.db.publish(redis_key.status, ML_TASK_STATUS.COMPLETE.value)
             self.cache.set(redis_key.status, ML_TASK_STATUS.COMPLETE.value, 180)
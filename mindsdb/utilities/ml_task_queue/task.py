@@ -3,6 +3,7 @@ from collections.abc import Callable
 import redis
 from pandas import DataFrame
 
+from mindsdb.utilities.dataframe_transport import dataframe_from_bytes
 from mindsdb.utilities.ml_task_queue.utils import RedisKey, from_bytes
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_STATUS
 
@@ -38,7 +39,7 @@ class Task:
             if ml_task_status == ML_TASK_STATUS.COMPLETE:
                 dataframe_bytes = cache.get(self.redis_key.dataframe)
                 if dataframe_bytes is not None:
-                    self.dataframe = from_bytes(dataframe_bytes)
+                    self.dataframe = dataframe_from_bytes(dataframe_bytes)
                 cache.delete(self.redis_key.dataframe)
             elif ml_task_status == ML_TASK_STATUS.ERROR:
                 exception_bytes = cache.get(self.redis_key.exception)
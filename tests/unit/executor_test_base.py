@@ -28,8 +28,10 @@ def unload_module(path):
         if module_name.startswith(path + ".") or module_name == path:
             to_remove.append(module_name)
     to_remove.sort(reverse=True)
+    removed = {}
     for module_name in to_remove:
-        sys.modules.pop(module_name)
+        removed[module_name] = sys.modules.pop(module_name)
+    return removed
 
 
 class BaseUnitTest:
@@ -40,7 +42,7 @@ class BaseUnitTest:
     @staticmethod
     def setup_class(cls):
         # remove imports of mindsdb in previous tests
-        unload_module("mindsdb")
+        cls._unloaded_modules = unload_module("mindsdb")
 
         # database temp file
         cls.db_file = tempfile.mkstemp(prefix="mindsdb_db_")[1]
@@ -87,8 +89,10 @@ class BaseUnitTest:
         # remove environ for next tests
         del os.environ["MINDSDB_DB_CON"]
 
-        # remove import of mindsdb for next tests
+        # remove import of mindsdb for next tests and return modules imported before:
+        # module level imports in other tests refer to them
         unload_module("mindsdb")
+        sys.modules.update(cls._unloaded_modules)
 
     def setup_method(self):
         self._dummy_db_path = os.path.join(tempfile.mkdtemp(), '_mindsdb_duck_db')
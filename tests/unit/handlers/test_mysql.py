@@ -72,6 +72,29 @@ class TestMySQLHandler(unittest.TestCase):
         assert isinstance(data, Response)
         self.assertFalse(data.error_code)
 
+    def test_insert_with_params(self):
+        from mindsdb_sql.parser.ast import Insert, Identifier
+
+        mock_conn = MagicMock()
+        mock_cursor = CursorContextManager(with_rows=False)
+
+        self.handler.connect = MagicMock(return_value=mock_conn)
+        mock_conn.cursor = MagicMock(return_value=mock_cursor)
+
+        query = Insert(
+            table=Identifier('tbl'),
+            columns=[Identifier('a'), Identifier('b')],
+            values=[[1, 'x'], [2, "y'"]],
+            is_plain=True
+        )
+        self.handler.query(query)
+
+        # values are not rendered into the query
+        query_str, params = mock_cursor.executemany.call_args[0]
+        self.assertEqual(query_str.replace('\n', ' '), 'INSERT INTO tbl (a, b) VALUES (%s, %s)')
+        self.assertEqual(params, [[1, 'x'], [2, "y'"]])
+        mock_cursor.execute.assert_not_called()
+
     def test_get_columns(self):
         self.handler.native_query = MagicMock()
 
@@ -3,6 +3,7 @@ import psycopg
 from psycopg.pq import ExecStatus
 from unittest.mock import patch, MagicMock, Mock
 from collections import OrderedDict
+from mindsdb_sql import parse_sql
 from mindsdb.integrations.handlers.postgres_handler.postgres_handler import PostgresHandler
 from mindsdb.integrations.libs.response import (
     HandlerResponse as Response,
@@ -93,6 +94,28 @@ class TestPostgresHandler(unittest.TestCase):
         assert isinstance(data, Response)
         self.assertFalse(data.error_code)
 
+    def test_query_stream(self):
+        """
+        Tests the `query_stream` method to ensure it fetches data from a named (server-side) cursor by chunks
+        """
+        mock_conn = MagicMock()
+        mock_cursor = CursorContextManager()
+
+        self.handler.connect = MagicMock(return_value=mock_conn)
+        mock_conn.cursor = MagicMock(return_value=mock_cursor)
+
+        column = Mock(type_code=None)
+        column.name = 'a'
+        mock_cursor.description = [column]
+        mock_cursor.fetchmany.side_effect = [[[1], [2]], [[3], [4]], [[5]]]
+
+        query = parse_sql('SELECT a FROM table1', dialect='mindsdb')
+        chunks = list(self.handler.query_stream(query, fetch_size=2))
+
+        self.assertEqual([chunk['a'].tolist() for chunk in chunks], [[1, 2], [3, 4], [5]])
+        self.assertIsNotNone(mock_conn.cursor.call_args.kwargs.get('name'))
+        mock_conn.commit.assert_called_once()
+
     def test_get_columns(self):
         """
         Checks if the `get_columns` method correctly constructs the SQL query and if it calls `native_query` with the correct query.
@@ -1,3 +1,5 @@
+import httpx
+import openai
 import pandas
 import unittest
 from collections import OrderedDict
@@ -339,6 +341,47 @@ class TestOpenAI(unittest.TestCase):
 
         pandas.testing.assert_frame_equal(result, pandas.DataFrame({'answer': ['Sweden']}))
 
+    @patch('mindsdb.integrations.handlers.openai_handler.openai_handler.OpenAI')
+    def test_predict_with_completion_model_splits_prompts_by_max_batch_size_of_account(self, mock_openai_handler_openai_client):
+        """
+        Test if prompts are sent in smaller batches when OpenAI API reports the max batch size of the account.
+        """
+
+        # Mock the json_get method of the model storage
+        self.handler.model_storage.json_get.return_value = {
+            'target': 'answer',
+            'mode': 'default',
+            'model_name': 'babbage-002',
+            'question_column': 'question'
+        }
+
+        batches = []
+
+        def create(prompt, **kwargs):
+            batches.append(len(prompt))
+            if len(prompt) > 2:
+                raise openai.BadRequestError(
+                    'Too many inputs. The max number of inputs is 2, you can currently request up to at most a total of 2).',  # noqa
+                    response=httpx.Response(400, request=httpx.Request('POST', 'https://api.openai.com/v1/completions')),
+                    body=None
+                )
+            return MagicMock(choices=[MagicMock(text=f'answer to {p}') for p in prompt])
+
+        # Mock the completions.create method of the OpenAI client
+        mock_openai_client = MagicMock()
+        mock_openai_client.completions.create.side_effect = create
+
+        mock_openai_handler_openai_client.return_value = mock_openai_client
+
+        questions = [f'question {i}' for i in range(5)]
+        self.handler.max_batch_size = 20
+        result = self.handler.predict(pandas.DataFrame({'question': questions}), args={})
+
+        # batches are sent in parallel
+        self.assertEqual(batches[0], 5)
+        self.assertEqual(sorted(batches[1:]), [1, 2, 2])
+        pandas.testing.assert_frame_equal(result, pandas.DataFrame({'answer': [f'answer to {q}' for q in questions]}))
+
     @patch('mindsdb.integrations.handlers.openai_handler.openai_handler.OpenAI')
     def test_predict_in_default_mode_with_prompt_template_and_completion_model_using_valid_arguments_and_data_runs_no_errors(self, mock_openai_handler_openai_client):
         """
@@ -7,10 +7,11 @@ import warnings
 import tempfile
 import json
 import os
+from unittest.mock import patch
 
 import pandas as pd
 
-from mindsdb.utilities.cache import get_cache, RedisCache, FileCache, dataframe_checksum
+from mindsdb.utilities.cache import get_cache, RedisCache, FileCache, MemoryCache, dataframe_checksum
 
 
 class TestCashe(unittest.TestCase):
@@ -41,6 +42,52 @@ class TestCashe(unittest.TestCase):
 
         self.cache_test(cache)
 
+    def test_file_failed_write(self):
+        cache = FileCache('predict_failed_write')
+        # file can't be replaced by directory
+        os.makedirs(cache.file_path('dir'), exist_ok=True)
+        with self.assertRaises(OSError):
+            cache.set('dir', 1)
+        # temporary file is removed
+        assert not any(name.endswith('.tmp') for name in os.listdir(cache.path))
+
+    def test_memory_tier(self):
+        memory = MemoryCache(max_bytes=100)
+        memory.set('a', 'a', size=40, version=1)
+        memory.set('b', 'b', size=40, version=1)
+        assert memory.get('a', version=1) == 'a'
+        # 'b' is the least recently used
+        memory.set('c', 'c', size=40, version=1)
+        assert memory.get('b', version=1) is None
+        assert memory.size == 80
+        # too big value is not stored
+        memory.set('a', 'a', size=200, version=1)
+        assert memory.get('a', version=1) is None
+        assert memory.size == 40
+        # value of other version is dropped
+        assert memory.get('c', version=2) is None
+        assert memory.size == 0
+
+        # value is served from memory without reading of the file, and it is not shared with callers
+        cache = FileCache('predict_memory')
+        df = pd.DataFrame([[1, 'a'], [2, 'b']], columns=['x', 'y'])
+        cache.set('df', df)
+        with patch('builtins.open') as mock_open:
+            df2 = cache.get('df')
+            assert mock_open.call_count == 0
+        assert df2.equals(df)
+        df2['x'] = 0
+        assert cache.get('df').equals(df)
+
+        # file is changed by other process
+        df3 = pd.DataFrame([[3, 'c']], columns=['x', 'y'])
+        FileCache('predict_memory', use_memory=False).set('df', df3)
+        assert cache.get('df').equals(df3)
+
+        # file is deleted
+        os.unlink(cache.file_path('df'))
+        assert cache.get('df') is None
+
     def cache_test(self, cache):
 
         # test save
@@ -0,0 +1,46 @@
+import contextvars
+import pickle
+
+from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities import profiler
+
+
+class TestContext:
+
+    def setup_method(self):
+        ctx.set_default()
+
+    def test_copy_on_write(self):
+        ctx.company_id = 1
+
+        def set_in_copy():
+            ctx.company_id = 2
+            return ctx.company_id
+
+        # context copied to other thread is independent
+        assert contextvars.copy_context().run(set_in_copy) == 2
+        assert ctx.company_id == 1
+
+        ctx.email_confirmed = True
+        del ctx.email_confirmed
+        assert not hasattr(ctx, 'email_confirmed')
+
+    def test_dump_load(self):
+        ctx.company_id = 3
+        profiler.enable()
+        with profiler.Context('test'):
+            dump = ctx.dump()
+        profiler.disable()
+
+        # snapshot doesn't contain profiling data and can be passed to another process
+        assert dump['profiling']['tree'] is None
+        dump = pickle.loads(pickle.dumps(dump))
+
+        ctx.set_default()
+        ctx.load(dump)
+        assert ctx.company_id == 3
+
+        # every load gets its own profiling data
+        ctx.profiling['level'] += 1
+        ctx.load(dump)
+        assert ctx.profiling['level'] == 0
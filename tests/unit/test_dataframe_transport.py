@@ -0,0 +1,64 @@
+import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.utilities import dataframe_transport
+from mindsdb.utilities.dataframe_transport import (
+    dataframe_to_bytes, dataframe_from_bytes, pack_dataframe, unpack_dataframe, SharedDataFrame
+)
+
+
+def double_process(obj):
+    df = unpack_dataframe(obj)
+    return pack_dataframe(df * 2)
+
+
+class TestDataframeTransport:
+
+    def test_bytes(self):
+        df = pd.DataFrame({
+            'a': range(5),
+            'b': ['x', None, 'z', 'w', 'q'],
+            'c': [1.5, np.nan, 2, 3, 4],
+            'd': pd.date_range('2020-01-01', periods=5),
+            'e': [dt.date(2020, 1, i + 1) for i in range(5)],
+        })
+        data = dataframe_to_bytes(df)
+        assert data[:1] == dataframe_transport.ARROW_FORMAT
+        df2 = dataframe_from_bytes(data)
+        assert df2.equals(df)
+        assert df2.dtypes.equals(df.dtypes)
+
+        # types of values would be changed by arrow
+        df = pd.DataFrame({'a': pd.Series([1, None], dtype=object), 'b': [[1], {'x': 2}]})
+        data = dataframe_to_bytes(df)
+        assert data[:1] == dataframe_transport.PICKLE_FORMAT
+        assert dataframe_from_bytes(data).equals(df)
+
+    def test_shared_memory(self):
+        small = pd.DataFrame({'a': [1, 2]})
+        assert pack_dataframe(small) is small
+
+        df = pd.DataFrame(np.random.random((10000, 20)), columns=[f'c{i}' for i in range(20)])
+        df['s'] = [str(i) for i in range(len(df))]
+        obj = pack_dataframe(df)
+        assert isinstance(obj, SharedDataFrame)
+
+        with ProcessPoolExecutor(1) as pool:
+            result = pool.submit(double_process, obj).result()
+        obj.unlink()
+
+        assert isinstance(result, SharedDataFrame)
+        df2 = unpack_dataframe(result, unlink=True)
+        assert df2.equals(df * 2)
+
+        # memory is released
+        result.unlink()
+        try:
+            result.load()
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError('shared memory is not released')
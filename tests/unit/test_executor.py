@@ -1,5 +1,6 @@
 from unittest.mock import patch
 import datetime as dt
+import time
 import tempfile
 import pytest
 import json
@@ -7,6 +8,7 @@ import json
 import pandas as pd
 import numpy as np
 
+from mindsdb_sql import parse_sql
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 
 from mindsdb.api.executor.utilities.sql import query_df
@@ -94,6 +96,111 @@ class Test(BaseExecutorMockPredictor):
         # check sql in query method
         assert mock_handler().query.call_args[0][0].to_string() == 'SELECT * FROM tasks'
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_databases_read_once_per_query(self, mock_handler):
+        df = pd.DataFrame([[1, 'x'], [2, 'y']], columns=['a', 'b'])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        datahub = self.command_executor.session.datahub
+        database_controller = self.command_executor.session.database_controller
+        with patch.object(database_controller, 'get_dict', wraps=database_controller.get_dict) as get_dict:
+            self.execute('select * from pg.tasks')
+            for name in ('pg', 'PG', 'mindsdb', 'unknown'):
+                datahub.get(name)
+            assert get_dict.call_count == 1
+
+            # new database is visible to the next query
+            self.execute("create database pg2 using engine='postgres'")
+            self.execute('select * from pg2.tasks')
+            assert datahub.get('pg2') is not None
+            assert get_dict.call_count == 2
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_integration_select_stream(self, mock_handler):
+
+        df = pd.DataFrame({'a': range(25), 'b': [str(i) for i in range(25)]})
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        def query_stream_f(query, fetch_size):
+            for i in range(0, len(df), 10):
+                yield df[i:i + 10]
+
+        mock_handler().query_stream.side_effect = query_stream_f
+
+        self.command_executor.context['stream'] = True
+        ret = self.command_executor.execute_command(parse_sql('select * from pg.tasks'))
+
+        # only the first chunk is fetched
+        assert ret.data.is_stream
+        chunks = list(ret.data.iter_raw_dfs())
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert list(chunks[-1].iloc[-1]) == [24, '24']
+
+        # not pass-through query is not streamed
+        ret = self.command_executor.execute_command(parse_sql('select a from pg.tasks union all select a from pg.tasks'))
+        assert not ret.data.is_stream
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_prepared_statement_stream(self, mock_handler):
+        from unittest.mock import MagicMock
+        from mindsdb.api.mysql.mysql_proxy.executor.mysql_executor import Executor
+        from mindsdb.api.mysql.mysql_proxy.classes.result_cursor import ResultCursor
+
+        df = pd.DataFrame({'a': range(25), 'b': [str(i) for i in range(25)]})
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        def query_stream_f(query, fetch_size):
+            for i in range(0, len(df), 10):
+                yield df[i:i + 10]
+
+        mock_handler().query_stream.side_effect = query_stream_f
+
+        sqlserver = MagicMock()
+        sqlserver.session.api_type = 'mysql'
+        executor = Executor(self.command_executor.session, sqlserver, stream=True)
+        # columns of prepared statement are not checked here
+        with patch('mindsdb.api.mysql.mysql_proxy.executor.mysql_executor.SQLQuery'):
+            executor.stmt_prepare('select * from pg.tasks where a > ?')
+
+        for value in (10, 20):
+            executor.stmt_execute([value])
+            assert executor.result_set.is_stream
+            cursor = ResultCursor(executor.result_set)
+            assert sum(len(chunk) for chunk in cursor.iter_all()) == 25
+            # statement is executed again with new value of parameter
+            query = mock_handler().query_stream.call_args[0][0]
+            assert query.to_string() == f'SELECT * FROM tasks WHERE a > {value}'
+        assert mock_handler().query_stream.call_count == 2
+
+    def test_result_cursor_idle_stream(self):
+        from mindsdb.api.executor.sql_query.result_set import ResultSet
+        from mindsdb.api.mysql.mysql_proxy.classes.result_cursor import ResultCursor, idle_cursors
+
+        df = pd.DataFrame({'a': range(25)})
+        closed = []
+
+        def stream():
+            try:
+                for i in range(0, len(df), 10):
+                    yield df[i:i + 10]
+            finally:
+                closed.append(True)
+
+        result_set = ResultSet().from_df(df.iloc[:0])
+        result_set.set_stream(stream())
+
+        cursor = ResultCursor(result_set, idle_timeout=10)
+        assert len(cursor.fetch(5)) == 5
+        idle_cursors.release_idle()
+        assert cursor.is_streaming
+
+        # client doesn't fetch rows: the rest of the stream is read to memory and the stream is closed
+        cursor.used_at -= 10
+        idle_cursors.release_idle()
+        assert not cursor.is_streaming
+        assert closed == [True]
+        assert cursor.fetch(100)[0].to_list() == list(range(5, 25))
+
     def test_predictor_1_row(self):
         predicted_value = 3.14
         predictor = {
@@ -114,6 +221,102 @@ class Test(BaseExecutorMockPredictor):
         ret_df = self.ret_to_df(ret)
         assert ret_df['p'][0] == predicted_value
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_tables_metadata_cache(self, mock_handler):
+        df = pd.DataFrame([{'a': 1}])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        ret = self.execute('show tables from pg')
+        assert [x[0] for x in ret.data.to_lists()] == ['table1']
+        assert mock_handler().get_tables.call_count == 1
+
+        # list of tables is cached
+        ret = self.execute('select table_name from information_schema.tables where table_schema = "pg"')
+        assert [x[0] for x in ret.data.to_lists()] == ['table1']
+        assert mock_handler().get_tables.call_count == 1
+
+        # and is fetched again after refresh
+        from unittest.mock import MagicMock
+        from mindsdb.api.mysql.mysql_proxy.executor.mysql_executor import Executor
+        from mindsdb.api.executor.utilities.statements import RefreshTables, parse_statement
+
+        executor = Executor(self.command_executor.session, MagicMock())
+        executor.query_execute('REFRESH TABLES FROM `pg`;')
+        assert isinstance(executor.query, RefreshTables)
+        assert executor.query.to_string() == 'REFRESH TABLES FROM pg'
+        self.execute('show tables from pg')
+        assert mock_handler().get_tables.call_count == 2
+
+        assert parse_statement('refresh tables').database is None
+        assert parse_statement('refresh tables from pg where x') is None
+        assert parse_statement('show refresh tables') is None
+
+    @patch('mindsdb.integrations.handlers.mysql_handler.Handler')
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_tables_metadata_timeout(self, mock_handler, mock_slow_handler):
+        df = pd.DataFrame([{'a': 1}])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+        self.set_handler(mock_slow_handler, name='slow', tables={'tasks': df}, engine='mysql')
+
+        get_tables = mock_slow_handler().get_tables.side_effect
+
+        def slow_get_tables():
+            time.sleep(1)
+            return get_tables()
+
+        mock_slow_handler().get_tables.side_effect = slow_get_tables
+
+        # tables of not answered integration are skipped
+        with patch('mindsdb.api.executor.datahub.datanodes.system_tables.Config') as config:
+            config().get.return_value = {'fetch_timeout': 0.2}
+            start = time.time()
+            ret = self.execute('select table_schema, table_name from information_schema.tables')
+            assert time.time() - start < 1
+        schemas = [x[0] for x in ret.data.to_lists()]
+        assert 'pg' in schemas
+        assert 'slow' not in schemas
+
+        ret = self.execute('show warnings')
+        messages = [x[2] for x in ret.data.to_lists()]
+        assert len(messages) == 1
+        assert "'slow'" in messages[0]
+
+    def test_tables_metadata_shared_requests(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import MagicMock
+        from mindsdb.api.executor.datahub.datanodes import system_tables
+
+        calls = []
+
+        def get_datanode(name):
+            def get_tables():
+                calls.append(name)
+                time.sleep(0.5 if name == 'slow' else 0)
+                return [name]
+            return MagicMock(get_tables=get_tables)
+
+        inf_schema = MagicMock()
+        inf_schema.get.side_effect = get_datanode
+        inf_schema.session.warnings = []
+
+        with patch.object(system_tables, '_metadata_executor', ThreadPoolExecutor(max_workers=1)), \
+                patch.dict(system_tables._metadata_requests, clear=True), \
+                patch('mindsdb.api.executor.datahub.datanodes.system_tables.Config') as config:
+            config().get.return_value = {'fetch_timeout': 0.2}
+
+            # the only worker is busy with 'slow': 'pg' is not started and is skipped
+            assert system_tables.get_integrations_tables(inf_schema, ['slow', 'pg']) == {}
+            assert 'no answer' in inf_schema.session.warnings[0]
+            assert 'too many integrations' in inf_schema.session.warnings[1]
+
+            # not finished request is not repeated
+            assert system_tables.get_integrations_tables(inf_schema, ['slow']) == {}
+            assert calls == ['slow']
+
+            time.sleep(0.5)
+            assert system_tables.get_integrations_tables(inf_schema, ['pg']) == {'pg': ['pg']}
+        assert calls == ['slow', 'pg']
+
     @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
     def test_dates(self, mock_handler):
         df = pd.DataFrame([
@@ -773,6 +976,90 @@ class TestComplexQueries(BaseExecutorMockPredictor):
 
         assert len(calls) == 2
 
+    @patch('mindsdb.integrations.handlers.mysql_handler.Handler')
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_insert_select_batches(self, mock_handler, mock_handler2):
+        df = pd.DataFrame({'a': range(25), 'b': [str(i) for i in range(25)]})
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        def query_stream_f(query, fetch_size):
+            for i in range(0, len(df), 20):
+                yield df[i:i + 20]
+
+        mock_handler().query_stream.side_effect = query_stream_f
+
+        self.set_handler(mock_handler2, name='pg2', tables={}, engine='mysql')
+        # prevent hasattr=true
+        del mock_handler2().insert
+
+        executor_config = self.command_executor.session.config['executor']
+        executor_config['insert_batch_size'] = 10
+        try:
+            self.execute('insert into pg2.table1 (select * from pg.tasks)')
+        finally:
+            executor_config['insert_batch_size'] = 10000
+
+        # source is fetched by chunks
+        assert mock_handler().query_stream.call_count == 1
+
+        inserts = [call[0][0] for call in mock_handler2().query.call_args_list]
+        assert [len(query.values) for query in inserts] == [10, 10, 5]
+        assert [col.name for col in inserts[0].columns] == ['a', 'b']
+        assert inserts[2].values[-1] == [24, '24']
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_insert_select_same_integration(self, mock_handler):
+        df = pd.DataFrame({'a': range(25), 'b': [str(i) for i in range(25)]})
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+        # prevent hasattr=true
+        del mock_handler().insert
+
+        executor_config = self.command_executor.session.config['executor']
+        executor_config['insert_batch_size'] = 10
+        try:
+            self.execute('insert into pg.table1 (select * from pg.tasks)')
+        finally:
+            executor_config['insert_batch_size'] = 10000
+
+        # source is fetched before insert: handler is not used by stream and insert at the same time
+        assert mock_handler().query_stream.call_count == 0
+        queries = [call[0][0] for call in mock_handler().query.call_args_list]
+        assert [len(query.values) for query in queries[1:]] == [10, 10, 5]
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_insert_select_pool_of_one_handler(self, mock_handler):
+        df = pd.DataFrame({'a': range(25), 'b': [str(i) for i in range(25)]})
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        def query_stream_f(query, fetch_size):
+            for i in range(0, len(df), 10):
+                yield df[i:i + 10]
+
+        mock_handler().query_stream.side_effect = query_stream_f
+
+        pool = self.command_executor.session.integration_controller.get_data_handler_pool('pg')
+        pool_settings = pool.max_size, pool.acquire_timeout
+        pool.max_size, pool.acquire_timeout = 1, 1
+
+        executor_config = self.command_executor.session.config['executor']
+        executor_config['insert_batch_size'] = 10
+        try:
+            # native insert
+            self.execute('insert into pg.table1 (select * from pg.tasks)')
+            assert sum(len(call[0][1]) for call in mock_handler().insert.call_args_list) == 25
+
+            # insert by queries
+            del mock_handler().insert
+            self.execute('insert into pg.table1 (select * from pg.tasks)')
+            queries = [call[0][0] for call in mock_handler().query.call_args_list]
+            assert [len(query.values) for query in queries if hasattr(query, 'values')] == [10, 10, 5]
+        finally:
+            executor_config['insert_batch_size'] = 10000
+            pool.max_size, pool.acquire_timeout = pool_settings
+
+        # handler was never waited for
+        assert pool.get_stats()['timeouts'] == 0
+
     # @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
     # def test_union_type_mismatch(self, mock_handler):
     #     self.set_handler(mock_handler, name='pg', tables={'tasks': self.df})
@@ -927,6 +1214,26 @@ class TestWithNativeQuery(BaseExecutorMockPredictor):
         assert mock_handler().native_query.call_args[0][0] == 'select * from tasks'
         assert ret.data.to_lists()[0][0] == 3
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_native_query_connection_state(self, mock_handler):
+        self.set_handler(mock_handler, name='pg', tables={})
+
+        # handlers are shared: state of connection is not kept between queries
+        for query in (
+            'set search_path to public',
+            'begin',
+            '/* comment */ create temporary table tmp (a int)',
+            'begin; insert into tasks values (1)',
+        ):
+            with pytest.raises(Exception) as exc_info:
+                self.execute(f'select * from pg ({query})')
+            assert 'shared' in str(exc_info.value)
+        mock_handler().native_query.assert_not_called()
+
+        query = 'begin; set local search_path to public; insert into tasks values (1); commit'
+        self.execute(f'select * from pg ({query})')
+        assert mock_handler().native_query.call_args[0][0] == query
+
     @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
     def test_view_native_query(self, mock_handler):
         data = [[3, 'y'], [1, 'y']]
@@ -1021,6 +1328,86 @@ class TestWithNativeQuery(BaseExecutorMockPredictor):
         assert ret.data.to_lists()[0][0] == predicted_value
         assert len(ret.data) == 1
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_predictor_row_cache(self, mock_handler):
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'one'},
+            {'a': 2, 'b': 'two'},
+            {'a': 3, 'b': 'three'},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        predictor = {
+            'name': 'task_model',
+            'predict': 'p',
+            'dtypes': {
+                'p': dtype.float,
+                'a': dtype.integer,
+                'b': dtype.categorical
+            },
+            'predicted_value': 3.14
+        }
+        self.set_predictor(predictor)
+
+        from mindsdb.api.executor.sql_query.steps.apply_predictor_step import PREDICTION_CACHE_BUCKETS
+
+        class DictCache(dict):
+            def set(self, name, value):
+                self.updated.append(name)
+                self[name] = value
+
+        cache = DictCache()
+        cache.updated = []
+        sql = 'select t.a, m.a, m.b, m.p from pg.tasks t join mindsdb.task_model m'
+        with patch('mindsdb.api.executor.sql_query.steps.apply_predictor_step.get_cache', return_value=cache):
+            ret = self.execute(sql)
+            assert len(self.mock_predict.call_args[0][1]) == 3
+            assert ret.data.to_lists() == [[1, 1, 'one', 3.14], [2, 2, 'two', 3.14], [3, 3, 'three', 3.14]]
+
+            # predictions are stored by buckets of row hashes
+            assert sum(len(value) for value in cache.values()) == 3
+            for name, value in cache.items():
+                assert set(value.index % PREDICTION_CACHE_BUCKETS) == {int(name.split('_')[-1])}
+            updated = len(cache.updated)
+
+            # only changed and new rows are predicted
+            df = pd.DataFrame([
+                {'a': 4, 'b': 'four'},
+                {'a': 1, 'b': 'one'},
+                {'a': 2, 'b': 'two-two'},
+                {'a': 3, 'b': 'three'},
+            ])
+            self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+            self.mock_predict.reset_mock()
+            ret = self.execute(sql)
+            data_in = self.mock_predict.call_args[0][1]
+            assert list(data_in['a']) == [4, 2]
+            # only buckets of new rows are updated
+            assert 1 <= len(cache.updated) - updated <= 2
+            assert ret.data.to_lists() == [
+                [4, 4, 'four', 3.14], [1, 1, 'one', 3.14], [2, 2, 'two-two', 3.14], [3, 3, 'three', 3.14]
+            ]
+
+            # all rows are in cache
+            self.mock_predict.reset_mock()
+            ret2 = self.execute(sql)
+            assert self.mock_predict.call_count == 0
+            assert ret2.data.to_lists() == ret.data.to_lists()
+
+        # predictions of conversational model depend on previous rows: all rows are cached together
+        predictor['problem_definition'] = {
+            'timeseries_settings': {'is_timeseries': False}, 'using': {'mode': 'conversational'}
+        }
+        self.set_predictor(predictor)
+        cache = DictCache()
+        cache.updated = []
+        with patch('mindsdb.api.executor.sql_query.steps.apply_predictor_step.get_cache', return_value=cache):
+            self.execute(sql)
+            assert len(cache) == 1
+            self.mock_predict.reset_mock()
+            self.execute(sql + ' where t.a = 1')
+            assert list(self.mock_predict.call_args[0][1]['a']) == [1]
+
     @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
     def test_use_ts_predictor_with_view(self, mock_handler):
         # set integration data
@@ -1113,6 +1500,138 @@ class TestSteps(BaseExecutorMockPredictor):
             limit 1
         """)
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_join_arrow_storage(self, mock_handler):
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x', 'c': dt.datetime(2020, 1, 1)},
+            {'a': 2, 'b': 'y', 'c': dt.datetime(2020, 1, 2)},
+            {'a': 3, 'b': None, 'c': dt.datetime(2020, 1, 3)},
+        ])
+        df2 = pd.DataFrame([
+            {'a': 1, 'd': 1.5},
+            {'a': 3, 'd': 3.5},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df, 'tasks2': df2})
+
+        sql = '''
+            select t.a, t.b, t2.d from pg.tasks t
+            join files.tasks2 t2 on t.a = t2.a
+            order by t.a
+        '''
+        self.save_file('tasks2', df2)
+
+        ret_pandas = self.execute(sql)
+        with patch(
+            'mindsdb.api.executor.sql_query.steps.base.BaseStepCall.use_arrow_storage',
+            return_value=True
+        ):
+            ret_arrow = self.execute(sql)
+
+        assert ret_arrow.data.to_lists() == ret_pandas.data.to_lists()
+        assert ret_arrow.data.to_lists() == [[1, 'x', 1.5], [3, None, 3.5]]
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_join_semi_join(self, mock_handler):
+        df = pd.DataFrame([
+            {'a': i, 'b': f'x{i}'}
+            for i in range(100)
+        ])
+        df2 = pd.DataFrame([
+            {'a': 1, 'd': 1.5},
+            {'a': 3, 'd': 3.5},
+            {'a': 5, 'd': None},
+            {'a': None, 'd': 0.5},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+        self.save_file('tasks2', df2)
+
+        sql = '''
+            select t2.a, t2.d, t.b from files.tasks2 t2
+            join pg.tasks t on t.a = t2.a
+            where t.a > 1
+            order by t2.a
+        '''
+        ret = self.execute(sql)
+        assert ret.data.to_lists() == [[3, 3.5, 'x3'], [5, None, 'x5']]
+
+        # only keys of the left table are fetched from the integration
+        query = mock_handler().query.call_args[0][0]
+        assert query.where.args[1].op == 'in'
+        assert [c.value for c in query.where.args[1].args[1].items] == [1, 3, 5]
+
+        # keys are split to batches
+        executor_config = self.command_executor.session.config['executor']
+        executor_config['semi_join_batch_size'] = 2
+        try:
+            mock_handler().query.reset_mock()
+            ret = self.execute(sql)
+        finally:
+            executor_config['semi_join_batch_size'] = 1000
+        assert ret.data.to_lists() == [[3, 3.5, 'x3'], [5, None, 'x5']]
+        assert mock_handler().query.call_count == 2
+
+        # right join: right table is fetched fully
+        mock_handler().query.reset_mock()
+        ret = self.execute(sql.replace('join pg.tasks', 'right join pg.tasks'))
+        assert len(ret.data) == 98
+        query = mock_handler().query.call_args[0][0]
+        assert 'IN' not in str(query).upper()
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_plan_cache(self, mock_handler):
+        from mindsdb.api.executor.sql_query.sql_query import SQLQuery
+
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x'},
+            {'a': 2, 'b': 'y'},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        sql = 'select * from pg.tasks where a > 1'
+        create_planner = SQLQuery.create_planner
+        with patch.object(SQLQuery, 'create_planner', autospec=True, side_effect=create_planner) as mock_planner:
+            ret = self.execute(sql)
+            ret2 = self.execute(sql)
+            assert mock_planner.call_count == 1
+            assert ret.data.to_lists() == ret2.data.to_lists() == [[2, 'y']]
+
+            # ddl invalidates cache
+            self.execute('create view v_tasks (select * from pg.tasks)')
+            mock_planner.reset_mock()
+            self.execute(sql)
+            assert mock_planner.call_count == 1
+
+        self.set_predictor({
+            'name': 'task_model',
+            'predict': 'p',
+            'dtypes': {'p': dtype.float, 'a': dtype.integer},
+            'predicted_value': 3.14
+        })
+        sql = 'select p from mindsdb.task_model where a = 2'
+        with patch.object(SQLQuery, 'create_planner', autospec=True, side_effect=create_planner) as mock_planner:
+            self.execute(sql)
+            self.execute(sql)
+            assert mock_planner.call_count == 1
+
+            # new version of model is trained (for example in other process): query is planned again
+            record = self.db.Predictor.query.filter_by(name='task_model').first()
+            record.active = False
+            self.db.session.add(self.db.Predictor(
+                name='task_model',
+                data=record.data,
+                learn_args=record.learn_args,
+                to_predict=record.to_predict,
+                integration_id=record.integration_id,
+                project_id=record.project_id,
+                status='complete',
+                version=2,
+                active=True,
+            ))
+            self.db.session.commit()
+            ret = self.execute(sql)
+            assert mock_planner.call_count == 2
+            assert ret.data.to_lists() == [[3.14]]
+
 
 class TestExecutionTools:
 
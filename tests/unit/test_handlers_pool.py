@@ -0,0 +1,101 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+class FakeHandler:
+    def __init__(self, stats):
+        self.name = 'db'
+        self.stats = stats
+        self.healthy = True
+        self.disconnected = False
+        with stats['lock']:
+            stats['created'] += 1
+
+    def query(self):
+        with self.stats['lock']:
+            self.stats['active'] += 1
+            self.stats['max_active'] = max(self.stats['max_active'], self.stats['active'])
+        time.sleep(0.01)
+        with self.stats['lock']:
+            self.stats['active'] -= 1
+
+    def check_connection(self):
+        class Status:
+            success = self.healthy
+        return Status()
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+@pytest.fixture
+def stats():
+    return {'lock': threading.Lock(), 'created': 0, 'active': 0, 'max_active': 0}
+
+
+def test_pool_is_bounded(stats):
+    from mindsdb.interfaces.database.integrations import HandlersPool
+
+    pool = HandlersPool('db', lambda: FakeHandler(stats), max_size=3)
+
+    def call(_):
+        with pool.lease() as handler:
+            handler.query()
+
+    with ThreadPoolExecutor(max_workers=30) as executor:
+        list(executor.map(call, range(100)))
+
+    # handlers are shared between threads, every handler is used by one thread at a time
+    assert stats['created'] == 3
+    assert stats['max_active'] == 3
+    pool_stats = pool.get_stats()
+    assert pool_stats['idle'] == 3
+    assert pool_stats['in_use'] == 0
+    assert pool_stats['reused'] == 97
+    assert pool_stats['waits'] > 0
+
+    # no free handler
+    pool.acquire_timeout = 0.05
+    with pool.lease():
+        with pool.lease():
+            with pool.lease():
+                with pytest.raises(Exception, match='are in use'):
+                    with pool.lease():
+                        pass
+    assert pool.get_stats()['timeouts'] == 1
+
+
+def test_pool_lifecycle(stats):
+    from mindsdb.interfaces.database.integrations import HandlersPool
+
+    pool = HandlersPool('db', lambda: FakeHandler(stats), max_size=2, health_check_after=0.05)
+    with pool.lease() as first:
+        pass
+
+    # broken connection is replaced after failed health check
+    with pytest.raises(ValueError):
+        with pool.lease() as handler:
+            assert handler is first
+            handler.healthy = False
+            raise ValueError()
+    with pool.lease() as handler:
+        assert handler is not first
+    assert first.disconnected
+    assert pool.get_stats()['failed_health_checks'] == 1
+
+    # idle handlers are disconnected
+    pool.max_idle = 0
+    pool.clean()
+    assert handler.disconnected
+    assert pool.is_empty()
+
+    # handlers are not returned to closed pool
+    with pool.lease() as handler:
+        pool.close()
+    assert handler.disconnected
+    with pytest.raises(Exception):
+        with pool.lease():
+            pass
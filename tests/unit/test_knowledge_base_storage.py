@@ -0,0 +1,155 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+
+def test_embedding_cache(tmp_path):
+    from mindsdb.interfaces.knowledge_base.embedding_cache import EmbeddingCache, content_hash
+
+    cache = EmbeddingCache(tmp_path / 'cache.sqlite', model_id=1)
+    keys = [content_hash(f'text {i}') for i in range(1200)]
+    cache.set_many({key: [i, 0.5] for i, key in enumerate(keys)})
+    # not vectors are skipped
+    cache.set_many({'str': 'abc', 'none': None})
+
+    found = cache.get_many(keys + ['str', 'none', 'missing'])
+    assert len(found) == 1200
+    assert found[keys[1000]] == [1000.0, 0.5]
+    assert cache.size() == 1200
+
+    # cache is persisted, embeddings of other model are not visible
+    assert len(EmbeddingCache(tmp_path / 'cache.sqlite', model_id=1).get_many(keys)) == 1200
+    assert EmbeddingCache(tmp_path / 'cache.sqlite', model_id=2).get_many(keys) == {}
+
+
+def test_kb_embeddings(tmp_path):
+    from mindsdb.interfaces.knowledge_base.controller import KnowledgeBaseTable
+    from mindsdb.interfaces.knowledge_base.embedding_cache import EmbeddingCache
+
+    kb = MagicMock(params={}, id=1, embedding_model_id=1)
+    table = KnowledgeBaseTable(kb, session=None)
+    table._embedding_cache = EmbeddingCache(tmp_path / 'cache.sqlite', model_id=1)
+
+    calls = []
+
+    def predict_embeddings(contents):
+        calls.append(contents)
+        return [[len(content)] for content in contents]
+
+    table._predict_embeddings = predict_embeddings
+
+    df = pd.DataFrame({'content': ['a', 'bb', 'a', 'ccc']}, index=[5, 6, 7, 8])
+    res = table._df_to_embeddings(df)
+    # identical contents are embedded once
+    assert calls == [['a', 'bb', 'ccc']]
+    assert list(res.index) == [5, 6, 7, 8]
+    assert list(res['embeddings']) == [[1.0], [2.0], [1.0], [3.0]]
+
+    # only new content is sent to model
+    df = pd.DataFrame({'content': ['bb', 'dddd', 'a']})
+    res = table._df_to_embeddings(df)
+    assert calls[1] == ['dddd']
+    assert list(res['embeddings']) == [[2.0], [4.0], [1.0]]
+
+    assert table._content_to_embeddings('ccc') == [3.0]
+    assert len(calls) == 2
+
+    # embeddings of queries are not written to storage, but are reused by the next queries of the process
+    assert table._content_to_embeddings('eeeee') == [5.0]
+    assert table._embedding_cache.size() == 4
+    table2 = KnowledgeBaseTable(kb, session=None)
+    table2._embedding_cache = table._embedding_cache
+    table2._predict_embeddings = predict_embeddings
+    assert table2._content_to_embeddings('eeeee') == [5.0]
+    assert len(calls) == 3
+
+
+def test_kb_storage_pull():
+    from mindsdb.interfaces.knowledge_base import storage
+
+    with patch.object(storage, 'FileStorage') as file_storage, patch.dict(storage.__dict__, _pulled_storages=set()):
+        file_storage.return_value.folder_name = 'knowledge_base_1_1'
+        # storage is pulled once by process, and on request
+        for _ in range(3):
+            storage.get_kb_storage(1)
+        assert file_storage.return_value.pull.call_count == 1
+        storage.get_kb_storage(1, refresh=True)
+        assert file_storage.return_value.pull.call_count == 2
+
+        # and after the knowledge base is deleted
+        storage.delete_kb_storage(1)
+        storage.get_kb_storage(1)
+        assert file_storage.return_value.pull.call_count == 3
+
+
+def test_incremental_insert(tmp_path):
+    from mindsdb.interfaces.knowledge_base.controller import KnowledgeBaseTable
+    from mindsdb.interfaces.knowledge_base.manifest import IngestionManifest
+
+    kb = MagicMock(params={'insert_batch_size': 2, 'embeddings_cache': False}, id=1, embedding_model_id=1)
+    table = KnowledgeBaseTable(kb, session=None)
+    table._storage = MagicMock()
+    table._manifest = IngestionManifest(tmp_path / 'manifest.sqlite')
+    table._predict_embeddings = lambda contents: [[len(content)] for content in contents]
+    vector_db = MagicMock()
+    table._vector_db = vector_db
+
+    def upserted_ids():
+        ids = [list(call.args[1]['id']) for call in vector_db.do_upsert.call_args_list]
+        vector_db.do_upsert.reset_mock()
+        return ids
+
+    df = pd.DataFrame({'id': [1, 2, 3], 'content': ['a', 'b', 'c']})
+    table.insert(df)
+    # by batches
+    assert upserted_ids() == [[1, 2], [3]]
+    assert table._storage.push.called
+
+    # only new and changed rows are inserted
+    df = pd.DataFrame({'id': [1, 2, 3, 4], 'content': ['a', 'bb', 'c', 'd']})
+    table.insert(df)
+    assert upserted_ids() == [[2, 4]]
+
+    table.insert(df)
+    assert upserted_ids() == []
+
+    # vector db is cleared: all rows are inserted again
+    table.clear()
+    table.insert(df)
+    assert upserted_ids() == [[1, 2], [3, 4]]
+
+
+def test_upsert_batches():
+    from mindsdb.integrations.libs.vectordatabase_handler import VectorStoreHandler
+
+    class FakeVectorStore(VectorStoreHandler):
+        def __init__(self):
+            self.is_connected = False
+            self.ids = set()
+            self.checks = []
+
+        def select(self, table_name, columns=None, conditions=None, offset=None, limit=None):
+            values = conditions[0].value
+            self.checks.append(len(values))
+            return pd.DataFrame({'id': [x for x in values if x in self.ids]})
+
+        def insert(self, table_name, data):
+            assert not data['id'].isin(self.ids).any()
+            self.ids.update(data['id'])
+
+        def update(self, table_name, data, key_columns=None):
+            assert data['id'].isin(self.ids).all()
+
+    store = FakeVectorStore()
+    df = pd.DataFrame({'id': [None, 'x', None], 'content': ['a', 'b', 'a']})
+    store.do_upsert('table', df, batch_size=2)
+    # ids are generated from content, duplicates are removed
+    assert len(store.ids) == 2 and 'x' in store.ids
+    assert store.checks == [2]
+    assert df['id'][0] is None
+
+    df = pd.DataFrame({'content': [f'text {i}' for i in range(5)]})
+    store.do_upsert('table', df, batch_size=2)
+    store.do_upsert('table', df, batch_size=2)
+    assert store.checks[1:] == [2, 2, 1, 2, 2, 1]
+    assert len(store.ids) == 7
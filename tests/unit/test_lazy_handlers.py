@@ -0,0 +1,21 @@
+def test_handlers_are_imported_on_first_use():
+    from mindsdb.interfaces.database.integrations import IntegrationController
+
+    controller = IntegrationController()
+
+    # metadata is known without import
+    metadata = controller.get_handlers_metadata()
+    assert metadata['postgres']['type'] == 'data'
+    assert metadata['postgres']['import']['success'] is None
+    assert metadata['files']['permanent'] is True
+    assert 'postgres' in controller.get_handlers_import_status()
+    assert 'postgres' not in controller.handlers_import_time
+
+    # handler is imported on access to its metadata or module
+    handler_meta = controller.get_handlers_import_status()['postgres']
+    assert handler_meta['import']['success'] is True
+    assert 'connection_args' in handler_meta
+    assert controller.get_handlers_metadata()['postgres']['import']['success'] is True
+    assert controller.handler_modules['postgres'].name == 'postgres'
+    assert 'postgres' in controller.handlers_import_time
+    assert 'mysql' not in controller.handlers_import_time
@@ -0,0 +1,156 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from mindsdb.integrations.libs.llm.completion_engine import (
+    CompletionEngine, TokenBucket, get_completion_engine, is_rate_limit_error, is_retryable_error
+)
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """ Local stub of LLM API: every third request is rate-limited """
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.requests += 1
+            number = server.requests
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(0.01)
+            if number % 3 == 0:
+                server.rate_limited += 1
+                self.send_response(429)
+                self.send_header('Retry-After', '0.05')
+                self.end_headers()
+                return
+
+            server.batches.append(len(body['input']))
+            content = {
+                'object': 'list',
+                'model': body['model'],
+                'data': [
+                    {'object': 'embedding', 'index': i, 'embedding': [float(len(text))]}
+                    for i, text in enumerate(body['input'])
+                ],
+                'usage': {'prompt_tokens': 1, 'total_tokens': 1},
+            }
+            data = json.dumps(content).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPI)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.active = 0
+    server.max_active = 0
+    server.rate_limited = 0
+    server.batches = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_token_bucket():
+    bucket = TokenBucket(60)
+    assert bucket.reserve(60) == 0
+    # bucket is empty: one token per second
+    assert bucket.reserve(1) == pytest.approx(1, abs=0.05)
+    assert bucket.reserve(2) == pytest.approx(3, abs=0.05)
+
+
+def test_shared_engine():
+    engine = get_completion_engine(('test', 'key'), rpm=600, max_concurrency=8)
+    assert engine.requests_bucket.reserve(100) == 0
+
+    # engine of the same key is kept, the lowest limits are applied to it
+    assert get_completion_engine(('test', 'key'), rpm=60, tpm=1000, max_concurrency=16) is engine
+    assert get_completion_engine(('test', 'key')) is engine
+    assert engine.requests_bucket.capacity == 60
+    assert engine.tokens_bucket.capacity == 1000
+    assert engine.concurrency.maximum == 8
+    # the reserved requests are not forgotten
+    assert engine.requests_bucket.reserve(1) > 0
+
+    assert get_completion_engine(('test', 'other key')) is not engine
+
+
+def test_batches():
+    engine = CompletionEngine(count_tokens=len)
+    assert engine.make_batches(list(range(5)), batch_size=2) == [[0, 1], [2, 3], [4]]
+    assert engine.make_batches(['aaa', 'bb', 'c', 'dddd'], batch_size=10, max_batch_tokens=4) == [
+        ['aaa'], ['bb', 'c'], ['dddd']
+    ]
+
+
+def test_engine(stub_api):
+    url = f'http://127.0.0.1:{stub_api.server_port}/v1/embeddings'
+
+    def submit(batch):
+        response = requests.post(url, json={'model': 'stub', 'input': batch})
+        response.raise_for_status()
+        return [item['embedding'][0] for item in response.json()['data']]
+
+    texts = ['x' * i for i in range(100)]
+    engine = CompletionEngine(max_concurrency=8, initial_concurrency=8, initial_delay=0.01)
+    results = engine.run(submit, texts, batch_size=7)
+
+    # results are in the order of inputs, rate-limited requests are retried
+    assert results == [float(i) for i in range(100)]
+    assert max(stub_api.batches) == 7
+    assert sum(stub_api.batches) == 100
+    assert stub_api.rate_limited > 0
+    assert 1 < stub_api.max_active <= 8
+    # concurrency is decreased on rate limits
+    assert engine.concurrency.get() < 8
+
+    # not retryable errors are raised
+    def fail(batch):
+        raise ValueError('wrong input')
+
+    with pytest.raises(ValueError):
+        engine.run(fail, texts)
+
+
+def test_errors_of_api_clients():
+    class RateLimitError(Exception):
+        status_code = 429
+
+    class CohereAPIError(Exception):
+        def __init__(self, http_status):
+            self.http_status = http_status
+
+    class ResourceExhausted(Exception):
+        code = 429
+
+    class BadRequest(Exception):
+        code = 400
+
+    for error in (RateLimitError(), CohereAPIError(429), ResourceExhausted()):
+        assert is_rate_limit_error(error)
+        assert is_retryable_error(error)
+
+    assert is_retryable_error(CohereAPIError(503))
+    assert not is_retryable_error(CohereAPIError(400))
+    assert not is_retryable_error(BadRequest())
+    assert not is_retryable_error(ValueError())
@@ -0,0 +1,70 @@
+import time
+import threading
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+
+def test_union_results():
+    from mindsdb.api.executor.sql_query.result_set import ResultSet
+    from mindsdb.api.executor.sql_query.steps.map_reduce_step import union_results
+
+    rs1 = ResultSet().from_df(pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}))
+    # columns are matched by names
+    rs2 = ResultSet().from_df(pd.DataFrame({'b': ['z'], 'a': [3]}))
+    empty = ResultSet()
+
+    result = union_results([empty, rs1, rs2])
+    assert result.get_column_names() == ['a', 'b']
+    assert result.to_lists() == [[1, 'x'], [2, 'y'], [3, 'z']]
+
+    assert union_results([rs1]) is rs1
+    assert len(union_results([empty]).columns) == 0
+
+
+def test_map_reduce_groups():
+    from mindsdb_sql import parse_sql
+    from mindsdb_sql.planner.steps import MapReduceStep, FetchDataframeStep
+    from mindsdb.api.executor.sql_query.result_set import ResultSet
+    from mindsdb.api.executor.sql_query.steps.map_reduce_step import MapReduceStepCall
+
+    values = pd.DataFrame({'x': [1, 2, 3, 4]})
+    sql_query = MagicMock()
+    sql_query.steps_data = [ResultSet().from_df(values)]
+    sql_query.session.config = {'executor': {'map_reduce_max_workers': 4}}
+
+    query = parse_sql("select * from tasks where a = '$var[x]'")
+    fetch_step = FetchDataframeStep(integration='pg', query=query)
+    step = MapReduceStep(values=MagicMock(step_num=0), reduce='union', step=fetch_step)
+
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(substep):
+        value = substep.query.where.args[1].value
+        # the first groups are finished last
+        time.sleep(0.05 * (5 - value))
+        with lock:
+            calls.append((substep, threading.get_ident()))
+        return ResultSet().from_df(pd.DataFrame({'a': [value], 'b': [str(value)]}))
+
+    call = MapReduceStepCall(sql_query)
+    call._fetch_dataframe_step = fetch
+    # worker threads release their db sessions
+    with patch('mindsdb.interfaces.storage.db.session') as db_session:
+        result = call.call(step)
+    assert db_session.remove.call_count == 4
+
+    # results are in the order of groups
+    assert result.to_lists() == [[1, '1'], [2, '2'], [3, '3'], [4, '4']]
+    assert len(set(thread for _, thread in calls)) > 1
+
+    # only query is copied for every group, the rest of step and input data are shared
+    for substep, _ in calls:
+        assert substep.query is not query
+        assert substep.integration is fetch_step.integration
+    assert len({id(substep.query) for substep, _ in calls}) == 4
+    assert sql_query.steps_data[0].get_raw_df()[0].to_list() == [1, 2, 3, 4]
+
+    # source query is not changed
+    assert query.to_string() == "SELECT * FROM tasks WHERE a = '$var[x]'"
@@ -0,0 +1,42 @@
+import time
+
+
+def test_stale_tables_are_updated_in_background():
+    from mindsdb.interfaces.database.metadata_catalog import MetadataCatalog
+
+    catalog = MetadataCatalog(ttl=0.2, max_stale=10)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.02)
+        return [f'table{len(calls)}']
+
+    assert catalog.get_tables('db', fetch) == ['table1']
+    assert catalog.get_tables('DB', fetch) == ['table1']
+    assert len(calls) == 1
+
+    # stale list is returned without waiting, update is started only once
+    time.sleep(0.25)
+    assert catalog.get_tables('db', fetch) == ['table1']
+    assert catalog.get_tables('db', fetch) == ['table1']
+    time.sleep(0.1)
+    assert len(calls) == 2
+    assert catalog.get_tables('db', fetch) == ['table2']
+
+    # after refresh list is fetched before return
+    catalog.refresh('db')
+    assert catalog.get_tables('db', fetch) == ['table3']
+
+    # failed fetch is not cached
+    def fail():
+        raise ValueError()
+
+    catalog.refresh()
+    for _ in range(2):
+        try:
+            catalog.get_columns('db', 'table', fail)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('error is expected')
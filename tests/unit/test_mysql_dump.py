@@ -0,0 +1,138 @@
+import datetime as dt
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.api.executor import Column
+from mindsdb.api.executor.sql_query.result_set import ResultSet
+from mindsdb.api.mysql.mysql_proxy.classes.result_cursor import ResultCursor
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_datum import Datum
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packets import BinaryResultsetRowPacket
+from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import NULL_VALUE, TYPES
+from mindsdb.api.mysql.mysql_proxy.utilities import dump
+
+
+def encode_row(row):
+    # reference encoding, the same as in ResultsetRowPacket
+    body = b''
+    for val in row:
+        if val is None:
+            body += NULL_VALUE
+        else:
+            body += Datum('string<lenenc>', str(val)).toStringPacket()
+    return body
+
+
+class TestMysqlDump(unittest.TestCase):
+
+    def test_lenenc_prefix(self):
+        for length in (0, 1, 250, 251, 1000, 2 ** 16, 2 ** 20):
+            value = 'x' * length
+            expected = Datum('string<lenenc>', value).toStringPacket()
+            assert dump.lenenc_prefix(length) + value.encode() == expected
+
+    def test_encode_rows(self):
+        rows = [
+            [1, 1.5, 'a', dt.datetime(2020, 1, 2, 3, 4, 5), None],
+            [2, 0.1, 'ф' * 300, dt.datetime(2020, 1, 2, 3, 4, 5, 123), True],
+        ]
+        encoded, max_lengths = dump.encode_text_rows(rows, 5)
+
+        buffer = bytearray()
+        seq = dump.write_text_rows(buffer, encoded, 3)
+        assert seq == 5
+
+        expected = b''
+        for i, row in enumerate(rows):
+            body = encode_row(row)
+            expected += len(body).to_bytes(3, 'little') + bytes([3 + i]) + body
+        assert bytes(buffer) == expected
+        assert max_lengths == [1, 3, 300, 26, 4]
+
+        # no rows
+        encoded, max_lengths = dump.encode_text_rows([], 2)
+        assert encoded == [[], []]
+
+    def test_encode_df(self):
+        df = pd.DataFrame([
+            [1, 1.5, 'a', dt.datetime(2020, 1, 2, 3, 4, 5), None],
+            [2, np.nan, None, dt.datetime(2020, 1, 2, 3, 4, 5, 123), 'b'],
+            [3, 1e20, 'c', None, 'c'],
+        ])
+        encoded, _ = dump.encode_text_df(df)
+
+        expected_rows = [
+            ['1', '1.5', 'a', '2020-01-02 03:04:05', None],
+            ['2', None, None, '2020-01-02 03:04:05.000123', 'b'],
+            ['3', '1e+20', 'c', None, 'c'],
+        ]
+        for i, row in enumerate(expected_rows):
+            assert b''.join(column[i] for column in encoded) == encode_row(row)
+
+        # values of the numeric columns are the same as str() of values
+        values = np.random.random(1000) * 10.0 ** np.random.randint(-10, 20, 1000)
+        encoded, _ = dump.encode_text_df(pd.DataFrame({'a': values}))
+        assert encoded[0] == [Datum('string<lenenc>', str(v)).toStringPacket() for v in values]
+
+    def test_large_packet(self):
+        payload = b'x' * (2 ** 24 + 10)
+        buffer = bytearray()
+        seq = dump.write_packet(buffer, payload, 255)
+        assert seq == 1
+        assert buffer[:4] == b'\xff\xff\xff\xff'
+        assert buffer[2 ** 24 + 3:2 ** 24 + 7] == b'\x0b\x00\x00\x00'
+
+    def test_encode_binary(self):
+        columns = [
+            {'type': TYPES.MYSQL_TYPE_LONG},
+            {'type': TYPES.MYSQL_TYPE_DOUBLE},
+            {'type': TYPES.MYSQL_TYPE_VAR_STRING},
+            {'type': TYPES.MYSQL_TYPE_DATETIME},
+        ] + [{'type': TYPES.MYSQL_TYPE_LONGLONG}] * 6
+        rows = [
+            [1, 1.5, 'a', pd.Timestamp('2020-01-02 03:04:05')] + list(range(6)),
+            [None, 2.0, None, None] + [None, 1, None, 3, None, 5],
+            [3, None, 'ccc', pd.Timestamp('2020-01-02')] + [10 ** 12] * 6,
+        ]
+        df = pd.DataFrame(rows)
+        payloads = dump.encode_binary_df(df, columns)
+
+        session = MagicMock(packet_sequence_number=0)
+        for row, payload in zip(rows, payloads):
+            packet = BinaryResultsetRowPacket(data=row, columns=columns, session=session)
+            assert payload == packet.body
+
+        buffer = bytearray()
+        seq = dump.write_binary_rows(buffer, payloads, 1)
+        assert seq == 4
+        assert buffer[3] == 1
+
+
+class TestResultCursor(unittest.TestCase):
+
+    def test_fetch(self):
+        columns = [Column('a')]
+        chunks = [pd.DataFrame({'a': range(i * 10, i * 10 + 10)}) for i in range(3)]
+
+        result_set = ResultSet(columns=columns, values=[[-1]])
+        result_set.set_stream(iter(chunks))
+
+        cursor = ResultCursor(result_set)
+        df = cursor.fetch(5)
+        assert list(df[0]) == [-1, 0, 1, 2, 3]
+        df = cursor.fetch(20)
+        assert list(df[0]) == list(range(4, 24))
+        assert not cursor.is_exhausted
+        df = cursor.fetch(20)
+        assert list(df[0]) == list(range(24, 30))
+        assert cursor.is_exhausted
+        assert len(cursor.fetch(20)) == 0
+        assert cursor.fetched == 31
+
+        # not stream result set is not consumed
+        result_set = ResultSet(columns=columns, values=[[1], [2], [3]])
+        for _ in range(2):
+            cursor = ResultCursor(result_set)
+            assert [len(df) for df in cursor.iter_all()] == [3]
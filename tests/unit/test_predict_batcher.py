@@ -0,0 +1,99 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import patch
+
+import pandas as pd
+
+from mindsdb.integrations.libs.predict_batcher import PredictBatcher
+from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
+
+
+def predict_payload(model_id=None, args=None):
+    """ payload of predict task, which is sent to ML process
+    """
+    return {
+        'handler_meta': {'module_path': 'fake', 'integration_id': 1, 'engine': 'fake'},
+        'predictor_record': None,
+        'args': args or {},
+        'context': {'company_id': None},
+        'model_id': model_id,
+    }
+
+
+class FakeExecutor:
+    """ executes predict in the current thread: adds 'y' column """
+
+    def __init__(self, change_rows=False):
+        self.dataframes = []
+        self.change_rows = change_rows
+        self.lock = threading.Lock()
+
+    def apply_async(self, task_type, model_id, payload, dataframe=None):
+        with self.lock:
+            self.dataframes.append(dataframe)
+        predictions = dataframe.copy()
+        predictions['y'] = predictions['x'] * 10
+        if self.change_rows and len(dataframe) > 1:
+            predictions = predictions.iloc[:1]
+        future = Future()
+        future.set_result(predictions)
+        return future
+
+
+class TestPredictBatcher:
+
+    def run_requests(self, executor, values, config, pred_format='dict'):
+        batcher = PredictBatcher()
+        barrier = threading.Barrier(len(values))
+
+        def predict(x):
+            df = pd.DataFrame({'x': [x], '__mindsdb_row_id': [1]})
+            barrier.wait()
+            task = batcher.apply_async(
+                executor, ML_TASK_TYPE.PREDICT, 1,
+                predict_payload(args={'pred_format': pred_format, 'predict_params': {}, 'using': {}}),
+                dataframe=df
+            )
+            return task.result()
+
+        with patch('mindsdb.integrations.libs.predict_batcher.Config', return_value=config), \
+                ThreadPoolExecutor(len(values)) as pool:
+            return list(pool.map(predict, values))
+
+    def test_batching(self):
+        config = {'predict_batching': {'enabled': True, 'window_ms': 500, 'max_rows': 100}}
+        executor = FakeExecutor()
+        results = self.run_requests(executor, list(range(10)), config)
+
+        # one task for all requests, every request gets its own row
+        assert len(executor.dataframes) == 1
+        assert len(executor.dataframes[0]) == 10
+        for x, df in enumerate(results):
+            assert list(df['y']) == [x * 10]
+            assert list(df.index) == [0]
+
+        # batch is limited by rows
+        config['predict_batching']['max_rows'] = 4
+        executor = FakeExecutor()
+        self.run_requests(executor, list(range(8)), config)
+        assert sorted(len(df) for df in executor.dataframes) == [4, 4]
+
+        # disabled
+        config['predict_batching']['enabled'] = False
+        executor = FakeExecutor()
+        self.run_requests(executor, list(range(5)), config)
+        assert len(executor.dataframes) == 5
+
+    def test_fallback(self):
+        config = {'predict_batching': {'enabled': True, 'window_ms': 500, 'max_rows': 100}}
+
+        # rows of predictions can't be matched with requests: every request is executed separately
+        executor = FakeExecutor(change_rows=True)
+        results = self.run_requests(executor, list(range(5)), config)
+        assert [len(df) for df in executor.dataframes] == [5, 1, 1, 1, 1, 1]
+        assert [list(df['y']) for df in results] == [[x * 10] for x in range(5)]
+
+        # other formats are not batched
+        executor = FakeExecutor()
+        self.run_requests(executor, list(range(5)), config, pred_format='explain')
+        assert len(executor.dataframes) == 5
@@ -0,0 +1,132 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+from mindsdb.integrations.libs.process_cache import ProcessCache
+from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
+
+
+def predict_payload(model_id=None, args=None):
+    """ payload of predict task, which is sent to ML process
+    """
+    return {
+        'handler_meta': {'module_path': 'fake', 'integration_id': 1, 'engine': 'fake'},
+        'predictor_record': None,
+        'args': args or {},
+        'context': {'company_id': None},
+        'model_id': model_id,
+    }
+
+
+class FakeProcess:
+    """ process which executes tasks on demand of the test """
+
+    def __init__(self, *args, **kwargs):
+        self.task = None
+        self._init_done = True
+        self._markers = set()
+        self.last_usage_at = 0
+        self.tasks = []
+        self.broken = False
+
+    def shutdown(self):
+        pass
+
+    def ready(self):
+        return self.task is None or self.task.done()
+
+    def add_marker(self, marker):
+        self._markers.add(marker)
+
+    def has_marker(self, marker):
+        return marker in self._markers
+
+    def is_marked(self):
+        return len(self._markers) > 0
+
+    def apply_async(self, func, *args, **kwargs):
+        if self.broken:
+            raise BrokenProcessPool()
+        self.task = Future()
+        self.tasks.append(kwargs)
+        return self.task
+
+    def finish(self, result='ok'):
+        self.task.set_result(result)
+
+
+class TestProcessCache:
+
+    def test_affinity_and_queue(self):
+        config = {'ml_process_cache': {'max_processes': {'fake': 2}, 'prewarm_models': 0}}
+        with patch('mindsdb.integrations.libs.process_cache.WarmProcess', FakeProcess), \
+                patch('mindsdb.integrations.libs.process_cache.Config', return_value=config):
+            cache = ProcessCache()
+            cache._stop_clean()
+
+            def predict(model_id):
+                return cache.apply_async(ML_TASK_TYPE.PREDICT, model_id, predict_payload(model_id))
+
+            task1 = predict(1)
+            task2 = predict(2)
+            p1, p2 = cache.cache['fake']['processes']
+            assert cache.get_stats()['engines']['fake'] == {'processes': 2, 'busy': 2, 'queue_depth': 0}
+
+            # limit of processes is reached: tasks are queued
+            task3 = predict(2)
+            task4 = predict(1)
+            assert cache.get_stats()['engines']['fake']['queue_depth'] == 2
+
+            # process with model 1 is released: it takes the task for model 1
+            p1.finish('result 1')
+            assert task1.result() == 'result 1'
+            assert len(p1.tasks) == 2
+            assert cache.get_stats()['engines']['fake']['queue_depth'] == 1
+
+            p2.finish()
+            assert len(p2.tasks) == 2
+            p1.finish()
+            p2.finish()
+            assert task2.done() and task3.done() and task4.done()
+
+            stats = cache.get_stats()
+            assert stats['hits'] == 2
+            assert stats['misses'] == 2
+            assert stats['hit_rate'] == 0.5
+            assert stats['engines']['fake']['processes'] == 2
+
+    def test_broken_process(self):
+        config = {'ml_process_cache': {'max_processes': {'fake': 1}, 'prewarm_models': 0}}
+        with patch('mindsdb.integrations.libs.process_cache.WarmProcess', FakeProcess), \
+                patch('mindsdb.integrations.libs.process_cache.Config', return_value=config):
+            cache = ProcessCache()
+            cache._stop_clean()
+
+            def predict(model_id):
+                return cache.apply_async(ML_TASK_TYPE.PREDICT, model_id, predict_payload(model_id))
+
+            task1 = predict(1)
+            task2 = predict(2)
+            task3 = predict(3)
+            p1, = cache.cache['fake']['processes']
+
+            # process can't take the next task: the task fails, the process is replaced
+            p1.broken = True
+            p1.finish()
+            assert task1.result() == 'ok'
+            assert isinstance(task2.exception(timeout=1), BrokenProcessPool)
+            p2, = cache.cache['fake']['processes']
+            assert p2 is not p1
+            assert len(p2.tasks) == 1
+            assert cache.get_stats()['engines']['fake']['queue_depth'] == 0
+
+            p2.finish('result 3')
+            assert task3.result(timeout=1) == 'result 3'
+
+            # process breaks on new task
+            p2.broken = True
+            assert isinstance(predict(4).exception(timeout=1), BrokenProcessPool)
+            assert cache.cache['fake']['processes'] == []
+            task5 = predict(5)
+            cache.cache['fake']['processes'][0].finish()
+            assert task5.result(timeout=1) == 'ok'
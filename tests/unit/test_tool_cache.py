@@ -0,0 +1,118 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.queries = []
+        self.session = MagicMock()
+
+    def execute_command(self, ast_query, database_name=None):
+        from mindsdb.api.executor.sql_query.result_set import ResultSet
+
+        self.queries.append(str(ast_query))
+        query = str(ast_query).lower()
+        if 'databases' in query:
+            rows = [['information_schema'], ['mindsdb'], ['db']]
+        elif 'tables' in query:
+            rows = [['table1'], ['table2']]
+        else:
+            rows = [[1, 'a'], [2, 'b']]
+        ret = MagicMock()
+        ret.data = ResultSet().from_df(pd.DataFrame(rows))
+        return ret
+
+
+def test_tool_call_cache():
+    from mindsdb.interfaces.skills.tool_cache import ToolCallCache
+
+    cache = ToolCallCache(table_info_ttl=10, query_ttl=0.1, kb_ttl=10, max_entries=3)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    # questions are compared after normalization
+    assert cache.get_kb_result('kb', 'What is MindsDB?', fetch) == 1
+    assert cache.get_kb_result('kb', '  what is   mindsdb ', fetch) == 1
+    assert cache.get_kb_result('kb2', 'what is mindsdb', fetch) == 2
+
+    # query results are reused only for a short time
+    assert cache.get_query_result('db', 'select 1;', fetch) == 3
+    assert cache.get_query_result('db', 'select 1', fetch) == 3
+    time.sleep(0.15)
+    assert cache.get_query_result('db', 'select 1', fetch) == 4
+
+    # failed calls are not cached
+    def fail():
+        raise ValueError()
+
+    for _ in range(2):
+        try:
+            cache.get_table_info('tables', fail)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('error is expected')
+
+    # least recently used results are dropped
+    assert cache.get_stats()['size'] == 3
+    assert cache.get_table_info('tables', fetch) == 5
+    assert cache.get_kb_result('kb', 'what is mindsdb', fetch) == 6
+
+
+def test_sql_agent_uses_cache():
+    from mindsdb.interfaces.skills.sql_agent import SQLAgent
+    from mindsdb.interfaces.skills.tool_cache import ToolCallCache
+
+    executor = FakeExecutor()
+    cache = ToolCallCache(table_info_ttl=10, query_ttl=10)
+    agent = SQLAgent(executor, 'db', tool_cache=cache)
+    for _ in range(3):
+        assert agent.get_usable_table_names() == ['db.table1', 'db.table2']
+    # show databases, show tables
+    assert len(executor.queries) == 2
+
+    tables = ['db.table1', 'db.table2']
+    agent = SQLAgent(executor, 'db', include_tables=tables, tool_cache=cache)
+    agent._get_columns = lambda integration, table: pd.DataFrame([['a', 'int'], ['b', 'text']], columns=['Field', 'Type'])
+    for _ in range(3):
+        info = agent.get_table_info()
+        assert 'Table named `table2`' in info
+        result = agent.query('select a, b from table1')
+        assert 'Output columns' in result
+    # two sample queries, one query
+    assert len(executor.queries) == 2 + 3
+
+    # cached results of queries and tables info are forgotten after data is changed
+    agent.query('insert into table1 (a, b) values (3, 4)')
+    agent.get_table_info()
+    agent.query('select a, b from table1')
+    assert len(executor.queries) == 5 + 4
+
+    # without cache every call is sent to executor
+    agent = SQLAgent(executor, 'db', include_tables=tables)
+    agent._get_columns = lambda integration, table: pd.DataFrame([['a', 'int'], ['b', 'text']], columns=['Field', 'Type'])
+    agent.get_table_info()
+    agent.get_table_info()
+    assert len(executor.queries) == 9 + 4
+
+
+def test_agents_caches_are_limited():
+    from mindsdb.interfaces.skills import tool_cache
+
+    with patch('mindsdb.interfaces.skills.tool_cache.Config') as config, \
+            patch.dict(tool_cache._agents_caches, clear=True):
+        config().get.return_value = {'max_agents': 2}
+        cache1 = tool_cache.get_agent_tool_cache(1)
+        cache2 = tool_cache.get_agent_tool_cache(2)
+        assert tool_cache.get_agent_tool_cache(1) is cache1
+
+        # the least recently used agent is dropped
+        tool_cache.get_agent_tool_cache(3)
+        assert len(tool_cache._agents_caches) == 2
+        assert tool_cache.get_agent_tool_cache(1) is cache1
+        assert tool_cache.get_agent_tool_cache(2) is not cache2